@@ -63,6 +63,23 @@ arts_list_query_params = [
 ]
 
 
+arts_cursor_query_params = [
+    OpenApiParameter(
+        name='cursor',
+        description=_(
+            'Курсор для пагинации по ключу.<br><br>'
+            'Если параметр передан, вместо `page` используется пагинация по ключу: '
+            'в ответе нет поля `count`, а поля `next` и `previous` содержат ссылки с курсорами соседних страниц.<br><br>'
+            'Для получения первой страницы нужно передать пустое значение: `?cursor=`.<br><br>'
+            'Время получения страницы не зависит от ее глубины, поэтому такой режим '
+            'рекомендуется для бесконечной прокрутки.<br>'
+        ),
+        type=OpenApiTypes.STR,
+        location='query',
+    ),
+]
+
+
 arts_openapi = {
     'create': extend_schema(
         operation_id="create_art",
@@ -70,7 +87,9 @@ arts_openapi = {
         summary=_("Создание арта"),
         description=_(
             "Позволяет создать арт.<br><br>"
-            "Поддерживает только `Content-Type: multipart/form-data`."
+            "Поддерживает только `Content-Type: multipart/form-data`.<br><br>"
+            "Если на сервере включено отклонение дубликатов, загрузка изображения, "
+            "почти совпадающего с уже загруженным, вернет ошибку 400 в поле `image`."
         ),
         request=serializers.CreateArtSerializer,
         responses={
@@ -89,11 +108,15 @@ arts_openapi = {
         description=_(
             'Получение информации об одном арте.<br><br>'
             'Поле `liked_authorized_user` присутствует только если запрос делает авторизованный пользователь.<br><br>'
+            'Ответ содержит заголовки `ETag` и `Last-Modified`. Если передать их значения '
+            'в `If-None-Match` или `If-Modified-Since`, а арт не изменился, вернется 304 без тела. '
+            'Количество просмотров в версию арта не входит.<br><br>'
         ),
         auth=(),
         request=serializers.RetrieveArtForAuthorizedUserSerializer,
         responses={
             status.HTTP_200_OK: serializers.RetrieveArtForAuthorizedUserSerializer,
+            status.HTTP_304_NOT_MODIFIED: None,
             status.HTTP_404_NOT_FOUND: OpenAPIDetailSerializer,
         },
     ),
@@ -119,10 +142,10 @@ arts_openapi = {
         description=_(
             'Позволяет получить список артов в порядке их создания: от новых к старым.<br><br>'
             'Поле `liked_authorized_user` присутствует только если запрос делает авторизованный пользователь.<br><br>'
-            'Поддерживает пагинацию по следующим параметрам: `page`, `page_size`.<br><br>'
+            'Поддерживает пагинацию по следующим параметрам: `page`, `page_size`, `cursor`.<br><br>'
             'Поддерживает фильтрацию по следующим параметрам: `tags`, `author`, `for_sale`.<br>'
         ),
-        parameters=arts_list_query_params,
+        parameters=[*arts_list_query_params, *arts_cursor_query_params],
         responses={
             status.HTTP_200_OK: get_pagination_schema(
                 name='NewArtsPaginationSerializer',
@@ -138,10 +161,10 @@ arts_openapi = {
         description=_(
             'Позволяет получить список артов пользователей, на которых подписан авторизованный пользователь.<br><br>'
             'Арты также фильтруются по дате создания от новых к старым.<br><br>'
-            'Поддерживает пагинацию по следующим параметрам: `page`, `page_size`.<br><br>'
+            'Поддерживает пагинацию по следующим параметрам: `page`, `page_size`, `cursor`.<br><br>'
             'Поддерживает фильтрацию по следующим параметрам: `tags`, `author`, `for_sale`.<br>'
         ),
-        parameters=arts_list_query_params,
+        parameters=[*arts_list_query_params, *arts_cursor_query_params],
         responses={
             status.HTTP_200_OK: get_pagination_schema(
                 name='SubscriptionsArtsPaginationSerializer',
@@ -157,12 +180,14 @@ arts_openapi = {
         summary=_("Получение популярных артов"),
         description=_(
             'Позволяет получить список артов в порядке их популярности: от более популярных к менее.<br><br>'
-            'Популярность опредялется только на основе кол-ва лайков.<br><br>'
+            'Популярность определяется рейтингом, который учитывает лайки, просмотры и возраст арта: '
+            'со временем рейтинг затухает, чтобы в ленте оказывались свежие работы.<br><br>'
+            'Рейтинг пересчитывается периодически, поэтому порядок артов обновляется с задержкой.<br><br>'
             'Поле `liked_authorized_user` присутствует только если запрос делает авторизованный пользователь.<br><br>'
-            'Поддерживает пагинацию по следующим параметрам: `page`, `page_size`.<br><br>'
+            'Поддерживает пагинацию по следующим параметрам: `page`, `page_size`, `cursor`.<br><br>'
             'Поддерживает фильтрацию по следующим параметрам: `tags`, `author`, `for_sale`.<br>'
         ),
-        parameters=arts_list_query_params,
+        parameters=[*arts_list_query_params, *arts_cursor_query_params],
         responses={
             status.HTTP_200_OK: get_pagination_schema(
                 name='PopularArtsPaginationSerializer',
@@ -178,10 +203,10 @@ arts_openapi = {
         description=_(
             'Позволяет получить список артов конкретного пользователя в порядке их создания: от новых к старым.<br><br>'
             'Поле `liked_authorized_user` присутствует только если запрос делает авторизованный пользователь.<br><br>'
-            'Поддерживает пагинацию по следующим параметрам: `page`, `page_size`.<br><br>'
+            'Поддерживает пагинацию по следующим параметрам: `page`, `page_size`, `cursor`.<br><br>'
             'Поддерживает фильтрацию по следующим параметрам: `tags`, `author`, `for_sale`.<br>'
         ),
-        parameters=arts_list_query_params,
+        parameters=[*arts_list_query_params, *arts_cursor_query_params],
         responses={
             status.HTTP_200_OK: get_pagination_schema(
                 name='UserArtsPaginationSerializer',
@@ -190,18 +215,116 @@ arts_openapi = {
             status.HTTP_404_NOT_FOUND: OpenAPIDetailSerializer,
         },
     ),
+    'search_arts': extend_schema(
+        operation_id="search_arts",
+        methods=('get', ),
+        auth=(),
+        summary=_("Поиск артов"),
+        description=_(
+            'Позволяет найти арты по описанию и тэгам. Арты упорядочены по релевантности: '
+            'совпадения в тэгах весят больше совпадений в описании.<br><br>'
+            'Поле `liked_authorized_user` присутствует только если запрос делает авторизованный пользователь.<br><br>'
+            'Поддерживает только пагинацию по ключу по следующим параметрам: `cursor`, `page_size`.<br><br>'
+            'Поддерживает фильтрацию по следующим параметрам: `tags`, `author`, `for_sale`.<br>'
+        ),
+        parameters=[
+            OpenApiParameter(
+                name='q',
+                description=_(
+                    'Поисковый запрос.<br><br>'
+                    'Поддерживает синтаксис веб-поиска: `"точная фраза"`, `or`, `-исключить`.<br>'
+                ),
+                type=OpenApiTypes.STR,
+                location='query',
+                required=True,
+            ),
+            *(param for param in arts_list_query_params if param.name != 'page'),
+            *arts_cursor_query_params,
+        ],
+        responses={
+            status.HTTP_200_OK: get_pagination_schema(
+                name='SearchArtsPaginationSerializer',
+                child_schema=serializers.ShortRetrieveArtForAuthorizedUserSerializer,
+            ),
+            status.HTTP_400_BAD_REQUEST: OpenAPIBadRequestSerializerFactory.create(
+                name='BadRequestSearchArtsSerializer',
+                fields=('q', ),
+            ),
+            status.HTTP_404_NOT_FOUND: OpenAPIDetailSerializer,
+        },
+    ),
+    'batch_arts': extend_schema(
+        operation_id="batch_arts",
+        methods=('get', ),
+        auth=(),
+        summary=_("Получение нескольких артов по списку id"),
+        description=_(
+            'Позволяет за один запрос получить арты по их id, например, чтобы восстановить '
+            'сохраненную сетку артов или показать арты из сообщений чата.<br><br>'
+            'Арты возвращаются в порядке переданных id, несуществующие пропускаются. '
+            'Просмотры при этом не учитываются.<br><br>'
+            'Поле `liked_authorized_user` присутствует только если запрос делает авторизованный пользователь.<br>'
+        ),
+        parameters=[
+            OpenApiParameter(
+                name='ids',
+                description=_('Id артов через запятую. Максимум `100`.<br>'),
+                type=OpenApiTypes.STR,
+                location='query',
+                required=True,
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: serializers.ShortRetrieveArtForAuthorizedUserSerializer(many=True),
+            status.HTTP_400_BAD_REQUEST: OpenAPIBadRequestSerializerFactory.create(
+                name='BadRequestBatchArtsSerializer',
+                fields=('ids', ),
+            ),
+        },
+    ),
+    'duplicates': extend_schema(
+        operation_id="art_duplicates",
+        methods=('get', ),
+        auth=(),
+        summary=_("Получение похожих изображений"),
+        description=_(
+            'Позволяет получить арты с почти таким же изображением, как у указанного арта '
+            '(пересжатые, уменьшенные или слегка измененные копии), от самых похожих.<br><br>'
+            'Возвращает не больше `20` артов.<br><br>'
+            'Поле `liked_authorized_user` присутствует только если запрос делает авторизованный пользователь.<br>'
+        ),
+        responses={
+            status.HTTP_200_OK: serializers.ShortRetrieveArtForAuthorizedUserSerializer(many=True),
+            status.HTTP_404_NOT_FOUND: OpenAPIDetailSerializer,
+        },
+    ),
+    'related_arts': extend_schema(
+        operation_id="art_related",
+        methods=('get', ),
+        auth=(),
+        summary=_("Получение похожих артов"),
+        description=_(
+            'Позволяет получить арты, похожие на указанный по тэгам, от самых похожих.<br><br>'
+            'Общие редкие тэги значат больше общих популярных. Списки похожих рассчитываются заранее, '
+            'поэтому для арта без тэгов или несуществующего арта возвращается пустой список.<br><br>'
+            'Возвращает не больше `20` артов.<br><br>'
+            'Поле `liked_authorized_user` присутствует только если запрос делает авторизованный пользователь.<br>'
+        ),
+        responses={
+            status.HTTP_200_OK: serializers.ShortRetrieveArtForAuthorizedUserSerializer(many=True),
+        },
+    ),
     'like_art': extend_schema(
         operation_id="like_art",
         methods=('post', ),
         summary=_("Поставить лайк указанному арту"),
         description=_(
             'Позволяет поставить лайк указанному арту.<br><br>'
-            'Если пользователь уже ставил лайк, будет ошибка 403.<br><br>'
+            'Операция идемпотентна: повторный лайк ничего не меняет.<br><br>'
         ),
         responses={
             status.HTTP_200_OK: None,
             status.HTTP_401_UNAUTHORIZED: OpenAPIDetailSerializer,
-            status.HTTP_403_FORBIDDEN: OpenAPIDetailSerializer,
             status.HTTP_404_NOT_FOUND: OpenAPIDetailSerializer,
         },
     ),
@@ -211,15 +334,100 @@ arts_openapi = {
         summary=_("Удалить лайк у указанного арта"),
         description=_(
             'Позволяет удалить лайк у указанного арта.<br><br>'
-            'Если пользователь не ставил лайк, будет ошибка 403.<br><br>'
+            'Операция идемпотентна: удаление отсутствующего лайка ничего не меняет.<br><br>'
         ),
         responses={
             status.HTTP_204_NO_CONTENT: None,
             status.HTTP_401_UNAUTHORIZED: OpenAPIDetailSerializer,
-            status.HTTP_403_FORBIDDEN: OpenAPIDetailSerializer,
             status.HTTP_404_NOT_FOUND: OpenAPIDetailSerializer,
         },
     ),
+    'batch_like_arts': extend_schema(
+        operation_id="batch_like_arts",
+        methods=('post', ),
+        summary=_("Применить набор лайков"),
+        description=_(
+            'Позволяет за один запрос поставить и снять лайки у нескольких артов, '
+            'например, при синхронизации накопленных клиентом действий.<br><br>'
+            '`liked: true` - поставить лайк, `liked: false` - снять. Операции применяются '
+            'в одной транзакции, для каждого арта учитывается последняя операция. '
+            'Максимум `100` операций.<br><br>'
+            'В ответе - итоговые состояния артов. Несуществующие арты пропускаются. '
+            'Поле `changed` показывает, изменила ли операция лайк.<br>'
+        ),
+        request=serializers.ArtLikesBatchSerializer,
+        responses={
+            status.HTTP_200_OK: serializers.ArtLikeStateSerializer(many=True),
+            status.HTTP_400_BAD_REQUEST: OpenAPIBadRequestSerializerFactory.create(
+                name='BadRequestBatchLikeArtsSerializer',
+                fields=('operations', ),
+            ),
+            status.HTTP_401_UNAUTHORIZED: OpenAPIDetailSerializer,
+        },
+    ),
+    'tags': extend_schema(
+        operation_id="art_tags",
+        methods=('get', ),
+        auth=(),
+        summary=_("Получение популярных тэгов"),
+        description=_(
+            'Позволяет получить тэги артов с количеством артов, отсортированные от самых используемых.<br><br>'
+        ),
+        parameters=[
+            OpenApiParameter(
+                name='limit',
+                description=_(
+                    'Количество тэгов.<br><br>'
+                    'По умолчанию `20`, максимум `100`.<br>'
+                ),
+                type=OpenApiTypes.INT,
+                location='query',
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: serializers.ArtTagStatsSerializer(many=True),
+            status.HTTP_400_BAD_REQUEST: OpenAPIBadRequestSerializerFactory.create(
+                name='BadRequestArtTagsSerializer',
+                fields=('limit', ),
+            ),
+        },
+    ),
+    'autocomplete_tags': extend_schema(
+        operation_id="autocomplete_art_tags",
+        methods=('get', ),
+        auth=(),
+        summary=_("Автодополнение тэгов"),
+        description=_(
+            'Позволяет получить тэги, начинающиеся с указанного префикса, '
+            'отсортированные от самых используемых.<br><br>'
+            'Поиск по префиксу чувствителен к регистру.<br>'
+        ),
+        parameters=[
+            OpenApiParameter(
+                name='prefix',
+                description=_('Начало тэга.<br>'),
+                type=OpenApiTypes.STR,
+                location='query',
+                required=True,
+            ),
+            OpenApiParameter(
+                name='limit',
+                description=_(
+                    'Количество тэгов.<br><br>'
+                    'По умолчанию `10`, максимум `100`.<br>'
+                ),
+                type=OpenApiTypes.INT,
+                location='query',
+            ),
+        ],
+        responses={
+            status.HTTP_200_OK: serializers.ArtTagStatsSerializer(many=True),
+            status.HTTP_400_BAD_REQUEST: OpenAPIBadRequestSerializerFactory.create(
+                name='BadRequestAutocompleteArtTagsSerializer',
+                fields=('prefix', 'limit'),
+            ),
+        },
+    ),
 }
 
 art_comments_openapi = {
@@ -243,8 +451,7 @@ art_comments_openapi = {
         summary=_("Получение списка комментариев указанного арта"),
         description=_(
             'Позволяет получить список комментариев указанного арта в порядке их создания: от старых к новым.<br><br>'
-            'Поддерживает пагинацию по следующим параметрам: `page`, `page_size`<br><br>'
-
+            'Поддерживает пагинацию по следующим параметрам: `page`, `page_size`, `cursor`.<br><br>'
         ),
         parameters=[
             OpenApiParameter(
@@ -268,10 +475,127 @@ art_comments_openapi = {
                 type=OpenApiTypes.INT,
                 location='query',
             ),
+            *arts_cursor_query_params,
         ],
         responses={
             status.HTTP_200_OK: serializers.ArtCommentSerializer,
             status.HTTP_404_NOT_FOUND: OpenAPIDetailSerializer,
         },
     ),
+    'destroy': extend_schema(
+        operation_id="destroy_art_comment",
+        methods=('delete', ),
+        summary=_("Удаление комментария"),
+        description=_(
+            'Позволяет удалить комментарий указанного арта.<br><br>'
+            'Доступно, только если авторизованный пользователь удаляет свой комментарий. Иначе ошибка 403.<br><br>'
+        ),
+        responses={
+            status.HTTP_204_NO_CONTENT: None,
+            status.HTTP_401_UNAUTHORIZED: OpenAPIDetailSerializer,
+            status.HTTP_403_FORBIDDEN: OpenAPIDetailSerializer,
+            status.HTTP_404_NOT_FOUND: OpenAPIDetailSerializer,
+        },
+    ),
+}
+
+art_uploads_openapi = {
+    'create': extend_schema(
+        operation_id="create_art_upload",
+        methods=('post', ),
+        summary=_("Создание сессии загрузки изображения по частям"),
+        description=_(
+            'Позволяет начать возобновляемую загрузку изображения арта по частям.<br><br>'
+            'В `size` передается полный размер файла в байтах. '
+            'Незавершенная сессия удаляется через сутки.<br>'
+        ),
+        request=serializers.ArtUploadSessionSerializer,
+        responses={
+            status.HTTP_201_CREATED: serializers.ArtUploadSessionSerializer,
+            status.HTTP_400_BAD_REQUEST: OpenAPIBadRequestSerializerFactory.create(
+                name='BadRequestCreateArtUploadSerializer',
+                fields=('filename', 'size'),
+            ),
+            status.HTTP_401_UNAUTHORIZED: OpenAPIDetailSerializer,
+        },
+    ),
+    'retrieve': extend_schema(
+        operation_id="retrieve_art_upload",
+        methods=('get', ),
+        summary=_("Получение состояния загрузки"),
+        description=_(
+            'Позволяет узнать `offset` - количество уже принятых байт, '
+            'чтобы продолжить загрузку после обрыва связи.<br>'
+        ),
+        responses={
+            status.HTTP_200_OK: serializers.ArtUploadSessionSerializer,
+            status.HTTP_401_UNAUTHORIZED: OpenAPIDetailSerializer,
+            status.HTTP_404_NOT_FOUND: OpenAPIDetailSerializer,
+        },
+    ),
+    'upload_chunk': extend_schema(
+        operation_id="upload_art_chunk",
+        methods=('put', ),
+        summary=_("Загрузка части изображения"),
+        description=_(
+            'Позволяет загрузить часть файла. Тело запроса - байты части '
+            '(`Content-Type: application/octet-stream`).<br><br>'
+            'Диапазон части передается заголовком `Content-Range: bytes start-end/size`. '
+            'Часть должна начинаться с текущего `offset`, иначе будет ошибка 409 '
+            'с актуальным `offset` в ответе.<br><br>'
+            'Если соединение оборвалось, принятые байты сохраняются.<br>'
+        ),
+        parameters=[
+            OpenApiParameter(
+                name='Content-Range',
+                description=_('Диапазон части, например `bytes 0-1048575/10485760`.<br>'),
+                type=OpenApiTypes.STR,
+                location='header',
+                required=True,
+            ),
+        ],
+        request={'application/octet-stream': OpenApiTypes.BINARY},
+        responses={
+            status.HTTP_200_OK: serializers.ArtUploadSessionSerializer,
+            status.HTTP_400_BAD_REQUEST: OpenAPIBadRequestSerializerFactory.create(
+                name='BadRequestUploadArtChunkSerializer',
+                fields=('Content-Range', 'Content-Length'),
+            ),
+            status.HTTP_401_UNAUTHORIZED: OpenAPIDetailSerializer,
+            status.HTTP_404_NOT_FOUND: OpenAPIDetailSerializer,
+            status.HTTP_409_CONFLICT: OpenAPIDetailSerializer,
+        },
+    ),
+    'destroy': extend_schema(
+        operation_id="destroy_art_upload",
+        methods=('delete', ),
+        summary=_("Отмена загрузки"),
+        description=_('Позволяет удалить сессию загрузки вместе с принятыми данными.<br>'),
+        responses={
+            status.HTTP_204_NO_CONTENT: None,
+            status.HTTP_401_UNAUTHORIZED: OpenAPIDetailSerializer,
+            status.HTTP_404_NOT_FOUND: OpenAPIDetailSerializer,
+        },
+    ),
+    'finalize': extend_schema(
+        operation_id="finalize_art_upload",
+        methods=('post', ),
+        summary=_("Создание арта из загруженного изображения"),
+        description=_(
+            'Позволяет создать арт из полностью загруженного файла. '
+            'Принимает `Content-Type: application/json`.<br><br>'
+            'Если файл загружен не полностью, будет ошибка 409 с актуальным `offset` в ответе.<br>'
+        ),
+        request=serializers.FinalizeArtUploadSerializer,
+        responses={
+            status.HTTP_201_CREATED: serializers.CreateArtSerializer,
+            status.HTTP_400_BAD_REQUEST: OpenAPIBadRequestSerializerFactory.create(
+                name='BadRequestFinalizeArtUploadSerializer',
+                fields=('image', 'description', 'for_sale', 'tags'),
+            ),
+            status.HTTP_401_UNAUTHORIZED: OpenAPIDetailSerializer,
+            status.HTTP_404_NOT_FOUND: OpenAPIDetailSerializer,
+            status.HTTP_409_CONFLICT: OpenAPIDetailSerializer,
+        },
+    ),
 }
@@ -1,5 +1,13 @@
+from django.db.models import QuerySet
+
+from rest_framework.views import APIView
+from rest_framework.request import Request
 from rest_framework.pagination import PageNumberPagination
 
+from apps.arts.models import Art
+from apps.arts.services.timeline import ArtTimelineService
+from utils.pagination import KeysetPagination
+
 
 class ArtPagination(PageNumberPagination):
     page_size = 10
@@ -7,7 +15,36 @@ class ArtPagination(PageNumberPagination):
     max_page_size = 40
 
 
+class ArtKeysetPagination(KeysetPagination):
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 40
+    ordering = ('-created_at', '-id')
+
+
+class SubscriptionsArtKeysetPagination(ArtKeysetPagination):
+    ordering = ('-published_at', '-id')
+
+    def get_querysets(self, queryset: QuerySet[Art], request: Request, view: APIView | None) -> list[QuerySet[Art]]:
+        return ArtTimelineService().split_feed(request.user.pk, queryset)
+
+
+class ArtSearchKeysetPagination(ArtKeysetPagination):
+    ordering = ('-search_rank', '-id')
+
+
+class PopularArtKeysetPagination(ArtKeysetPagination):
+    ordering = ('-popularity_score', '-id')
+
+
 class ArtCommentsPagination(PageNumberPagination):
     page_size = 30
     page_size_query_param = 'page_size'
     max_page_size = 100
+
+
+class ArtCommentsKeysetPagination(KeysetPagination):
+    page_size = 30
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
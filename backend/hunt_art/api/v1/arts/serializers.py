@@ -1,14 +1,45 @@
-from typing import Any, Final
+from typing import Any, Final, Callable
 
 from rest_framework import serializers
 
+from django.conf import settings
+from django.db import transaction
+from django.core.files.storage import default_storage
+
+from drf_spectacular.utils import extend_schema_field
+
+from utils.serializers import ValuesSerializer
+
 from apps.arts import models
-from api.v1.users.serializers import ShortRetrieveUserSerializer
+from apps.arts.services.timeline import ArtTimelineService
+from apps.arts.services.tags import ArtTagsService
+from apps.arts.services.search import ArtSearchService
+from apps.arts.services.image_metadata import ArtImageMetadataService
+from apps.arts.services.duplicates import ArtDuplicatesService
+from apps.arts.services.feed_cache import art_feed_cache
+from apps.arts.services.thumbnails import art_thumbnails_generator
+from apps.arts.services.popularity import ArtPopularityService
+from apps.arts.services.comments import ArtCommentsService
+from apps.arts.services.related import ArtRelatedService
+from api.v1.users.serializers import (
+    UserCardSerializer,
+    UserCardsListSerializer,
+)
+
+
+def get_srcset(thumbnails: list[dict[str, Any]], get_url: Callable[[str], str]) -> dict[str, str]:
+    srcset: dict[str, list[str]] = {}
+    for thumbnail in thumbnails:
+        url = get_url(thumbnail['name'])
+        srcset.setdefault(thumbnail['format'], []).append(f'{url} {thumbnail["width"]}w')
+
+    return {format_name: ', '.join(candidates) for format_name, candidates in srcset.items()}
 
 
 class RetrieveArtSerializer(serializers.ModelSerializer):
-    count_likes = serializers.IntegerField()
-    author = ShortRetrieveUserSerializer()
+    count_likes = serializers.IntegerField(source='likes_count', read_only=True)
+    count_comments = serializers.IntegerField(source='comments_count', read_only=True)
+    author = UserCardSerializer(source='author_id')
 
     class Meta:
         model = models.Art
@@ -23,28 +54,25 @@ class RetrieveArtSerializer(serializers.ModelSerializer):
             'created_at',
             'updated_at',
             'count_likes',
+            'count_comments',
         )
 
 
 class RetrieveArtForAuthorizedUserSerializer(RetrieveArtSerializer):
-    liked_authorized_user = serializers.SerializerMethodField()
+    # Флаг проставляется представлением через ArtLikesService.mark_liked_arts.
+    liked_authorized_user = serializers.BooleanField(read_only=True)
 
     class Meta(RetrieveArtSerializer.Meta):
         fields = tuple([
             *RetrieveArtSerializer.Meta.fields,
             'liked_authorized_user',
         ])
-    
-    def get_liked_authorized_user(self, obj: models.Art) -> bool:
-        authorized_user = self.context['request'].user
-        return obj.likes.through.objects.filter(
-            user_id=authorized_user.pk,
-            art_id=obj.pk,
-        ).exists()
 
 
 class ShortRetrieveArtSerializer(serializers.ModelSerializer):
-    count_likes = serializers.IntegerField()
+    count_likes = serializers.IntegerField(source='likes_count', read_only=True)
+    count_comments = serializers.IntegerField(source='comments_count', read_only=True)
+    srcset = serializers.SerializerMethodField()
 
     class Meta:
         model = models.Art
@@ -52,13 +80,34 @@ class ShortRetrieveArtSerializer(serializers.ModelSerializer):
             'id',
             'author',
             'image',
+            'image_width',
+            'image_height',
+            'dominant_color',
+            'placeholder',
+            'srcset',
             'count_likes',
+            'count_comments',
             'created_at',
         )
 
+    @extend_schema_field({
+        'type': 'object',
+        'additionalProperties': {'type': 'string'},
+        'example': {
+            'webp': 'https://example.com/media/arts/thumbnails/1/320.webp 320w, https://example.com/media/arts/thumbnails/1/640.webp 640w',
+            'jpeg': 'https://example.com/media/arts/thumbnails/1/320.jpeg 320w, https://example.com/media/arts/thumbnails/1/640.jpeg 640w',
+        },
+    })
+    def get_srcset(self, obj: models.Art) -> dict[str, str]:
+        """Значения атрибута `srcset` по форматам. Пусто, пока копии не созданы."""
+
+        request = self.context['request']
+        return get_srcset(obj.thumbnails, lambda name: request.build_absolute_uri(default_storage.url(name)))
+
 
 class ShortRetrieveArtForAuthorizedUserSerializer(ShortRetrieveArtSerializer):
-    liked_authorized_user = serializers.SerializerMethodField()
+    # Флаг проставляется представлением через ArtLikesService.mark_liked_arts.
+    liked_authorized_user = serializers.BooleanField(read_only=True)
 
     class Meta(ShortRetrieveArtSerializer.Meta):
         fields = tuple([
@@ -66,9 +115,41 @@ class ShortRetrieveArtForAuthorizedUserSerializer(ShortRetrieveArtSerializer):
             'liked_authorized_user',
         ])
 
-    def get_liked_authorized_user(self, obj: models.Art) -> bool:
-        authorized_user = self.context['request'].user
-        return obj.likes.through.objects.filter(user_id=authorized_user.pk).exists()
+
+class FastShortRetrieveArtSerializer(ValuesSerializer):
+    """Быстрая версия `ShortRetrieveArtSerializer` для лент с тем же JSON"""
+
+    fields = (
+        ('id', 'id', None),
+        ('author', 'author_id', None),
+        ('image', 'image', 'to_file_url'),
+        ('image_width', 'image_width', None),
+        ('image_height', 'image_height', None),
+        ('dominant_color', 'dominant_color', None),
+        ('placeholder', 'placeholder', None),
+        ('srcset', 'thumbnails', 'to_srcset'),
+        ('count_likes', 'likes_count', None),
+        ('count_comments', 'comments_count', None),
+        ('created_at', 'created_at', 'to_datetime'),
+    )
+
+    def to_srcset(self, thumbnails: list[dict[str, Any]]) -> dict[str, str]:
+        return get_srcset(thumbnails, self.to_file_url)
+
+
+class FastShortRetrieveArtForAuthorizedUserSerializer(FastShortRetrieveArtSerializer):
+    """
+    Быстрая версия `ShortRetrieveArtForAuthorizedUserSerializer`.
+
+    Флаг `liked_authorized_user` проставляется в строки представлением.
+    """
+
+    fields = (
+        *FastShortRetrieveArtSerializer.fields,
+        ('liked_authorized_user', 'liked_authorized_user', None),
+    )
+    computed_lookups = ('liked_authorized_user', )
+
 
 
 class CreateArtSerializer(serializers.ModelSerializer):
@@ -90,17 +171,142 @@ class CreateArtSerializer(serializers.ModelSerializer):
             'updated_at': {'read_only': True},
         }
 
+    def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
+        attrs = super().validate(attrs)
+        attrs.update(ArtImageMetadataService().extract(attrs['image']))
+
+        if settings.ARTS_DUPLICATES_REJECT_ON_UPLOAD:
+            duplicates = ArtDuplicatesService().find_duplicates(attrs['image_hash'], limit=1)
+            if duplicates:
+                raise serializers.ValidationError({
+                    'image': [f'Похожее изображение уже загружено в арте id={duplicates[0].pk}.'],
+                })
+
+        return attrs
+
     def create(self, validated_data: dict[str, Any]) -> models.Art:
         validated_data['author'] = self.context['request'].user
-        art = models.Art.objects.create(**validated_data)
+        # Арт, его счетчики и индексы пишутся вместе: при ошибке
+        # не остается наполовину проиндексированного арта.
+        with transaction.atomic():
+            art = models.Art.objects.create(**validated_data)
+            # Новый арт сразу получает рейтинг, чтобы не ждать периодического пересчета.
+            ArtPopularityService().refresh(art_pks=(art.pk, ))
+            ArtTagsService().add_art(art)
+            ArtSearchService().update_art(art)
+            art_feed_cache.invalidate_art_created(art)
+            # Раскладка по лентам и похожие арты для ответа не нужны и самые тяжелые,
+            # поэтому выполняются после коммита. Ошибка в них не отменяет создание
+            # арта: ленты и похожие восстановят команды `rebuild_art_timelines`
+            # и `refresh_related_arts`.
+            transaction.on_commit(lambda: ArtTimelineService().fan_out_art(art), robust=True)
+            transaction.on_commit(lambda: ArtRelatedService().add_art(art), robust=True)
+            art_thumbnails_generator.schedule(art.pk)
+
         return art
 
 
+class ArtTagStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.ArtTagStats
+        fields = (
+            'tag',
+            'arts_count',
+            'last_used_at',
+        )
+
+
+class ArtTagsQuerySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=20)
+
+
+class ArtTagsAutocompleteQuerySerializer(ArtTagsQuerySerializer):
+    prefix = serializers.CharField(max_length=100)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+
+class ArtSearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=256)
+
+
+class ArtBatchQuerySerializer(serializers.Serializer):
+    MAX_IDS_COUNT: Final[int] = 100
+
+    ids = serializers.CharField()
+
+    def validate_ids(self, value: str) -> list[int]:
+        """Список id через запятую без повторов в исходном порядке"""
+
+        try:
+            ids = [int(art_id) for art_id in value.split(',') if art_id.strip()]
+        except ValueError:
+            raise serializers.ValidationError('Ожидается список целых чисел через запятую.')
+
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            raise serializers.ValidationError('Нужно передать хотя бы один id.')
+        if len(ids) > self.MAX_IDS_COUNT:
+            raise serializers.ValidationError(f'Можно передать не больше {self.MAX_IDS_COUNT} id.')
+
+        return ids
+
+
+class ArtLikeOperationSerializer(serializers.Serializer):
+    art_id = serializers.IntegerField(min_value=1)
+    liked = serializers.BooleanField()
+
+
+class ArtLikesBatchSerializer(serializers.Serializer):
+    # Операции применяются в порядке следования, для каждого арта - последняя.
+    operations = serializers.ListSerializer(
+        child=ArtLikeOperationSerializer(),
+        allow_empty=False,
+        max_length=100,
+    )
+
+
+class ArtLikeStateSerializer(serializers.Serializer):
+    art_id = serializers.IntegerField()
+    liked = serializers.BooleanField()
+    likes_count = serializers.IntegerField()
+    changed = serializers.BooleanField()
+
+
+class ArtUploadSessionSerializer(serializers.ModelSerializer):
+    size = serializers.IntegerField(min_value=1)
+
+    class Meta:
+        model = models.ArtUploadSession
+        fields = (
+            'id',
+            'filename',
+            'size',
+            'offset',
+            'created_at',
+        )
+        extra_kwargs = {
+            'offset': {'read_only': True},
+        }
+
+
+class FinalizeArtUploadSerializer(serializers.ModelSerializer):
+    """Данные арта, создаваемого из загруженного по частям изображения"""
+
+    class Meta:
+        model = models.Art
+        fields = (
+            'description',
+            'for_sale',
+            'tags',
+        )
+
+
 class ArtCommentSerializer(serializers.ModelSerializer):
-    user = ShortRetrieveUserSerializer(read_only=True)
+    user = UserCardSerializer(source='user_id', read_only=True)
 
     class Meta:
         model = models.ArtComment
+        list_serializer_class = UserCardsListSerializer
         fields = (
             'id',
             'user',
@@ -116,8 +322,4 @@ class ArtCommentSerializer(serializers.ModelSerializer):
         user = self.context['request'].user
         art_id = self.context['view'].kwargs['art_pk']
 
-        return models.ArtComment.objects.create(
-            user_id=user.pk,
-            art_id=art_id,
-            **validated_data,
-        )
+        return ArtCommentsService(user).create_comment(art_id, **validated_data)
@@ -6,6 +6,10 @@ from rest_framework_nested.routers import NestedSimpleRouter
 from . import views
 
 
+# Регистрируется отдельно и раньше артов, иначе `uploads` совпадет с `{pk}` арта.
+uploads_router = SimpleRouter()
+uploads_router.register(r'uploads', views.ArtUploadsViewSet, basename='art-upload')
+
 router = SimpleRouter()
 router.register(r'', views.ArtViewSet, basename='art')
 
@@ -14,6 +18,7 @@ comments_router.register(r'comments', views.ArtCommentsViewSet, basename='commen
 
 
 urlpatterns = [
+    *uploads_router.urls,
     *router.urls,
     *comments_router.urls,
 ]
@@ -1,16 +1,20 @@
 from typing import (
     Any,
     Type,
+    Sequence,
     Collection,
 )
+import re
 import contextlib
+import datetime as dt
 
 from django.db.models import (
+    F,
+    Exists,
+    OuterRef,
     QuerySet,
-    Subquery,
-    Count,
-    Model,
 )
+from django.db import transaction
 from django.contrib.auth.models import AnonymousUser
 from django_filters import rest_framework as filters
 
@@ -27,14 +31,34 @@ from rest_framework.decorators import action
 from rest_framework.serializers import Serializer
 from rest_framework.parsers import MultiPartParser
 from rest_framework.viewsets import GenericViewSet
+from rest_framework.pagination import BasePagination
 from rest_framework.utils.mediatypes import media_type_matches
 
-from apps.users.models import User
+from utils.pagination import (
+    KeysetPagination,
+    KeysetPaginationMixin,
+)
+from utils.views import (
+    ConditionalRetrieveMixin,
+    make_etag,
+)
 from apps.arts.models import (
     Art,
     ArtLike,
     ArtComment,
+    ArtUploadSession,
 )
+from apps.arts.services.likes import ArtLikesService
+from apps.arts.services.comments import ArtCommentsService
+from apps.arts.services.tags import ArtTagsService
+from apps.arts.services.search import ArtSearchService
+from apps.arts.services.duplicates import ArtDuplicatesService
+from apps.arts.services.related import ArtRelatedService
+from apps.arts.services.timeline import ArtTimelineService
+from apps.arts.services.views_counter import art_views_counter
+from apps.arts.services.uploads import ArtUploadsService
+from apps.arts.services.uploads import exceptions as uploads_exceptions
+from apps.arts.services.feed_cache import art_feed_cache
 
 from . import openapi
 from .serializers import (
@@ -43,23 +67,49 @@ from .serializers import (
     CreateArtSerializer,
     ShortRetrieveArtSerializer,
     ShortRetrieveArtForAuthorizedUserSerializer,
+    FastShortRetrieveArtSerializer,
+    FastShortRetrieveArtForAuthorizedUserSerializer,
     ArtCommentSerializer,
+    ArtTagStatsSerializer,
+    ArtTagsQuerySerializer,
+    ArtTagsAutocompleteQuerySerializer,
+    ArtSearchQuerySerializer,
+    ArtBatchQuerySerializer,
+    ArtLikesBatchSerializer,
+    ArtLikeStateSerializer,
+    ArtUploadSessionSerializer,
 )
 from .pagination import (
     ArtPagination,
+    ArtKeysetPagination,
+    SubscriptionsArtKeysetPagination,
+    ArtSearchKeysetPagination,
+    PopularArtKeysetPagination,
     ArtCommentsPagination,
+    ArtCommentsKeysetPagination,
+)
+from .permissions import (
+    IsArtOwner,
+    IsCommentOwner,
 )
-from .permissions import IsArtOwner
 from .filters import ArtFilterSet
 
 
 class ArtViewSet(
+    ConditionalRetrieveMixin,
+    KeysetPaginationMixin,
     mixins.CreateModelMixin,
     mixins.RetrieveModelMixin,
     mixins.DestroyModelMixin,
     GenericViewSet,
 ):
     pagination_class = ArtPagination
+    keyset_pagination_classes = {
+        'new_arts': ArtKeysetPagination,
+        'subscriptions_arts': SubscriptionsArtKeysetPagination,
+        'popular_arts': PopularArtKeysetPagination,
+        'user_arts': ArtKeysetPagination,
+    }
     permissions_map: dict[str, Collection[BasePermission]] = {
         'create': (IsAuthenticated(), ),
         'retrieve': (),
@@ -69,14 +119,30 @@ class ArtViewSet(
         'popular_arts': (),
         'like_art': (IsAuthenticated(), ),
         'dislike_art': (IsAuthenticated(), ),
+        'batch_like_arts': (IsAuthenticated(), ),
+        'duplicates': (),
+        'related_arts': (),
+        'batch_arts': (),
         'user_arts': (),
+        'search_arts': (),
+        'tags': (),
+        'autocomplete_tags': (),
     }
+    # Ленты, страницы которых кэшируются для анонимных пользователей.
+    anonymous_cached_actions = ('new_arts', 'popular_arts', 'user_arts')
     filter_backends = (filters.DjangoFilterBackend, )
     filterset_class = ArtFilterSet
 
     def get_permissions(self) -> Collection[BasePermission]:
         return self.permissions_map.get(self.action, ())
 
+    def get_pagination_class(self) -> Type[BasePagination] | None:
+        # Результаты поиска упорядочены по релевантности, поэтому для них
+        # поддерживается только пагинация по ключу.
+        if self.action == 'search_arts':
+            return ArtSearchKeysetPagination
+        return super().get_pagination_class()
+
     def get_serializer_class(self) -> Type[Serializer] | None:
         match self.action:
             case 'retrieve':
@@ -87,57 +153,51 @@ class ArtViewSet(
             case 'create':
                 return CreateArtSerializer
             
-            case 'new_arts' | 'subscriptions_arts' | 'popular_arts' | 'user_arts':
+            case (
+                'new_arts' | 'subscriptions_arts' | 'popular_arts' | 'user_arts'
+                | 'search_arts' | 'duplicates' | 'related_arts' | 'batch_arts'
+            ):
                 if isinstance(self.request.user, AnonymousUser):
                     return ShortRetrieveArtSerializer
                 return ShortRetrieveArtForAuthorizedUserSerializer
 
+            case 'tags' | 'autocomplete_tags':
+                return ArtTagStatsSerializer
+
     def get_queryset(self) -> QuerySet[Art]:
         queryset = Art.objects.select_related('author')
         match self.action:
             case 'new_arts':
-                queryset = (
-                    queryset
-                    .annotate(
-                        **{Art.AnnotatedFieldName.COUNT_LIKES: Count('likes')},
-                    )
-                    .order_by('-created_at')
-                )
+                queryset = queryset.order_by('-created_at', '-id')
             case 'subscriptions_arts':
-                user_model_name = User._meta.model_name
-                subscriptions_model: Model = User.subscriptions.through
-                subscriber_field_name = f'from_{user_model_name}_id'
-                subscription_field_name = f'to_{user_model_name}_id'
-                queryset = (
-                    queryset
-                    .filter(
-                        author_id__in=Subquery(
-                            subscriptions_model.objects
-                            .filter(**{subscriber_field_name: self.request.user.pk})
-                            .values(subscription_field_name),
-                        ),
-                    )
-                    .annotate(
-                        **{Art.AnnotatedFieldName.COUNT_LIKES: Count('likes')},
-                    )
-                    .order_by('-created_at')
-                )
+                # При пагинации по ключу ленту на источники разделит пагинатор
+                # (см. SubscriptionsArtKeysetPagination).
+                if not isinstance(self.paginator, KeysetPagination):
+                    queryset = ArtTimelineService().filter_feed(self.request.user.pk, queryset)
+                queryset = queryset.order_by('-created_at', '-id')
             case 'popular_arts':
+                # Рейтинг предрассчитан (см. ArtPopularityService), поэтому лента
+                # читается по индексу рейтинга. Арты без рейтинга появятся в ленте
+                # после ближайшего пересчета.
                 queryset = (
                     queryset
-                    .annotate(
-                        **{Art.AnnotatedFieldName.COUNT_LIKES: Count('likes')},
-                    )
-                    .order_by(f'-{Art.AnnotatedFieldName.COUNT_LIKES}')
+                    .filter(popularity__isnull=False)
+                    .annotate(popularity_score=F('popularity__score'))
+                    .order_by('-popularity_score', '-id')
                 )
             case 'user_arts':
                 queryset = (
                     queryset
                     .filter(author_id=self.kwargs['user_id'])
-                    .annotate(
-                        **{Art.AnnotatedFieldName.COUNT_LIKES: Count('likes')},
-                    )
-                    .order_by('-created_at')
+                    .order_by('-created_at', '-id')
+                )
+            case 'search_arts':
+                query_serializer = ArtSearchQuerySerializer(data=self.request.query_params)
+                query_serializer.is_valid(raise_exception=True)
+                queryset = (
+                    ArtSearchService()
+                    .search(queryset, query_serializer.validated_data['q'])
+                    .order_by('-search_rank', '-id')
                 )
 
         return queryset
@@ -145,18 +205,54 @@ class ArtViewSet(
     def get_object(self) -> Art:
         art: Art = super().get_object()
         if self.action == 'retrieve':
-            # Получение лайков для одного арта будет быстрее в два запроса, чем в один.
-            # (связано с тем, что JOIN'ы жрут много процессорного времени).
-            count_likes = ArtLike.objects.filter(art_id=art.pk).count()
-            art.__dict__[Art.AnnotatedFieldName.COUNT_LIKES] = count_likes
-
+            # Просмотр запишется в БД отложенно. В ответе сразу учтем текущий просмотр.
+            art_views_counter.add_view(art.pk)
             art.views += 1
-            art.save(update_fields=('views', ))
+            self._mark_liked_arts((art, ))
 
         return art
+
+    def get_retrieve_version(self) -> tuple[str, dt.datetime] | None:
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        fields = ['pk', 'updated_at', 'author__updated_at', 'author__profile__updated_at', 'likes_count', 'comments_count']
+        try:
+            queryset = Art.objects.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (TypeError, ValueError):
+            return None
+
+        if not isinstance(self.request.user, AnonymousUser):
+            queryset = queryset.annotate(liked_authorized_user=Exists(
+                ArtLike.objects.filter(art_id=OuterRef('pk'), user_id=self.request.user.pk),
+            ))
+            fields.append('liked_authorized_user')
+
+        version = queryset.values_list(*fields).first()
+        if version is None:
+            return None
+
+        # Просмотры в версию не входят: иначе она менялась бы на каждый запрос.
+        # Лайки и комментарии не меняют `Art.updated_at`, поэтому счетчики входят в ETag.
+        self._not_modified_art_pk = version[0]
+        last_modified = max(filter(None, version[1:4]))
+        return make_etag(*version), last_modified
+
+    def perform_not_modified(self) -> None:
+        # Повторный просмотр без тела ответа все равно считается просмотром.
+        art_views_counter.add_view(self._not_modified_art_pk)
     
     def perform_authentication(self, request: Request) -> None:
-        if self.action in ('retrieve', 'new_arts', 'popular_arts', 'user_arts'):
+        if self.action in (
+            'retrieve',
+            'new_arts',
+            'popular_arts',
+            'user_arts',
+            'search_arts',
+            'duplicates',
+            'related_arts',
+            'batch_arts',
+            'tags',
+            'autocomplete_tags',
+        ):
             with contextlib.suppress(exceptions.AuthenticationFailed):
                 return super().perform_authentication(request)
         else:
@@ -182,6 +278,12 @@ class ArtViewSet(
 
         return request
 
+    def perform_destroy(self, instance: Art) -> None:
+        with transaction.atomic():
+            ArtTagsService().remove_art(instance)
+            art_feed_cache.invalidate_art_deleted(instance)
+            super().perform_destroy(instance)
+
     @openapi.arts_openapi.get('create')
     def create(self, request: Request, *args, **kwargs) -> Response:
         return super().create(request, *args, **kwargs)
@@ -214,43 +316,156 @@ class ArtViewSet(
     def user_arts(self, request: Request, user_id: Any) -> Response:
         return self._get_list_arts(request)
     
+    @openapi.arts_openapi.get('search_arts')
+    @action(methods=('get', ), detail=False, url_path='search')
+    def search_arts(self, request: Request) -> Response:
+        return self._get_list_arts(request)
+
+    @openapi.arts_openapi.get('tags')
+    @action(methods=('get', ), detail=False, url_path='tags')
+    def tags(self, request: Request) -> Response:
+        query_serializer = ArtTagsQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+
+        tags = ArtTagsService().get_popular_tags(**query_serializer.validated_data)
+        serializer = self.get_serializer(tags, many=True)
+        return Response(serializer.data)
+
+    @openapi.arts_openapi.get('autocomplete_tags')
+    @action(methods=('get', ), detail=False, url_path='tags/autocomplete')
+    def autocomplete_tags(self, request: Request) -> Response:
+        query_serializer = ArtTagsAutocompleteQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+
+        tags = ArtTagsService().autocomplete(**query_serializer.validated_data)
+        serializer = self.get_serializer(tags, many=True)
+        return Response(serializer.data)
+
     def _get_list_arts(self, request: Request) -> Response:
-        queryset = self.filter_queryset(self.get_queryset())
+        use_cache = (
+            self.action in self.anonymous_cached_actions
+            and isinstance(request.user, AnonymousUser)
+        )
+        if use_cache:
+            cached_data = art_feed_cache.get_page(request)
+            if cached_data is not None:
+                return Response(cached_data)
+
+        # Ленты сериализуются быстрым сериализатором поверх values() (тот же JSON).
+        serializer = self._get_fast_serializer()
+        queryset = serializer.get_rows(self.filter_queryset(self.get_queryset()))
 
         page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
+        rows = page if page is not None else list(queryset)
+        if not isinstance(request.user, AnonymousUser):
+            ArtLikesService(request.user).mark_liked_art_rows(rows)
+        data = serializer.to_representation_many(rows)
+        response = self.get_paginated_response(data) if page is not None else Response(data)
+
+        if use_cache:
+            art_feed_cache.set_page(
+                request,
+                response.data,
+                list_tag=self._get_feed_cache_tag(),
+                art_pks=[row['id'] for row in rows],
+            )
+        return response
+
+    def _get_fast_serializer(self) -> FastShortRetrieveArtSerializer:
+        if isinstance(self.request.user, AnonymousUser):
+            return FastShortRetrieveArtSerializer(context=self.get_serializer_context())
+        return FastShortRetrieveArtForAuthorizedUserSerializer(context=self.get_serializer_context())
+
+    def _get_feed_cache_tag(self) -> str:
+        match self.action:
+            case 'popular_arts':
+                return art_feed_cache.POPULAR_ARTS_TAG
+            case 'user_arts':
+                return art_feed_cache.get_user_arts_tag(self.kwargs['user_id'])
+            case _:
+                return art_feed_cache.NEW_ARTS_TAG
+
+    def _mark_liked_arts(self, arts: Sequence[Art]) -> None:
+        if isinstance(self.request.user, AnonymousUser):
+            return
+        ArtLikesService(self.request.user).mark_liked_arts(arts)
+
+    @openapi.arts_openapi.get('batch_arts')
+    @action(methods=('get', ), detail=False, url_path='batch')
+    def batch_arts(self, request: Request) -> Response:
+        query_serializer = ArtBatchQuerySerializer(data=request.query_params)
+        query_serializer.is_valid(raise_exception=True)
+        art_pks = query_serializer.validated_data['ids']
+
+        # Просмотры не учитываются: это восстановление уже показанных артов, а не их открытие.
+        arts_by_pk = {art.pk: art for art in self.get_queryset().filter(pk__in=art_pks)}
+        arts = [arts_by_pk[art_pk] for art_pk in art_pks if art_pk in arts_by_pk]
+        self._mark_liked_arts(arts)
+
+        serializer = self.get_serializer(arts, many=True)
+        return Response(serializer.data)
 
-        serializer = self.get_serializer(queryset, many=True)
+    @openapi.arts_openapi.get('duplicates')
+    @action(methods=('get', ), detail=True, url_path='duplicates')
+    def duplicates(self, request: Request, *args, **kwargs) -> Response:
+        art = self.get_object()
+        if art.image_hash is None:
+            return Response([])
+
+        duplicates = ArtDuplicatesService().find_duplicates(
+            art.image_hash,
+            queryset=Art.objects.select_related('author'),
+            exclude_pk=art.pk,
+        )
+        self._mark_liked_arts(duplicates)
+        serializer = self.get_serializer(duplicates, many=True)
+        return Response(serializer.data)
+
+    @openapi.arts_openapi.get('related_arts')
+    @action(methods=('get', ), detail=True, url_path='related')
+    def related_arts(self, request: Request, *args, **kwargs) -> Response:
+        # Списки похожих предрассчитаны (см. ArtRelatedService), поэтому арт
+        # не запрашивается отдельно: для несуществующего арта список пуст.
+        related_arts = list(ArtRelatedService().get_related_arts(self._get_art_pk(), Art.objects.all()))
+        self._mark_liked_arts(related_arts)
+        serializer = self.get_serializer(related_arts, many=True)
         return Response(serializer.data)
 
     @openapi.arts_openapi.get('like_art')
     @action(methods=('post', ), detail=True, url_path='like')
     def like_art(self, request: Request, *args, **kwargs) -> Response:
-        art = self.get_object()
-        if ArtLike.objects.filter(user_id=request.user.pk, art_id=art.pk).exists():
-            raise exceptions.PermissionDenied(
-                f'Пользователь id={request.user.pk} уже лайкнул арт id={art.pk}'
-            )
-
-        ArtLike.objects.create(user_id=request.user.pk, art_id=art.pk)
+        # Лайк ставится одним запросом к БД без предварительного получения арта.
+        if ArtLikesService(request.user).like_art(self._get_art_pk()) is None:
+            raise exceptions.NotFound()
 
         return Response(status=status.HTTP_200_OK)
     
     @openapi.arts_openapi.get('dislike_art')
     @like_art.mapping.delete
     def dislike_art(self, request: Request, *args, **kwargs) -> Response:
-        art = self.get_object()
-        if not ArtLike.objects.filter(user_id=request.user.pk, art_id=art.pk).exists():
-            raise exceptions.PermissionDenied(
-                f'Пользователь id={request.user.pk} не лайкал арт id={art.pk}'
-            )
-        
-        ArtLike.objects.filter(user_id=request.user.pk, art_id=art.pk).delete()
+        if ArtLikesService(request.user).dislike_art(self._get_art_pk()) is None:
+            raise exceptions.NotFound()
 
         return Response(status=status.HTTP_204_NO_CONTENT)
 
+    @openapi.arts_openapi.get('batch_like_arts')
+    @action(methods=('post', ), detail=False, url_path='likes/batch')
+    def batch_like_arts(self, request: Request) -> Response:
+        serializer = ArtLikesBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        states = ArtLikesService(request.user).apply(
+            (operation['art_id'], operation['liked'])
+            for operation in serializer.validated_data['operations']
+        )
+        return Response(ArtLikeStateSerializer(states, many=True).data)
+
+    def _get_art_pk(self) -> int:
+        try:
+            return int(self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        except ValueError:
+            raise exceptions.NotFound()
+
     # # TODO: Убрать.
     # @action(methods=('post', ), detail=False, url_path='generate-likes')
     # def generate_likes(self, request: Request) -> Response:
@@ -260,22 +475,33 @@ class ArtViewSet(
 
 
 class ArtCommentsViewSet(
+    KeysetPaginationMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
+    mixins.DestroyModelMixin,
     GenericViewSet,
 ):
     pagination_class = ArtCommentsPagination
+    keyset_pagination_classes = {
+        'list': ArtCommentsKeysetPagination,
+    }
     serializer_class = ArtCommentSerializer
     permissions_map: dict[str, Collection[BasePermission]] = {
         'create': (IsAuthenticated(), ),
         'list': (),
+        'destroy': (IsCommentOwner(), ),
     }
 
     def get_permissions(self) -> Collection[BasePermission]:
         return self.permissions_map.get(self.action, ())
 
     def get_queryset(self) -> QuerySet[ArtComment]:
-        return ArtComment.objects.filter(art_id=self.kwargs['art_pk']).order_by('-created_at')
+        # Авторы комментариев берутся из кэша карточек (см. UserCardSerializer).
+        return (
+            ArtComment.objects
+            .filter(art_id=self.kwargs['art_pk'])
+            .order_by('-created_at', '-id')
+        )
     
     def perform_authentication(self, request: Request) -> None:
         if self.action in ('list', ):
@@ -294,7 +520,124 @@ class ArtCommentsViewSet(
         self._check_art_exists()
         return super().list(request, *args, **kwargs)
 
+    @openapi.art_comments_openapi.get('destroy')
+    def destroy(self, request: Request, *args, **kwargs) -> Response:
+        return super().destroy(request, *args, **kwargs)
+
+    def perform_destroy(self, instance: ArtComment) -> None:
+        ArtCommentsService(self.request.user).delete_comment(instance)
+
     def _check_art_exists(self) -> None:
         art_pk = self.kwargs['art_pk']
         if not Art.objects.filter(pk=art_pk).exists():
             raise exceptions.NotFound(f'Арта с id={art_pk} не существует.')
+
+
+class ArtUploadsViewSet(
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    GenericViewSet,
+):
+    """
+    Возобновляемая загрузка изображения арта по частям.
+
+    1. `POST /arts/uploads/` - создание сессии с размером файла.
+    2. `PUT /arts/uploads/{id}/` с заголовком `Content-Range` - загрузка части.
+       После обрыва связи `GET /arts/uploads/{id}/` возвращает `offset`, с которого продолжить.
+    3. `POST /arts/uploads/{id}/finalize/` - создание арта из загруженного файла.
+    """
+
+    serializer_class = ArtUploadSessionSerializer
+    permission_classes = (IsAuthenticated, )
+    content_range_regex = re.compile(r'^bytes (?P<start>\d+)-(?P<end>\d+)/(?P<size>\d+)$')
+
+    def get_queryset(self) -> QuerySet[ArtUploadSession]:
+        return ArtUploadsService(self.request.user).get_sessions()
+
+    @openapi.art_uploads_openapi.get('create')
+    def create(self, request: Request, *args, **kwargs) -> Response:
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        try:
+            session = ArtUploadsService(request.user).create_session(**serializer.validated_data)
+        except uploads_exceptions.UploadIsTooLarge as e:
+            raise exceptions.ValidationError({'size': [e.message]})
+
+        return Response(self.get_serializer(session).data, status=status.HTTP_201_CREATED)
+
+    @openapi.art_uploads_openapi.get('retrieve')
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        return super().retrieve(request, *args, **kwargs)
+
+    @openapi.art_uploads_openapi.get('upload_chunk')
+    def update(self, request: Request, *args, **kwargs) -> Response:
+        # Тело запроса читается потоком в сервисе, поэтому request.data здесь не используется.
+        session = self.get_object()
+        offset, length = self._get_chunk_range(request, session)
+        try:
+            session = ArtUploadsService(request.user).write_chunk(session, offset, length, request.stream)
+        except uploads_exceptions.UploadChunkOutOfRange as e:
+            raise exceptions.ValidationError({'Content-Range': [e.message]})
+        except uploads_exceptions.UploadOffsetMismatch as e:
+            return Response(
+                {'detail': e.message, 'offset': session.offset},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        return Response(self.get_serializer(session).data)
+
+    @openapi.art_uploads_openapi.get('destroy')
+    def destroy(self, request: Request, *args, **kwargs) -> Response:
+        return super().destroy(request, *args, **kwargs)
+
+    def perform_destroy(self, instance: ArtUploadSession) -> None:
+        ArtUploadsService(self.request.user).delete_session(instance)
+
+    @openapi.art_uploads_openapi.get('finalize')
+    @action(methods=('post', ), detail=True, url_path='finalize')
+    def finalize(self, request: Request, *args, **kwargs) -> Response:
+        session = self.get_object()
+        service = ArtUploadsService(request.user)
+        try:
+            image = service.open_file(session)
+        except uploads_exceptions.UploadIsNotComplete as e:
+            return Response(
+                {'detail': e.message, 'offset': session.offset},
+                status=status.HTTP_409_CONFLICT,
+            )
+
+        with image:
+            data = {
+                field_name: request.data[field_name]
+                for field_name in ('description', 'for_sale', 'tags')
+                if field_name in request.data
+            }
+            serializer = CreateArtSerializer(
+                data={**data, 'image': image},
+                context=self.get_serializer_context(),
+            )
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+
+        service.delete_session(session)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def _get_chunk_range(self, request: Request, session: ArtUploadSession) -> tuple[int, int]:
+        """Смещение и длина части из заголовка `Content-Range: bytes start-end/size`"""
+
+        match = self.content_range_regex.match(request.headers.get('Content-Range', ''))
+        if match is None:
+            raise exceptions.ValidationError({
+                'Content-Range': ['Ожидается заголовок вида `bytes start-end/size`.'],
+            })
+
+        start, end, size = int(match['start']), int(match['end']), int(match['size'])
+        length = end - start + 1
+        if end < start or size != session.size:
+            raise exceptions.ValidationError({'Content-Range': ['Некорректный диапазон.']})
+        if request.headers.get('Content-Length') != str(length):
+            raise exceptions.ValidationError({
+                'Content-Length': ['Длина тела запроса должна совпадать с диапазоном `Content-Range`.'],
+            })
+
+        return start, length
@@ -8,6 +8,10 @@ from apps.chats.models import (
     ChatMessage,
 )
 from apps.users.models import User
+from api.v1.users.serializers import (
+    UserCardsListSerializer,
+    get_user_cards,
+)
 
 
 class ShortChatSerializer(serializers.ModelSerializer):
@@ -27,6 +31,18 @@ class ShortChatSerializer(serializers.ModelSerializer):
             "avatar",
             "has_unread_messages",
         )
+        # Аватары собеседников берутся из кэша карточек одним запросом на страницу.
+        list_serializer_class = UserCardsListSerializer
+
+    def get_user_card_pks(self, chats: list[Chat]) -> list[int]:
+        current_user = self.context["request"].user
+        return [
+            user.pk
+            for chat in chats
+            if chat.chat_type == Chat.ChatType.PERSONAL
+            for user in chat.users.all()
+            if user.pk != current_user.pk
+        ]
 
     def get_has_unread_messages(self, obj: Chat) -> bool:
         current_user: User = self.context['request'].user
@@ -77,10 +93,8 @@ class ShortChatSerializer(serializers.ModelSerializer):
                 for user in obj.users.all()
                 if user.pk != current_user.pk
             ][0]
-            avatar = str(other_user.profile.avatar)
-            if not avatar:
-                return
-            return self.context["request"].build_absolute_uri(other_user.profile.avatar.url)
+            card = get_user_cards(self.context, (other_user.pk, ))[other_user.pk]
+            return card["avatar"] if card is not None else None
         else:
             return self.context["request"].build_absolute_uri(obj.group_chat_data.avatar.url) or None
 
@@ -11,6 +11,7 @@ from rest_framework.permissions import (
     IsAuthenticated,
 )
 from rest_framework.request import Request
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework.decorators import action
 from rest_framework.serializers import Serializer
@@ -24,6 +25,8 @@ from apps.chats.models import (
     ChatMessage,
 )
 from apps.users.models import User
+from utils.renderers import StreamingJSONRenderer
+from utils.views import StreamingListMixin
 
 from .pagination import ChatPagination, ChatMessagePagination
 from .serializers import ShortChatSerializer, ChatMessageSerializer
@@ -93,11 +96,14 @@ class ChatsViewSet(
     
 
 class ChatMessagesViewSet(
+    StreamingListMixin,
     mixins.ListModelMixin,
     GenericViewSet,
 ):
     serializer_class = ChatMessageSerializer
     pagination_class = ChatMessagePagination
+    # Страницы сообщений большие, поэтому отдаются потоком.
+    renderer_classes = (StreamingJSONRenderer, BrowsableAPIRenderer)
     permissions_map: dict[str, Collection[BasePermission]] = {
         "list": (IsAuthenticated(), ),
     }
@@ -110,15 +110,34 @@ users_openapi = {
         description=_(
             'Получение информации о пользователе.<br><br>'
             'Поля `is_your_follower` и `is_your_subscription` доступны только тогда, '
-            'когда запрос делает авторизированный пользователь. Иначе они просто отсутствуют.'
+            'когда запрос делает авторизированный пользователь. Иначе они просто отсутствуют.<br><br>'
+            'Ответ содержит заголовки `ETag` и `Last-Modified`. Если передать их значения '
+            'в `If-None-Match` или `If-Modified-Since`, а пользователь не изменился, вернется 304 без тела.'
         ),
         auth=(),
         request=serializers.RetrieveUserForAuthorizedUserSerializer,
         responses={
             status.HTTP_200_OK: serializers.RetrieveUserForAuthorizedUserSerializer,
+            status.HTTP_304_NOT_MODIFIED: None,
             status.HTTP_404_NOT_FOUND: OpenAPIDetailSerializer,
         },
     ),
+    'recommendations': extend_schema(
+        operation_id="user_recommendations",
+        methods=('get', ),
+        summary=_("Получение рекомендаций, на кого подписаться"),
+        description=_(
+            'Позволяет получить пользователей, на которых стоит подписаться текущему пользователю, от лучших.<br><br>'
+            'Рекомендуются подписки подписок, авторы, чьи арты пользователь лайкает, и авторы, '
+            'которых лайкают его подписки. Рекомендации пересчитываются периодически, '
+            'пользователи, на которых уже есть подписка, не возвращаются.<br><br>'
+            'Возвращает не больше `20` пользователей.<br>'
+        ),
+        responses={
+            status.HTTP_200_OK: serializers.UserCardSerializer(many=True),
+            status.HTTP_401_UNAUTHORIZED: OpenAPIDetailSerializer,
+        },
+    ),
     'current_user': extend_schema(
         operation_id="retrieve_current_user",
         methods=('get', ),
@@ -1,19 +1,79 @@
-from typing import Any, Type
+from typing import Any, Type, Iterable
 
 from rest_framework import exceptions
 from rest_framework import serializers
 from rest_framework.request import Request
 
+from django.db import models
 from django.contrib.auth.models import AnonymousUser
 from django.contrib.auth.base_user import AbstractBaseUser
 
 from drf_spectacular.utils import extend_schema_field
 from drf_spectacular.types import OpenApiTypes
 
+from utils.serializers import ValuesSerializer
+
 from apps.users.models import (
     User,
     UserProfile,
 )
+from apps.users.services.cards import user_cards_cache
+
+
+def get_user_cards(context: dict[str, Any], user_pks: Iterable[Any]) -> dict[Any, dict[str, Any] | None]:
+    """
+    Представления карточек пользователей с абсолютными ссылками на аватары.
+
+    Карточки запоминаются в контексте сериализатора, поэтому за запрос
+    каждый пользователь читается из кэша карточек не больше одного раза.
+    """
+
+    cards: dict[Any, dict[str, Any] | None] = context.setdefault('user_cards', {})
+    missing_pks = {user_pk for user_pk in user_pks if user_pk not in cards}
+    if not missing_pks:
+        return cards
+
+    request = context['request']
+    cards.update(dict.fromkeys(missing_pks))
+    for user_pk, card in user_cards_cache.get_many(missing_pks).items():
+        cards[user_pk] = {
+            'id': card['id'],
+            'username': card['username'],
+            'avatar': request.build_absolute_uri(card['avatar']) if card['avatar'] else None,
+        }
+
+    return cards
+
+
+class UserCardsListSerializer(serializers.ListSerializer):
+    """
+    Список, загружающий карточки всех своих пользователей одним запросом к кэшу.
+
+    Id пользователей дает метод `get_user_card_pks(instances)` дочернего
+    сериализатора, а если его нет - поля-карточки (UserCardSerializer) дочернего
+    сериализатора.
+    """
+
+    def to_representation(self, data: Any) -> list[Any]:
+        instances = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        get_user_cards(self.context, self._get_user_pks(instances))
+        return super().to_representation(instances)
+
+    def _get_user_pks(self, instances: list[Any]) -> Iterable[Any]:
+        get_user_card_pks = getattr(self.child, 'get_user_card_pks', None)
+        if get_user_card_pks is not None:
+            return get_user_card_pks(instances)
+
+        card_fields = [
+            field
+            for field in self.child.fields.values()
+            if isinstance(field, UserCardSerializer)
+        ]
+        return [
+            field.get_attribute(instance)
+            for field in card_fields
+            for instance in instances
+        ]
 
 
 class CreateUserSerializer(serializers.ModelSerializer):
@@ -45,6 +105,39 @@ class ShortRetrieveUserSerializer(serializers.ModelSerializer):
         return request.build_absolute_uri(obj.profile.avatar.url)
 
 
+class UserCardSerializer(ShortRetrieveUserSerializer):
+    """
+    Короткая информация о пользователе из кэша карточек (см. UserCardsCache).
+
+    Принимает пользователя или его id (например, `source='author_id'`),
+    поэтому пользователя и его профиль не нужно выбирать из БД.
+    """
+
+    class Meta(ShortRetrieveUserSerializer.Meta):
+        list_serializer_class = UserCardsListSerializer
+
+    def to_representation(self, instance: User | Any) -> dict[str, Any] | None:
+        user_pk = self._get_user_pk(instance)
+        return get_user_cards(self.context, (user_pk, ))[user_pk]
+
+    def get_user_card_pks(self, instances: Iterable[User | Any]) -> list[Any]:
+        return [self._get_user_pk(instance) for instance in instances]
+
+    @staticmethod
+    def _get_user_pk(instance: User | Any) -> Any:
+        return instance.pk if isinstance(instance, models.Model) else instance
+
+
+class FastShortRetrieveUserSerializer(ValuesSerializer):
+    """Быстрая версия `ShortRetrieveUserSerializer` для списков с тем же JSON"""
+
+    fields = (
+        ('id', 'id', None),
+        ('username', 'username', None),
+        ('avatar', 'profile__avatar', 'to_file_url'),
+    )
+
+
 class RetrieveUserSerializer(serializers.ModelSerializer):
     """Сериализатор для получения данных о пользователе"""
         
@@ -54,9 +147,9 @@ class RetrieveUserSerializer(serializers.ModelSerializer):
             fields = '__all__'
 
     profile = _UserProfileSerializer()
-    followers = ShortRetrieveUserSerializer(many=True)
+    followers = UserCardSerializer(many=True)
     followers_count = serializers.SerializerMethodField()
-    subscriptions = ShortRetrieveUserSerializer(many=True)
+    subscriptions = UserCardSerializer(many=True)
     subscriptions_count = serializers.SerializerMethodField()
 
     class Meta:
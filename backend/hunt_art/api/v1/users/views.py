@@ -1,5 +1,6 @@
 import logging
 import traceback
+import datetime as dt
 import contextlib
 from typing import (
     Type,
@@ -29,11 +30,16 @@ from rest_framework_simplejwt.views import (
 )
 
 from apps.users.models import User
+from utils.views import (
+    ConditionalRetrieveMixin,
+    make_etag,
+)
 from apps.users.services.subscriptions.exceptions import (
     UserIsNotFollower,
     UserIsAlreadyFollower,
 )
 from apps.users.services.subscriptions import UserSubscriptionsService
+from apps.users.services.recommendations import UserRecommendationsService
 
 from .serializers import (
     CreateUserSerializer,
@@ -41,6 +47,8 @@ from .serializers import (
     RetrieveUserSerializer,
     RetrieveUserForAuthorizedUserSerializer,
     ShortRetrieveUserSerializer,
+    FastShortRetrieveUserSerializer,
+    UserCardSerializer,
 )
 from .openapi import users_openapi, auth_openapi
 from .pagination import UsersPagination
@@ -51,6 +59,7 @@ logger = logging.getLogger(__name__)
 
 
 class UserViewSet(
+    ConditionalRetrieveMixin,
     mixins.RetrieveModelMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
@@ -87,6 +96,8 @@ class UserViewSet(
                 return UpdateUserSerializer
             case 'list' | 'search_users':
                 return ShortRetrieveUserSerializer
+            case 'recommendations':
+                return UserCardSerializer
 
     def get_queryset(self) -> QuerySet[User]:
         queryset = User.objects.all()
@@ -101,6 +112,29 @@ class UserViewSet(
                 queryset = queryset.select_related('profile')
 
         return queryset
+
+    def get_retrieve_version(self) -> tuple[str, dt.datetime] | None:
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            version = (
+                User.objects
+                .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+                .values_list('pk', 'updated_at', 'last_login', 'profile__updated_at')
+                .first()
+            )
+        except (TypeError, ValueError):
+            return None
+        if version is None:
+            return None
+
+        # Поля `is_your_follower` и `is_your_subscription` зависят от того, кто делает запрос,
+        # а изменения подписок обновляют версии обоих пользователей.
+        # Изменения коротких карточек подписчиков и подписок в версию не входят.
+        pk, updated_at, last_login, profile_updated_at = version
+        last_modified = max(filter(None, (updated_at, last_login, profile_updated_at)))
+        etag = make_etag(pk, updated_at, last_login, profile_updated_at, self.request.user.pk)
+
+        return etag, last_modified
     
     def perform_authentication(self, request: Request) -> None:
         # Эти эндпоинты являются открытыми и в аутентификации не нуждаются.
@@ -124,7 +158,14 @@ class UserViewSet(
     
     @users_openapi.get('list')
     def list(self, request: Request, *args, **kwargs) -> Response:
-        return super().list(request, *args, **kwargs)
+        # Список сериализуется быстрым сериализатором поверх values() (тот же JSON).
+        serializer = FastShortRetrieveUserSerializer(context=self.get_serializer_context())
+        queryset = serializer.get_rows(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.to_representation_many(page))
+        return Response(serializer.to_representation_many(queryset))
     
     @users_openapi.get('search_users')
     @action(
@@ -136,6 +177,17 @@ class UserViewSet(
     def search_users(self, request: Request, *args, **kwargs) -> Response:
         return self.list(request, *args, **kwargs)
 
+    @users_openapi.get('recommendations')
+    @action(methods=('get', ), detail=False, url_path='recommendations')
+    def recommendations(self, request: Request) -> Response:
+        """Рекомендации "на кого подписаться" для текущего пользователя"""
+
+        # Рекомендации предрассчитаны (см. UserRecommendationsService),
+        # а карточки пользователей берутся из кэша одним запросом.
+        user_pks = UserRecommendationsService().get_recommended_user_pks(request.user.pk)
+        serializer = self.get_serializer(user_pks, many=True)
+        return Response(serializer.data)
+
     @users_openapi.get('current_user')
     @action(methods=('get', ), detail=False, url_path='im')
     def current_user(self, request: Request) -> Response:
@@ -6,3 +6,8 @@ from . import models
 admin.site.register(models.Art)
 admin.site.register(models.ArtComment)
 admin.site.register(models.ArtLike)
+admin.site.register(models.ArtPopularity)
+admin.site.register(models.ArtTimelineEntry)
+admin.site.register(models.ArtTagStats)
+admin.site.register(models.ArtRelation)
+admin.site.register(models.ArtUploadSession)
@@ -6,3 +6,15 @@ class ArtsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.arts'
     verbose_name = _('Арты')
+
+    def ready(self) -> None:
+        from apps.arts.models import Art
+        from apps.arts.services.thumbnails import art_thumbnails_generator
+        from apps.media.services.deletion_queue import media_deletion_queue
+
+        # Уменьшенные копии изображений удаляются вместе с артом.
+        media_deletion_queue.register(
+            Art,
+            get_names=art_thumbnails_generator.get_names,
+            filter_referenced_names=art_thumbnails_generator.filter_referenced_names,
+        )
@@ -0,0 +1,87 @@
+from typing import Any
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db.models import Q
+from django.core.files.storage import default_storage
+from django.core.management.base import (
+    BaseCommand,
+    CommandParser,
+)
+
+from apps.arts.models import Art
+from apps.arts.services.image_metadata import ArtImageMetadataService
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет размеры, преобладающий цвет, превью и перцептивный хэш изображений артов. '
+        'Изображения обрабатываются параллельно, результаты записываются пачками.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Пересчитать метаданные всех артов, а не только незаполненные.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.ARTS_THUMBNAILS_WORKERS,
+            help='Количество потоков обработки изображений.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Количество артов в одной пачке обработки и в одном UPDATE.',
+        )
+
+    def handle(self, *args, all: bool, workers: int, batch_size: int, **options) -> None:
+        arts = Art.objects.order_by('pk')
+        if not all:
+            arts = arts.filter(Q(image_width__isnull=True) | Q(image_hash__isnull=True))
+
+        service = ArtImageMetadataService()
+        fields = (
+            'image_width',
+            'image_height',
+            'dominant_color',
+            'placeholder',
+            'image_hash',
+            'image_hash_chunks',
+        )
+        processed_count = failed_count = 0
+
+        # Потоки только читают файлы и считают метаданные, запись в БД идет из основного потока.
+        # `executor.map` сразу ставит в очередь все переданные элементы, поэтому арты
+        # передаются ему пачками: в памяти не больше одной пачки задач и результатов.
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            art_images = arts.values_list('pk', 'image').iterator(chunk_size=batch_size)
+            while art_images_batch := list(islice(art_images, batch_size)):
+                batch: list[Art] = []
+                for art_pk, metadata in executor.map(
+                    lambda art_image: self._extract(service, *art_image),
+                    art_images_batch,
+                ):
+                    if metadata is None:
+                        failed_count += 1
+                        continue
+                    batch.append(Art(pk=art_pk, **metadata))
+
+                if batch:
+                    processed_count += Art.objects.bulk_update(batch, fields)
+
+        self.stdout.write(self.style.SUCCESS(f'Обработано артов: {processed_count}'))
+        if failed_count:
+            self.stdout.write(self.style.WARNING(f'Не удалось обработать артов: {failed_count}'))
+
+    def _extract(self, service: ArtImageMetadataService, art_pk: Any, image_name: str) -> tuple[Any, dict[str, Any] | None]:
+        try:
+            with default_storage.open(image_name, 'rb') as image_file:
+                return art_pk, service.extract(image_file)
+        except Exception as e:
+            self.stderr.write(f'Art#{art_pk}: {e}')
+            return art_pk, None
@@ -0,0 +1,103 @@
+import timeit
+from typing import (
+    Any,
+    Callable,
+)
+
+from django.conf import settings
+from django.db.models import QuerySet
+from django.test import RequestFactory
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from rest_framework.request import Request
+from rest_framework.renderers import JSONRenderer
+
+from utils.serializers import ValuesSerializer
+from apps.arts.models import Art
+from apps.users.models import User
+from api.v1.arts.serializers import (
+    ShortRetrieveArtSerializer,
+    FastShortRetrieveArtSerializer,
+)
+from api.v1.users.serializers import (
+    ShortRetrieveUserSerializer,
+    FastShortRetrieveUserSerializer,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает обычные сериализаторы лент и списков с быстрыми сериализаторами '
+        'поверх values(): проверяет, что JSON совпадает байт в байт, и замеряет время '
+        'получения и сериализации страницы (вместе с запросом к БД).'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--page-sizes',
+            type=int,
+            nargs='+',
+            default=[10, 40, 100],
+            help='Размеры страниц.',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=200,
+            help='Количество повторов каждого замера.',
+        )
+        parser.add_argument(
+            '--host',
+            default=settings.ALLOWED_HOSTS[0] if settings.ALLOWED_HOSTS else 'localhost',
+            help='Хост запроса для абсолютных ссылок.',
+        )
+
+    def handle(self, *args, page_sizes: list[int], repeat: int, host: str, **options) -> None:
+        request = Request(RequestFactory().get('/', HTTP_HOST=host))
+        context = {'request': request}
+        renderer = JSONRenderer()
+
+        for page_size in page_sizes:
+            arts = Art.objects.order_by('-created_at', '-id')[:page_size]
+            self._compare(
+                f'Арты, страница {page_size}',
+                lambda: ShortRetrieveArtSerializer(list(arts.all()), many=True, context=context).data,
+                lambda: self._fast_serialize(FastShortRetrieveArtSerializer(context), arts),
+                renderer=renderer,
+                repeat=repeat,
+            )
+
+            users = User.objects.select_related('profile').order_by('id')[:page_size]
+            self._compare(
+                f'Пользователи, страница {page_size}',
+                lambda: ShortRetrieveUserSerializer(list(users.all()), many=True, context=context).data,
+                lambda: self._fast_serialize(FastShortRetrieveUserSerializer(context), users),
+                renderer=renderer,
+                repeat=repeat,
+            )
+
+    @staticmethod
+    def _fast_serialize(serializer: ValuesSerializer, queryset: QuerySet) -> list[dict[str, Any]]:
+        return serializer.to_representation_many(serializer.get_rows(queryset))
+
+    def _compare(
+        self,
+        title: str,
+        serialize: Callable[[], Any],
+        fast_serialize: Callable[[], Any],
+        renderer: JSONRenderer,
+        repeat: int,
+    ) -> None:
+        if renderer.render(serialize()) != renderer.render(fast_serialize()):
+            raise CommandError(f'{title}: JSON быстрого сериализатора отличается от обычного.')
+
+        time = min(timeit.repeat(serialize, number=1, repeat=repeat))
+        fast_time = min(timeit.repeat(fast_serialize, number=1, repeat=repeat))
+        self.stdout.write(
+            f'{title}: {time * 1000:.2f} мс -> {fast_time * 1000:.2f} мс '
+            f'(в {time / fast_time:.1f} раза быстрее)'
+        )
@@ -0,0 +1,41 @@
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.core.management.base import (
+    BaseCommand,
+    CommandParser,
+)
+
+from apps.arts.services.uploads import ArtUploadsService
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет незавершенные сессии загрузки артов по частям вместе с файлами. '
+        'С флагом --loop работает как фоновый процесс и удаляет их периодически.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Удалять просроченные сессии бесконечно с интервалом --interval.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.ARTS_UPLOADS_CLEAR_INTERVAL,
+            help='Интервал между проверками в секундах.',
+        )
+
+    def handle(self, *args, loop: bool, interval: float, **options) -> None:
+        while True:
+            close_old_connections()
+            deleted_count = ArtUploadsService.clear_expired_sessions()
+            if deleted_count > 0 or not loop:
+                self.stdout.write(self.style.SUCCESS(f'Удалено сессий загрузки: {deleted_count}'))
+
+            if not loop:
+                break
+            time.sleep(interval)
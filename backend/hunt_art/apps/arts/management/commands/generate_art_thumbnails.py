@@ -0,0 +1,61 @@
+from itertools import islice
+from concurrent.futures import as_completed
+
+from django.conf import settings
+from django.core.management.base import (
+    BaseCommand,
+    CommandParser,
+)
+
+from apps.arts.models import Art
+from apps.arts.services.thumbnails import ArtThumbnailsGenerator
+
+
+class Command(BaseCommand):
+    help = (
+        'Создает уменьшенные копии изображений артов, у которых их еще нет. '
+        'С флагом --all пересоздает копии для всех артов, например после изменения ширин.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Пересоздать копии для всех артов.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.ARTS_THUMBNAILS_WORKERS,
+            help='Количество потоков генерации.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Количество артов, одновременно поставленных в очередь генерации.',
+        )
+
+    def handle(self, *args, all: bool, workers: int, batch_size: int, **options) -> None:
+        arts = Art.objects.order_by('pk')
+        if not all:
+            arts = arts.filter(thumbnails=[])
+
+        generator = ArtThumbnailsGenerator(
+            widths=settings.ARTS_THUMBNAILS_WIDTHS,
+            max_workers=workers,
+        )
+        # Следующая пачка ставится в очередь только после завершения предыдущей,
+        # поэтому в памяти не больше `batch_size` задач.
+        art_pks = arts.values_list('pk', flat=True).iterator(chunk_size=batch_size)
+        processed_count = failed_count = 0
+        while art_pks_batch := list(islice(art_pks, batch_size)):
+            for future in as_completed(generator.submit_many(art_pks_batch)):
+                if future.result() is None:
+                    failed_count += 1
+                else:
+                    processed_count += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Обработано артов: {processed_count}'))
+        if failed_count:
+            self.stdout.write(self.style.WARNING(f'Не удалось обработать артов: {failed_count}'))
@@ -0,0 +1,93 @@
+import os
+
+from django.apps import apps
+from django.db import models
+from django.core.files.storage import default_storage
+from django.core.management.base import (
+    BaseCommand,
+    CommandError,
+    CommandParser,
+)
+
+from apps.arts.models import Art
+from apps.arts.services.thumbnails import ArtThumbnailsGenerator
+from utils.storage import ContentAddressedStorage
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит загруженные файлы всех моделей в хранилище с адресацией по содержимому: '
+        'копирует файл под именем из хэша и обновляет ссылку в БД. '
+        'Старые файлы удаляются только с флагом --delete-old.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--delete-old',
+            action='store_true',
+            help='Удалить старые файлы после переноса всех ссылок.',
+        )
+
+    def handle(self, *args, delete_old: bool, **options) -> None:
+        if not isinstance(default_storage, ContentAddressedStorage):
+            raise CommandError('Хранилище по умолчанию должно быть ContentAddressedStorage.')
+
+        self._old_names: set[str] = set()
+        self._migrated_count = 0
+
+        for model in apps.get_models():
+            for field in model._meta.concrete_fields:
+                if isinstance(field, models.FileField):
+                    self._migrate_field(model, field)
+        self._migrate_art_thumbnails()
+
+        self.stdout.write(self.style.SUCCESS(f'Перенесено файлов: {self._migrated_count}'))
+
+        if delete_old:
+            for name in self._old_names:
+                default_storage.delete(name)
+            self.stdout.write(self.style.SUCCESS(f'Удалено старых файлов: {len(self._old_names)}'))
+
+    def _migrate_field(self, model: type[models.Model], field: models.FileField) -> None:
+        rows = (
+            model._default_manager
+            .exclude(**{f'{field.name}__isnull': True})
+            .exclude(**{field.name: ''})
+            .values_list('pk', field.name)
+            .iterator()
+        )
+        for pk, name in rows:
+            new_name = self._migrate_file(name)
+            if new_name != name:
+                model._default_manager.filter(pk=pk).update(**{field.name: new_name})
+
+    def _migrate_art_thumbnails(self) -> None:
+        arts = Art.objects.exclude(thumbnails=[]).values_list('pk', 'thumbnails').iterator()
+        for art_pk, thumbnails in arts:
+            new_thumbnails = [
+                {
+                    **thumbnail,
+                    # Раньше копии лежали в каталоге арта, теперь - в общем каталоге копий.
+                    'name': self._migrate_file(
+                        thumbnail['name'],
+                        save_name=f'{ArtThumbnailsGenerator.UPLOAD_TO}/{os.path.basename(thumbnail["name"])}',
+                    ),
+                }
+                for thumbnail in thumbnails
+            ]
+            if new_thumbnails != thumbnails:
+                Art.objects.filter(pk=art_pk).update(thumbnails=new_thumbnails)
+
+    def _migrate_file(self, name: str, save_name: str | None = None) -> str:
+        if default_storage.is_content_addressed(name):
+            return name
+        if not default_storage.exists(name):
+            self.stderr.write(f'Файл не найден: {name}')
+            return name
+
+        with default_storage.open(name, 'rb') as file:
+            new_name = default_storage.save(save_name or name, file)
+
+        self._old_names.add(name)
+        self._migrated_count += 1
+        return new_name
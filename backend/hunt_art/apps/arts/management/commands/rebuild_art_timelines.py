@@ -0,0 +1,37 @@
+from django.core.management.base import (
+    BaseCommand,
+    CommandParser,
+)
+
+from apps.arts.services.timeline import ArtTimelineService
+
+
+class Command(BaseCommand):
+    help = (
+        'Перестраивает ленты подписок всех пользователей. '
+        'Нужно после первого развертывания и после изменения порога "знаменитости". '
+        'С флагом --if-changed перестраивает ленты, только если настройки лент изменились '
+        'с последнего перестроения.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--if-changed',
+            action='store_true',
+            help='Перестраивать ленты, только если изменились настройки лент.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество пользователей, ленты которых перестраиваются в одной транзакции.',
+        )
+
+    def handle(self, *args, if_changed: bool, batch_size: int, **options) -> None:
+        service = ArtTimelineService()
+        if if_changed and not service.is_rebuild_needed():
+            self.stdout.write('Настройки лент подписок не изменились.')
+            return
+
+        service.rebuild(batch_size=batch_size)
+        self.stdout.write('Ленты подписок перестроены.')
@@ -0,0 +1,55 @@
+from typing import Type
+
+from django.db.models import (
+    F,
+    Model,
+    Count,
+    OuterRef,
+    Subquery,
+)
+from django.db.models.functions import Coalesce
+from django.core.management.base import BaseCommand
+
+from apps.arts.models import (
+    Art,
+    ArtLike,
+    ArtComment,
+)
+from apps.arts.services.tags import ArtTagsService
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает денормализованные счетчики артов по фактическим данным. '
+        'Нужна, если счетчики разошлись с данными, например после каскадного '
+        'удаления пользователей вместе с их лайками и артами.'
+    )
+
+    def handle(self, *args, **options) -> None:
+        updated_count = self._recount(ArtLike, 'likes_count')
+        self.stdout.write(self.style.SUCCESS(f'Исправлено счетчиков лайков: {updated_count}'))
+
+        updated_count = self._recount(ArtComment, 'comments_count')
+        self.stdout.write(self.style.SUCCESS(f'Исправлено счетчиков комментариев: {updated_count}'))
+
+        tags_count = ArtTagsService().rebuild()
+        self.stdout.write(self.style.SUCCESS(f'Перестроена статистика тэгов: {tags_count}'))
+
+    def _recount(self, related_model: Type[Model], counter_field_name: str) -> int:
+        actual_count = Coalesce(
+            Subquery(
+                related_model.objects
+                .filter(art_id=OuterRef('pk'))
+                .order_by()
+                .values('art_id')
+                .annotate(count=Count('pk'))
+                .values('count'),
+            ),
+            0,
+        )
+        return (
+            Art.objects
+            .annotate(actual_count=actual_count)
+            .exclude(**{counter_field_name: F('actual_count')})
+            .update(**{counter_field_name: actual_count})
+        )
@@ -0,0 +1,56 @@
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.core.management.base import (
+    BaseCommand,
+    CommandParser,
+)
+
+from apps.arts.services.popularity import ArtPopularityService
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рейтинг популярности артов для ленты популярного. '
+        'С флагом --loop работает как фоновый процесс и пересчитывает рейтинг периодически: '
+        'рейтинг всех артов - раз в --full-interval, в остальных циклах - только свежих '
+        'и изменившихся артов.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Пересчитывать рейтинг бесконечно с интервалом --interval.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.ARTS_POPULARITY_REFRESH_INTERVAL,
+            help='Интервал между пересчетами в секундах.',
+        )
+        parser.add_argument(
+            '--full-interval',
+            type=float,
+            default=settings.ARTS_POPULARITY_FULL_REFRESH_INTERVAL,
+            help='Интервал между полными пересчетами рейтинга всех артов в секундах.',
+        )
+
+    def handle(self, *args, loop: bool, interval: float, full_interval: float, **options) -> None:
+        service = ArtPopularityService()
+        full_refreshed_at = None
+        while True:
+            close_old_connections()
+            started_at = time.monotonic()
+            full = full_refreshed_at is None or started_at - full_refreshed_at >= full_interval
+            refreshed_count = service.refresh(changed_only=not full)
+            if full:
+                full_refreshed_at = started_at
+            self.stdout.write(
+                f'Пересчитан рейтинг артов ({"полный" if full else "изменившиеся"}): {refreshed_count}'
+            )
+
+            if not loop:
+                break
+            time.sleep(interval)
@@ -0,0 +1,56 @@
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.core.management.base import (
+    BaseCommand,
+    CommandParser,
+)
+
+from apps.arts.services.related import ArtRelatedService
+
+
+class Command(BaseCommand):
+    help = (
+        'Перестраивает списки похожих артов по сходству тэгов. '
+        'Новые арты попадают в списки сразу, команда нужна для учета удалений '
+        'и изменения весов тэгов. С флагом --loop работает как фоновый процесс '
+        'и перестраивает списки периодически, начиная через --interval после запуска '
+        '(чтобы перезапуски сервера не вызывали полное перестроение).'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Перестраивать списки бесконечно с интервалом --interval.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.ARTS_RELATED_REFRESH_INTERVAL,
+            help='Интервал между перестроениями в секундах.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Количество артов, списки которых пересчитываются в одной транзакции.',
+        )
+
+    def handle(self, *args, loop: bool, interval: float, batch_size: int, **options) -> None:
+        service = ArtRelatedService()
+        while True:
+            if loop:
+                time.sleep(interval)
+
+            close_old_connections()
+            started_at = time.monotonic()
+            refreshed_count = service.refresh(batch_size=batch_size)
+            self.stdout.write(
+                f'Пересчитаны похожие арты: {refreshed_count} '
+                f'за {time.monotonic() - started_at:.1f} с'
+            )
+
+            if not loop:
+                break
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.3 on 2026-10-18 08:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arts", "0004_alter_art_tags"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="art",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="arts_art_created_9ff403_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="art",
+            index=models.Index(
+                fields=["author", "-created_at", "-id"],
+                name="arts_art_author__463d3f_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.0.3 on 2026-10-18 08:29
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_likes_count(apps, schema_editor):
+    Art = apps.get_model("arts", "Art")
+    ArtLike = apps.get_model("arts", "ArtLike")
+    Art.objects.update(
+        likes_count=Coalesce(
+            Subquery(
+                ArtLike.objects.filter(art_id=OuterRef("pk"))
+                .order_by()
+                .values("art_id")
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arts", "0005_art_keyset_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="art",
+            name="likes_count",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="Количество лайков"
+            ),
+        ),
+        migrations.RunPython(fill_likes_count, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="art",
+            index=models.Index(
+                fields=["-likes_count", "-id"], name="arts_art_likes_c_bbcec3_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.0.3 on 2026-10-18 08:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arts", "0006_art_likes_count"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArtPopularity",
+            fields=[
+                (
+                    "art",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="popularity",
+                        related_query_name="popularity",
+                        serialize=False,
+                        to="arts.art",
+                        verbose_name="Арт",
+                    ),
+                ),
+                (
+                    "score",
+                    models.FloatField(default=0, verbose_name="Рейтинг популярности"),
+                ),
+                ("refreshed_at", models.DateTimeField(verbose_name="Дата пересчета")),
+            ],
+            options={
+                "verbose_name": "Популярность арта",
+                "verbose_name_plural": "Популярность артов",
+                "indexes": [
+                    models.Index(
+                        fields=["-score", "-art"], name="arts_artpop_score_52d5f0_idx"
+                    )
+                ],
+            },
+        ),
+    ]
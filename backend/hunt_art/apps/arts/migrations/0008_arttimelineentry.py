@@ -0,0 +1,67 @@
+# Generated by Django 5.0.3 on 2026-10-18 08:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arts", "0007_artpopularity"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArtTimelineEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(verbose_name="Дата создания арта")),
+                (
+                    "art",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="timeline_entries",
+                        related_query_name="timeline_entry",
+                        to="arts.art",
+                        verbose_name="Арт",
+                    ),
+                ),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="art_timeline_entries",
+                        related_query_name="art_timeline_entry",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Владелец ленты",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Запись ленты подписок",
+                "verbose_name_plural": "Записи лент подписок",
+                "indexes": [
+                    models.Index(
+                        fields=["owner", "-created_at", "-art"],
+                        name="arts_arttim_owner_i_5e9df7_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="arttimelineentry",
+            constraint=models.UniqueConstraint(
+                fields=("owner", "art"), name="unique_timeline_owner_art"
+            ),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.0.3 on 2026-10-18 08:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arts", "0008_arttimelineentry"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArtTagStats",
+            fields=[
+                (
+                    "tag",
+                    models.CharField(
+                        max_length=100,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="Тэг",
+                    ),
+                ),
+                (
+                    "arts_count",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Количество артов"
+                    ),
+                ),
+                (
+                    "last_used_at",
+                    models.DateTimeField(verbose_name="Дата последнего использования"),
+                ),
+            ],
+            options={
+                "verbose_name": "Статистика тэга",
+                "verbose_name_plural": "Статистика тэгов",
+                "indexes": [
+                    models.Index(
+                        fields=["-arts_count", "tag"],
+                        name="arts_arttag_arts_co_3acb28_idx",
+                    ),
+                    models.Index(
+                        fields=["tag"],
+                        name="arts_tagstats_tag_prefix_idx",
+                        opclasses=("varchar_pattern_ops",),
+                    ),
+                ],
+            },
+        ),
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO arts_arttagstats (tag, arts_count, last_used_at)
+                SELECT art_tag.tag, COUNT(*), MAX(art.created_at)
+                FROM arts_art AS art
+                CROSS JOIN LATERAL (SELECT DISTINCT unnest(art.tags) AS tag) AS art_tag
+                GROUP BY art_tag.tag
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
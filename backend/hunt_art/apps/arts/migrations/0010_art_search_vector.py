@@ -0,0 +1,49 @@
+# Generated by Django 5.0.3 on 2026-10-18 08:37
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.db import migrations
+from django.db.models import F, Func, TextField, Value
+
+
+def fill_search_vector(apps, schema_editor):
+    Art = apps.get_model("arts", "Art")
+    tags = Func(
+        F("tags"), Value(" "), function="array_to_string", output_field=TextField()
+    )
+    Art.objects.update(
+        search_vector=(
+            django.contrib.postgres.search.SearchVector(
+                tags, config="simple", weight="A"
+            )
+            + django.contrib.postgres.search.SearchVector(
+                "description", config=settings.ARTS_SEARCH_CONFIG, weight="B"
+            )
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arts", "0009_arttagstats"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="art",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True, verbose_name="Поисковый вектор"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="art",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="arts_art_search__ecd330_gin"
+            ),
+        ),
+        migrations.RunPython(fill_search_vector, migrations.RunPython.noop),
+    ]
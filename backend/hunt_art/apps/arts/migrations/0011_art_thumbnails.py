@@ -0,0 +1,23 @@
+# Generated by Django 5.0.3 on 2026-10-18 08:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arts", "0010_art_search_vector"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="art",
+            name="thumbnails",
+            field=models.JSONField(
+                blank=True,
+                default=list,
+                editable=False,
+                verbose_name="Уменьшенные копии изображения",
+            ),
+        ),
+    ]
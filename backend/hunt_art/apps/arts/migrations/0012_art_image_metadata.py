@@ -0,0 +1,46 @@
+# Generated by Django 5.0.3 on 2026-10-18 08:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arts", "0011_art_thumbnails"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="art",
+            name="dominant_color",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=7,
+                verbose_name="Преобладающий цвет изображения",
+            ),
+        ),
+        migrations.AddField(
+            model_name="art",
+            name="image_height",
+            field=models.PositiveIntegerField(
+                editable=False, null=True, verbose_name="Высота изображения"
+            ),
+        ),
+        migrations.AddField(
+            model_name="art",
+            name="image_width",
+            field=models.PositiveIntegerField(
+                editable=False, null=True, verbose_name="Ширина изображения"
+            ),
+        ),
+        migrations.AddField(
+            model_name="art",
+            name="placeholder",
+            field=models.TextField(
+                blank=True,
+                editable=False,
+                verbose_name="Превью изображения для загрузки",
+            ),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.0.3 on 2026-10-18 08:43
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arts", "0012_art_image_metadata"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArtUploadSession",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "filename",
+                    models.CharField(max_length=255, verbose_name="Имя файла"),
+                ),
+                ("size", models.PositiveBigIntegerField(verbose_name="Размер файла")),
+                (
+                    "offset",
+                    models.PositiveBigIntegerField(
+                        default=0, verbose_name="Количество загруженных байт"
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True, verbose_name="Дата создания"
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="art_upload_sessions",
+                        related_query_name="art_upload_session",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Пользователь",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Сессия загрузки арта",
+                "verbose_name_plural": "Сессии загрузки артов",
+            },
+        ),
+    ]
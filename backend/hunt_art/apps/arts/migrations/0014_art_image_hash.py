@@ -0,0 +1,42 @@
+# Generated by Django 5.0.3 on 2026-10-18 08:45
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arts", "0013_artuploadsession"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="art",
+            name="image_hash",
+            field=models.BigIntegerField(
+                editable=False, null=True, verbose_name="Перцептивный хэш изображения"
+            ),
+        ),
+        migrations.AddField(
+            model_name="art",
+            name="image_hash_chunks",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.IntegerField(),
+                blank=True,
+                default=list,
+                editable=False,
+                size=None,
+                verbose_name="Части перцептивного хэша изображения",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="art",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["image_hash_chunks"], name="arts_art_image_h_0f67dc_gin"
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.3 on 2026-10-18 08:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arts", "0014_art_image_hash"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="artcomment",
+            index=models.Index(
+                fields=["art", "-created_at", "-id"],
+                name="arts_artcom_art_id_9f4290_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.3 on 2026-10-18 08:51
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_comments_count(apps, schema_editor):
+    Art = apps.get_model("arts", "Art")
+    ArtComment = apps.get_model("arts", "ArtComment")
+    Art.objects.update(
+        comments_count=Coalesce(
+            Subquery(
+                ArtComment.objects.filter(art_id=OuterRef("pk"))
+                .order_by()
+                .values("art_id")
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arts", "0015_artcomment_art_created_at_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="art",
+            name="comments_count",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="Количество комментариев"
+            ),
+        ),
+        migrations.RunPython(fill_comments_count, migrations.RunPython.noop),
+    ]
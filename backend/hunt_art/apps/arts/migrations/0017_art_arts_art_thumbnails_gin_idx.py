@@ -0,0 +1,24 @@
+# Generated by Django 5.0.3 on 2026-10-18 08:54
+
+import django.contrib.postgres.indexes
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arts", "0016_art_comments_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="art",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["thumbnails"],
+                name="arts_art_thumbnails_gin_idx",
+                opclasses=("jsonb_path_ops",),
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.0.3 on 2026-10-18 09:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arts", "0017_art_arts_art_thumbnails_gin_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArtRelation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField(verbose_name="Сходство")),
+                (
+                    "art",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="relations",
+                        related_query_name="relation",
+                        to="arts.art",
+                        verbose_name="Арт",
+                    ),
+                ),
+                (
+                    "related_art",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="reverse_relations",
+                        related_query_name="reverse_relation",
+                        to="arts.art",
+                        verbose_name="Похожий арт",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Похожий арт",
+                "verbose_name_plural": "Похожие арты",
+                "indexes": [
+                    models.Index(
+                        fields=["art", "-score", "-related_art"],
+                        name="arts_artrel_art_id_4c5178_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="artrelation",
+            constraint=models.UniqueConstraint(
+                fields=("art", "related_art"), name="unique_art_related_art"
+            ),
+        ),
+    ]
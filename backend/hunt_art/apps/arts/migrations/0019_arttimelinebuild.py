@@ -0,0 +1,49 @@
+# Generated by Django 5.0.3 on 2026-10-18 09:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arts", "0018_artrelation"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArtTimelineBuild",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "celebrity_followers_count",
+                    models.PositiveIntegerField(
+                        verbose_name='Порог подписчиков "знаменитости"'
+                    ),
+                ),
+                (
+                    "backfill_arts_count",
+                    models.PositiveIntegerField(
+                        verbose_name="Количество артов автора в ленте"
+                    ),
+                ),
+                (
+                    "built_at",
+                    models.DateTimeField(
+                        auto_now=True, verbose_name="Дата перестроения"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Перестроение лент подписок",
+                "verbose_name_plural": "Перестроения лент подписок",
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.3 on 2026-10-18 09:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("arts", "0019_arttimelinebuild"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="artpopularity",
+            name="likes_count",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="Количество лайков при пересчете"
+            ),
+        ),
+        migrations.AddField(
+            model_name="artpopularity",
+            name="views",
+            field=models.PositiveBigIntegerField(
+                default=0, verbose_name="Количество просмотров при пересчете"
+            ),
+        ),
+    ]
@@ -1,12 +1,10 @@
-from enum import (
-    auto,
-    StrEnum,
-)
+import uuid
 
 from django.db import models
 from django.contrib.postgres import (
     fields as pg_fields,
     indexes as pg_indexes,
+    search as pg_search,
 )
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
@@ -18,17 +16,6 @@ UserModel = get_user_model()
 class Art(models.Model):
     """Модель арта"""
 
-    class AnnotatedFieldName(StrEnum):
-        """Перечисление имен аннотируемых полей"""
-
-        def _generate_next_value_(
-            name: str, start: int,
-            count: int, last_values: list[str],
-        ) -> str:
-            return name.lower()
-        
-        COUNT_LIKES = auto()
-
     author = models.ForeignKey(
         to=UserModel,
         on_delete=models.CASCADE,
@@ -40,6 +27,48 @@ class Art(models.Model):
         upload_to='arts/images',
         verbose_name=_('Изображение'),
     )
+    # Метаданные изображения (см. ArtImageMetadataService).
+    image_width = models.PositiveIntegerField(
+        null=True,
+        editable=False,
+        verbose_name=_('Ширина изображения'),
+    )
+    image_height = models.PositiveIntegerField(
+        null=True,
+        editable=False,
+        verbose_name=_('Высота изображения'),
+    )
+    dominant_color = models.CharField(
+        max_length=7,
+        blank=True,
+        editable=False,
+        verbose_name=_('Преобладающий цвет изображения'),
+    )
+    placeholder = models.TextField(
+        blank=True,
+        editable=False,
+        verbose_name=_('Превью изображения для загрузки'),
+    )
+    # Перцептивный хэш изображения и его части для поиска дубликатов (см. ArtDuplicatesService).
+    image_hash = models.BigIntegerField(
+        null=True,
+        editable=False,
+        verbose_name=_('Перцептивный хэш изображения'),
+    )
+    image_hash_chunks = pg_fields.ArrayField(
+        base_field=models.IntegerField(),
+        blank=True,
+        default=list,
+        editable=False,
+        verbose_name=_('Части перцептивного хэша изображения'),
+    )
+    # Уменьшенные копии изображения (см. ArtThumbnailsGenerator).
+    thumbnails = models.JSONField(
+        default=list,
+        blank=True,
+        editable=False,
+        verbose_name=_('Уменьшенные копии изображения'),
+    )
     description = models.TextField(
         max_length=10_000,
         blank=True,
@@ -54,6 +83,14 @@ class Art(models.Model):
         default=0,
         verbose_name=_('Количество просмотров'),
     )
+    likes_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Количество лайков'),
+    )
+    comments_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Количество комментариев'),
+    )
     tags = pg_fields.ArrayField(
         base_field=models.CharField(max_length=100),
         blank=True,
@@ -68,6 +105,12 @@ class Art(models.Model):
         auto_now=True,
         verbose_name=_('Дата обновления'),
     )
+    # Заполняется сервисом поиска при записи арта (см. ArtSearchService).
+    search_vector = pg_search.SearchVectorField(
+        null=True,
+        editable=False,
+        verbose_name=_('Поисковый вектор'),
+    )
     likes = models.ManyToManyField(
         to=UserModel,
         through='ArtLike',
@@ -88,12 +131,269 @@ class Art(models.Model):
         verbose_name_plural = _('Арты')
         indexes = (
             pg_indexes.GinIndex(fields=('tags', )),
+            pg_indexes.GinIndex(fields=('search_vector', )),
+            pg_indexes.GinIndex(fields=('image_hash_chunks', )),
+            # Индекс для поиска артов по имени уменьшенной копии (см. MediaDeletionQueue).
+            pg_indexes.GinIndex(
+                fields=('thumbnails', ),
+                name='arts_art_thumbnails_gin_idx',
+                opclasses=('jsonb_path_ops', ),
+            ),
+            # Индексы для пагинации лент по ключу (created_at, id).
+            models.Index(fields=('-created_at', '-id')),
+            models.Index(fields=('author', '-created_at', '-id')),
+            models.Index(fields=('-likes_count', '-id')),
         )
 
     def __str__(self) -> str:
         return f'Art#{self.pk} User#{self.author_id}'
 
 
+class ArtPopularity(models.Model):
+    """
+    Предрассчитанный рейтинг популярности арта.
+
+    Пересчитывается периодически (см. команду `refresh_art_popularity`),
+    чтобы лента популярных артов читалась по индексу, а не агрегировалась
+    по всем лайкам на каждый запрос. Счетчики, по которым считался рейтинг,
+    сохраняются, чтобы частые пересчеты трогали только изменившиеся арты.
+    """
+
+    art = models.OneToOneField(
+        to=Art,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='popularity',
+        related_query_name='popularity',
+        verbose_name=_('Арт'),
+    )
+    score = models.FloatField(
+        default=0,
+        verbose_name=_('Рейтинг популярности'),
+    )
+    likes_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Количество лайков при пересчете'),
+    )
+    views = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name=_('Количество просмотров при пересчете'),
+    )
+    refreshed_at = models.DateTimeField(
+        verbose_name=_('Дата пересчета'),
+    )
+
+    class Meta:
+        verbose_name = _('Популярность арта')
+        verbose_name_plural = _('Популярность артов')
+        indexes = (
+            models.Index(fields=('-score', '-art')),
+        )
+
+    def __str__(self) -> str:
+        return f'Popularity Art#{self.art_id}'
+
+
+class ArtTimelineEntry(models.Model):
+    """
+    Запись ленты подписок пользователя.
+
+    Лента заполняется при публикации арта (fan-out on write), поэтому чтение
+    ленты подписок - это чтение по индексу, а не слияние артов всех подписок.
+    Арты авторов с большим числом подписчиков в ленту не раскладываются
+    и читаются напрямую (см. ArtTimelineService).
+    """
+
+    owner = models.ForeignKey(
+        to=UserModel,
+        on_delete=models.CASCADE,
+        related_name='art_timeline_entries',
+        related_query_name='art_timeline_entry',
+        verbose_name=_('Владелец ленты'),
+    )
+    art = models.ForeignKey(
+        to=Art,
+        on_delete=models.CASCADE,
+        related_name='timeline_entries',
+        related_query_name='timeline_entry',
+        verbose_name=_('Арт'),
+    )
+    created_at = models.DateTimeField(
+        verbose_name=_('Дата создания арта'),
+    )
+
+    class Meta:
+        verbose_name = _('Запись ленты подписок')
+        verbose_name_plural = _('Записи лент подписок')
+        constraints = (
+            models.UniqueConstraint(
+                fields=('owner', 'art'),
+                name='unique_timeline_owner_art',
+            ),
+        )
+        indexes = (
+            models.Index(fields=('owner', '-created_at', '-art')),
+        )
+
+    def __str__(self) -> str:
+        return f'Timeline User#{self.owner_id} Art#{self.art_id}'
+
+
+class ArtTimelineBuild(models.Model):
+    """
+    Параметры, с которыми последний раз перестраивались ленты подписок.
+
+    Единственная запись. По ней `rebuild_art_timelines --if-changed` понимает,
+    изменился ли порог "знаменитости" с прошлого перестроения.
+    """
+
+    celebrity_followers_count = models.PositiveIntegerField(
+        verbose_name=_('Порог подписчиков "знаменитости"'),
+    )
+    backfill_arts_count = models.PositiveIntegerField(
+        verbose_name=_('Количество артов автора в ленте'),
+    )
+    built_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('Дата перестроения'),
+    )
+
+    class Meta:
+        verbose_name = _('Перестроение лент подписок')
+        verbose_name_plural = _('Перестроения лент подписок')
+
+    def __str__(self) -> str:
+        return f'Timeline build {self.celebrity_followers_count}/{self.backfill_arts_count}'
+
+
+class ArtTagStats(models.Model):
+    """
+    Статистика тэга артов.
+
+    Поддерживается при создании и удалении артов (см. ArtTagsService),
+    чтобы популярные тэги и автодополнение читались по индексу,
+    а не через `unnest` по всей таблице артов.
+    """
+
+    tag = models.CharField(
+        max_length=100,
+        primary_key=True,
+        verbose_name=_('Тэг'),
+    )
+    arts_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Количество артов'),
+    )
+    last_used_at = models.DateTimeField(
+        verbose_name=_('Дата последнего использования'),
+    )
+
+    class Meta:
+        verbose_name = _('Статистика тэга')
+        verbose_name_plural = _('Статистика тэгов')
+        indexes = (
+            models.Index(fields=('-arts_count', 'tag')),
+            # Индекс для поиска по префиксу (LIKE 'prefix%') независимо от локали БД.
+            models.Index(
+                fields=('tag', ),
+                name='arts_tagstats_tag_prefix_idx',
+                opclasses=('varchar_pattern_ops', ),
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f'Tag {self.tag}: {self.arts_count}'
+
+
+class ArtRelation(models.Model):
+    """
+    Похожий арт из предрассчитанного списка соседей арта.
+
+    Для каждого арта хранятся не больше `ARTS_RELATED_COUNT` самых похожих
+    по тэгам артов (см. ArtRelatedService), поэтому "похожие" читаются
+    по индексу, а не пересечением тэгов на каждый запрос.
+    """
+
+    art = models.ForeignKey(
+        to=Art,
+        on_delete=models.CASCADE,
+        related_name='relations',
+        related_query_name='relation',
+        verbose_name=_('Арт'),
+    )
+    related_art = models.ForeignKey(
+        to=Art,
+        on_delete=models.CASCADE,
+        related_name='reverse_relations',
+        related_query_name='reverse_relation',
+        verbose_name=_('Похожий арт'),
+    )
+    score = models.FloatField(
+        verbose_name=_('Сходство'),
+    )
+
+    class Meta:
+        verbose_name = _('Похожий арт')
+        verbose_name_plural = _('Похожие арты')
+        constraints = (
+            models.UniqueConstraint(
+                fields=('art', 'related_art'),
+                name='unique_art_related_art',
+            ),
+        )
+        indexes = (
+            models.Index(fields=('art', '-score', '-related_art')),
+        )
+
+    def __str__(self) -> str:
+        return f'Art#{self.art_id} ~ Art#{self.related_art_id}'
+
+
+class ArtUploadSession(models.Model):
+    """
+    Сессия возобновляемой загрузки изображения арта по частям.
+
+    Части пишутся на диск последовательно, `offset` - количество уже
+    принятых байт. После обрыва связи клиент узнает `offset` и продолжает
+    загрузку с него (см. ArtUploadsService).
+    """
+
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False,
+    )
+    user = models.ForeignKey(
+        to=UserModel,
+        on_delete=models.CASCADE,
+        related_name='art_upload_sessions',
+        related_query_name='art_upload_session',
+        verbose_name=_('Пользователь'),
+    )
+    filename = models.CharField(
+        max_length=255,
+        verbose_name=_('Имя файла'),
+    )
+    size = models.PositiveBigIntegerField(
+        verbose_name=_('Размер файла'),
+    )
+    offset = models.PositiveBigIntegerField(
+        default=0,
+        verbose_name=_('Количество загруженных байт'),
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name=_('Дата создания'),
+    )
+
+    class Meta:
+        verbose_name = _('Сессия загрузки арта')
+        verbose_name_plural = _('Сессии загрузки артов')
+
+    def __str__(self) -> str:
+        return f'Upload {self.pk} User#{self.user_id}'
+
+
 class ArtLike(models.Model):
     """m2m модель лайков артов от пользователей"""
 
@@ -147,6 +447,10 @@ class ArtComment(models.Model):
     class Meta:
         verbose_name = _('Коментарий')
         verbose_name_plural = _('Коментарии')
+        indexes = (
+            # Индекс для пагинации комментариев арта по ключу (created_at, id).
+            models.Index(fields=('art', '-created_at', '-id')),
+        )
 
     def __str__(self) -> str:
         return f'Comment User#{self.user_id} Art#{self.art_id}'
@@ -0,0 +1,46 @@
+from typing import Any
+
+from django.db import transaction
+from django.db.models import F
+
+from apps.users.models import User
+from apps.arts.services.feed_cache import art_feed_cache
+from apps.arts.models import (
+    Art,
+    ArtComment,
+)
+
+
+class ArtCommentsService:
+    """
+    Сервис комментариев артов.
+
+    Вместе с комментарием в одной транзакции обновляет денормализованный
+    счетчик `Art.comments_count`, чтобы ленты не считали комментарии через JOIN.
+    `Art.updated_at` комментарии не меняют (версия арта для условных запросов учитывает счетчик).
+    """
+
+    def __init__(self, current_user: User) -> None:
+        self.__current_user = current_user
+
+    def create_comment(self, art_pk: Any, text: str) -> ArtComment:
+        with transaction.atomic():
+            comment = ArtComment.objects.create(
+                user_id=self.__current_user.pk,
+                art_id=art_pk,
+                text=text,
+            )
+            self._change_comments_count(art_pk, 1)
+
+        return comment
+
+    def delete_comment(self, comment: ArtComment) -> None:
+        with transaction.atomic():
+            deleted_count, _ = ArtComment.objects.filter(pk=comment.pk).delete()
+            # Комментарий мог быть удален параллельным запросом.
+            if deleted_count > 0:
+                self._change_comments_count(comment.art_id, -deleted_count)
+
+    def _change_comments_count(self, art_pk: Any, delta: int) -> None:
+        Art.objects.filter(pk=art_pk).update(comments_count=F('comments_count') + delta)
+        art_feed_cache.invalidate_art_changed(art_pk)
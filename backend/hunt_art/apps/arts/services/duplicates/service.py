@@ -0,0 +1,124 @@
+from typing import Any
+
+from PIL import Image
+
+from django.conf import settings
+from django.db.models import (
+    F,
+    Func,
+    Value,
+    QuerySet,
+    IntegerField,
+)
+
+from apps.arts.models import Art
+
+
+class ArtDuplicatesService:
+    """
+    Сервис поиска почти одинаковых артов по перцептивному хэшу изображения.
+
+    Хэш - 64-битный dHash: изображение сжимается до 9x8 в оттенках серого,
+    и каждый бит показывает, ярче ли пиксель соседа справа. Похожие изображения
+    (пересжатые, уменьшенные, слегка измененные) отличаются в нескольких битах.
+
+    Поиск по расстоянию Хэмминга сделан через multi-index hashing: хэш делится
+    на `CHUNKS_COUNT` частей по 16 бит. Если расстояние меньше количества частей,
+    то хотя бы одна часть совпадает точно (принцип Дирихле). Поэтому кандидаты
+    выбираются по GIN-индексу на пересечение частей, а точное расстояние
+    проверяется только для них.
+    """
+
+    HASH_SIZE = 8
+    CHUNKS_COUNT = 4
+    CHUNK_BITS = 64 // CHUNKS_COUNT
+    MAX_DISTANCE: int = settings.ARTS_DUPLICATES_MAX_DISTANCE
+
+    def __init__(self) -> None:
+        if not 0 <= self.MAX_DISTANCE < self.CHUNKS_COUNT:
+            raise ValueError(
+                f'Расстояние поиска дубликатов должно быть от 0 до {self.CHUNKS_COUNT - 1}, '
+                'иначе часть дубликатов не будет найдена'
+            )
+
+    def get_hash_fields(self, image: Image.Image) -> dict[str, Any]:
+        """Значения полей арта `image_hash` и `image_hash_chunks` для изображения"""
+
+        image_hash = self.compute_hash(image)
+        return {
+            'image_hash': self._to_signed(image_hash),
+            'image_hash_chunks': self.get_hash_chunks(image_hash),
+        }
+
+    def compute_hash(self, image: Image.Image) -> int:
+        pixels = list(
+            image
+            .convert('L')
+            .resize((self.HASH_SIZE + 1, self.HASH_SIZE), Image.Resampling.LANCZOS)
+            .getdata()
+        )
+
+        image_hash = 0
+        for row in range(self.HASH_SIZE):
+            row_pixels = pixels[row * (self.HASH_SIZE + 1):(row + 1) * (self.HASH_SIZE + 1)]
+            for left, right in zip(row_pixels, row_pixels[1:]):
+                image_hash = (image_hash << 1) | (left > right)
+
+        return image_hash
+
+    def get_hash_chunks(self, image_hash: int) -> list[int]:
+        # Номер части входит в значение, чтобы совпадали только части на одной позиции.
+        chunk_mask = (1 << self.CHUNK_BITS) - 1
+        return [
+            (index << self.CHUNK_BITS) | ((image_hash >> (index * self.CHUNK_BITS)) & chunk_mask)
+            for index in range(self.CHUNKS_COUNT)
+        ]
+
+    def find_duplicates(
+        self,
+        image_hash: int,
+        queryset: QuerySet[Art] | None = None,
+        exclude_pk: Any = None,
+        limit: int = 20,
+    ) -> list[Art]:
+        """
+        Поиск артов с расстоянием до `image_hash` не больше `MAX_DISTANCE`.
+
+        Арты отсортированы от самых похожих и имеют атрибут `hamming_distance`.
+        """
+
+        if queryset is None:
+            queryset = Art.objects.all()
+
+        image_hash = self._to_unsigned(image_hash)
+        # Расстояние считается и фильтруется в БД, чтобы из кандидатов по индексу
+        # (у однотонных изображений их тысячи) выбирались только `limit` ближайших.
+        candidates = (
+            queryset
+            .filter(image_hash_chunks__overlap=self.get_hash_chunks(image_hash))
+            .alias(hamming_distance=Func(
+                F('image_hash'),
+                Value(self._to_signed(image_hash)),
+                template='bit_count((%(expressions)s)::bit(64))',
+                arg_joiner=' # ',
+                output_field=IntegerField(),
+            ))
+            .filter(hamming_distance__lte=self.MAX_DISTANCE)
+        )
+        if exclude_pk is not None:
+            candidates = candidates.exclude(pk=exclude_pk)
+
+        return list(
+            candidates
+            .annotate(hamming_distance=F('hamming_distance'))
+            .order_by('hamming_distance', '-pk')[:limit]
+        )
+
+    @staticmethod
+    def _to_signed(image_hash: int) -> int:
+        # В БД хэш хранится в знаковом bigint.
+        return image_hash - (1 << 64) if image_hash >= 1 << 63 else image_hash
+
+    @staticmethod
+    def _to_unsigned(image_hash: int) -> int:
+        return image_hash & ((1 << 64) - 1)
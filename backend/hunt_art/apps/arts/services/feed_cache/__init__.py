@@ -0,0 +1,6 @@
+from django.conf import settings
+
+from .service import ArtFeedCache
+
+
+art_feed_cache = ArtFeedCache(timeout=settings.ARTS_FEED_CACHE_TIMEOUT)
@@ -0,0 +1,80 @@
+from typing import (
+    Any,
+    Iterable,
+)
+
+from django.db import transaction
+
+from rest_framework.request import Request
+
+from utils.cache import TaggedCache
+from apps.arts.models import Art
+
+
+class ArtFeedCache:
+    """
+    Кэш сериализованных страниц лент артов для анонимных пользователей.
+
+    Анонимный ответ одинаков для всех посетителей, поэтому страница кэшируется
+    по полному URL запроса (действие, фильтры, страница или курсор).
+    Страница помечается тэгом своей ленты и тэгами артов на ней:
+    - создание и удаление арта инвалидируют тэги лент, в которые он попадает;
+    - лайк инвалидирует только тэг арта, т.е. только страницы с этим артом;
+    - пересчет рейтинга инвалидирует ленту популярного.
+    """
+
+    NEW_ARTS_TAG = 'arts:new'
+    POPULAR_ARTS_TAG = 'arts:popular'
+
+    def __init__(self, timeout: float | None) -> None:
+        self._cache = TaggedCache(prefix='arts-feed', timeout=timeout)
+
+    def get_page(self, request: Request) -> Any | None:
+        return self._cache.get(self._make_key(request))
+
+    def set_page(self, request: Request, data: Any, list_tag: str, art_pks: Iterable[Any]) -> None:
+        tags = [list_tag, *(self.get_art_tag(art_pk) for art_pk in art_pks)]
+        self._cache.set(self._make_key(request), data, tags=tags)
+
+    def invalidate_art_created(self, art: Art) -> None:
+        self._invalidate(
+            self.NEW_ARTS_TAG,
+            self.POPULAR_ARTS_TAG,
+            self.get_user_arts_tag(art.author_id),
+        )
+
+    def invalidate_art_deleted(self, art: Art) -> None:
+        self._invalidate(
+            self.NEW_ARTS_TAG,
+            self.POPULAR_ARTS_TAG,
+            self.get_user_arts_tag(art.author_id),
+            self.get_art_tag(art.pk),
+        )
+
+    def invalidate_art_changed(self, art_pk: Any) -> None:
+        self._invalidate(self.get_art_tag(art_pk))
+
+    def invalidate_popular_arts(self) -> None:
+        self._invalidate(self.POPULAR_ARTS_TAG)
+
+    @staticmethod
+    def get_art_tag(art_pk: Any) -> str:
+        return f'art:{art_pk}'
+
+    @staticmethod
+    def get_user_arts_tag(user_pk: Any) -> str:
+        return f'arts:user:{user_pk}'
+
+    def _invalidate(self, *tags: str) -> None:
+        # Инвалидируем после коммита, иначе до коммита страницу успеют
+        # закэшировать со старыми данными уже с новой версией тэга.
+        transaction.on_commit(lambda: self._cache.invalidate(*tags))
+
+    def _make_key(self, request: Request) -> str:
+        query = sorted(
+            (name, value)
+            for name, values in request.query_params.lists()
+            for value in values
+        )
+        # Хост входит в ключ, т.к. ссылки пагинации в ответе абсолютные.
+        return self._cache.make_key(request.scheme, request.get_host(), request.path, query)
@@ -0,0 +1,77 @@
+import io
+import base64
+from typing import (
+    IO,
+    Any,
+)
+
+from PIL import (
+    Image,
+    ImageOps,
+)
+
+from apps.arts.services.duplicates import ArtDuplicatesService
+
+
+class ArtImageMetadataService:
+    """
+    Сервис извлечения метаданных изображения арта.
+
+    Возвращает значения полей арта:
+    - `image_width`, `image_height` - размеры с учетом поворота из EXIF,
+      чтобы клиент мог зарезервировать место под изображение до его загрузки;
+    - `dominant_color` - преобладающий цвет в виде `#rrggbb`;
+    - `placeholder` - крошечное размытое превью (LQIP) в виде data URI;
+    - `image_hash`, `image_hash_chunks` - перцептивный хэш для поиска дубликатов.
+    """
+
+    PLACEHOLDER_SIZE = 16
+    PLACEHOLDER_QUALITY = 40
+    DOMINANT_COLOR_SAMPLE_SIZE = 64
+    DOMINANT_COLOR_PALETTE_SIZE = 5
+    EXIF_ORIENTATION_TAG = 0x0112
+    # Ориентации, при которых изображение повернуто на 90 градусов.
+    EXIF_TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+
+    def extract(self, image_file: IO[bytes]) -> dict[str, Any]:
+        image_file.seek(0)
+        try:
+            with Image.open(image_file) as image:
+                # JPEG декодируем сразу в уменьшенном масштабе: для превью и цвета
+                # полное разрешение не нужно.
+                width, height = image.size
+                if image.getexif().get(self.EXIF_ORIENTATION_TAG, 1) in self.EXIF_TRANSPOSED_ORIENTATIONS:
+                    width, height = height, width
+
+                image.draft('RGB', (self.DOMINANT_COLOR_SAMPLE_SIZE, self.DOMINANT_COLOR_SAMPLE_SIZE))
+                image = ImageOps.exif_transpose(image)
+
+                sample = image.convert('RGB')
+                sample.thumbnail(
+                    (self.DOMINANT_COLOR_SAMPLE_SIZE, self.DOMINANT_COLOR_SAMPLE_SIZE),
+                    Image.Resampling.BILINEAR,
+                )
+                return {
+                    'image_width': width,
+                    'image_height': height,
+                    'dominant_color': self._get_dominant_color(sample),
+                    'placeholder': self._get_placeholder(sample),
+                    **ArtDuplicatesService().get_hash_fields(sample),
+                }
+        finally:
+            image_file.seek(0)
+
+    def _get_dominant_color(self, image: Image.Image) -> str:
+        palette_image = image.quantize(colors=self.DOMINANT_COLOR_PALETTE_SIZE)
+        _, color_index = max(palette_image.getcolors())
+        palette = palette_image.getpalette()
+        red, green, blue = palette[color_index * 3:color_index * 3 + 3]
+        return f'#{red:02x}{green:02x}{blue:02x}'
+
+    def _get_placeholder(self, image: Image.Image) -> str:
+        placeholder = image.copy()
+        placeholder.thumbnail((self.PLACEHOLDER_SIZE, self.PLACEHOLDER_SIZE), Image.Resampling.LANCZOS)
+
+        buffer = io.BytesIO()
+        placeholder.save(buffer, format='WEBP', quality=self.PLACEHOLDER_QUALITY)
+        return f'data:image/webp;base64,{base64.b64encode(buffer.getvalue()).decode("ascii")}'
@@ -0,0 +1,161 @@
+from typing import (
+    Any,
+    Iterable,
+)
+
+from django.db import (
+    connection,
+    transaction,
+)
+
+from apps.users.models import User
+from apps.arts.services.feed_cache import art_feed_cache
+from apps.arts.models import (
+    Art,
+    ArtLike,
+)
+
+
+class ArtLikesService:
+    """
+    Сервис лайков артов.
+
+    Лайки ставятся и снимаются идемпотентно одним запросом к БД:
+    `INSERT ... ON CONFLICT DO NOTHING` и `DELETE ... RETURNING` вместе
+    с обновлением денормализованного счетчика `Art.likes_count` (чтобы ленты
+    не считали лайки через JOIN). `Art.updated_at` - дата изменения арта автором,
+    поэтому лайки ее не меняют (версия арта для условных запросов учитывает счетчик).
+    Счетчик меняется только для реально вставленных или удаленных лайков,
+    поэтому параллельные одинаковые запросы его не портят.
+    """
+
+    def __init__(self, current_user: User) -> None:
+        self.__current_user = current_user
+
+    def like_art(self, art_pk: Any) -> dict[str, Any] | None:
+        """
+        Лайк арта.
+
+        :return: Состояние лайка арта или `None`, если арта нет.
+        """
+
+        return self._get_single_state(self.apply(((art_pk, True), )))
+
+    def dislike_art(self, art_pk: Any) -> dict[str, Any] | None:
+        """
+        Снятие лайка с арта.
+
+        :return: Состояние лайка арта или `None`, если арта нет.
+        """
+
+        return self._get_single_state(self.apply(((art_pk, False), )))
+
+    def apply(self, operations: Iterable[tuple[Any, bool]]) -> list[dict[str, Any]]:
+        """
+        Применение набора операций лайков одним запросом.
+
+        Операции - пары (id арта, лайкнут ли арт) в порядке их совершения клиентом.
+        Для каждого арта применяется последняя операция.
+
+        :return: Итоговые состояния существующих артов из операций:
+            id арта, лайкнут ли он, количество лайков и изменилось ли что-то.
+        """
+
+        final_states: dict[int, bool] = {}
+        for art_pk, liked in operations:
+            final_states[int(art_pk)] = liked
+        if not final_states:
+            return []
+
+        liked_art_pks = [art_pk for art_pk, liked in final_states.items() if liked]
+        disliked_art_pks = [art_pk for art_pk, liked in final_states.items() if not liked]
+        art_table = Art._meta.db_table
+        like_table = ArtLike._meta.db_table
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Все подзапросы WITH видят данные на момент начала запроса,
+            # поэтому итоговое количество лайков берется из RETURNING.
+            cursor.execute(
+                f'''
+                    WITH inserted AS (
+                        INSERT INTO {like_table} (user_id, art_id)
+                        SELECT %(user_pk)s, art.id
+                        FROM {art_table} AS art
+                        WHERE art.id = ANY(%(liked_art_pks)s)
+                        ON CONFLICT DO NOTHING
+                        RETURNING art_id
+                    ), deleted AS (
+                        DELETE FROM {like_table}
+                        WHERE user_id = %(user_pk)s AND art_id = ANY(%(disliked_art_pks)s)
+                        RETURNING art_id
+                    ), changes AS (
+                        SELECT art_id, 1 AS delta FROM inserted
+                        UNION ALL
+                        SELECT art_id, -1 AS delta FROM deleted
+                    ), updated AS (
+                        UPDATE {art_table} AS art
+                        SET likes_count = art.likes_count + changes.delta
+                        FROM changes
+                        WHERE art.id = changes.art_id
+                        RETURNING art.id, art.likes_count
+                    )
+                    SELECT art.id, COALESCE(updated.likes_count, art.likes_count), updated.id IS NOT NULL
+                    FROM {art_table} AS art
+                    LEFT JOIN updated ON updated.id = art.id
+                    WHERE art.id = ANY(%(art_pks)s)
+                    ORDER BY art.id
+                ''',
+                {
+                    'user_pk': self.__current_user.pk,
+                    'liked_art_pks': liked_art_pks,
+                    'disliked_art_pks': disliked_art_pks,
+                    'art_pks': list(final_states),
+                },
+            )
+            states = [
+                {
+                    'art_id': art_pk,
+                    'liked': final_states[art_pk],
+                    'likes_count': likes_count,
+                    'changed': changed,
+                }
+                for art_pk, likes_count, changed in cursor.fetchall()
+            ]
+
+            for state in states:
+                if state['changed']:
+                    art_feed_cache.invalidate_art_changed(state['art_id'])
+
+        return states
+
+    def mark_liked_arts(self, arts: Iterable[Art]) -> None:
+        """
+        Проставление артам флага `liked_authorized_user`.
+
+        Лайки текущего пользователя выбираются одним запросом `art_id IN (...)`
+        на всю страницу, а не отдельным запросом на каждый арт.
+        """
+
+        arts = list(arts)
+        liked_art_pks = self.get_liked_art_pks([art.pk for art in arts])
+        for art in arts:
+            art.liked_authorized_user = art.pk in liked_art_pks
+
+    def mark_liked_art_rows(self, rows: Iterable[dict[str, Any]]) -> None:
+        """То же, что `mark_liked_arts`, для строк из `values()` с ключом `id`"""
+
+        rows = list(rows)
+        liked_art_pks = self.get_liked_art_pks([row['id'] for row in rows])
+        for row in rows:
+            row['liked_authorized_user'] = row['id'] in liked_art_pks
+
+    def get_liked_art_pks(self, art_pks: Iterable[Any]) -> set[Any]:
+        return set(
+            ArtLike.objects
+            .filter(user_id=self.__current_user.pk, art_id__in=art_pks)
+            .values_list('art_id', flat=True)
+        )
+
+    @staticmethod
+    def _get_single_state(states: list[dict[str, Any]]) -> dict[str, Any] | None:
+        return states[0] if states else None
@@ -0,0 +1,84 @@
+from typing import Any, Collection
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from apps.arts.models import (
+    Art,
+    ArtPopularity,
+)
+from apps.arts.services.feed_cache import art_feed_cache
+
+
+class ArtPopularityService:
+    """
+    Сервис рейтинга популярности артов.
+
+    Рейтинг затухает со временем, чтобы в популярном оказывались свежие работы,
+    а не только давно набравшие лайки:
+
+        score = (likes * LIKE_WEIGHT + views * VIEW_WEIGHT + 1) / (age_hours + 2) ^ GRAVITY
+    """
+
+    LIKE_WEIGHT = 1.0
+    VIEW_WEIGHT = 0.05
+    GRAVITY = 1.5
+    RECENT_AGE: float = settings.ARTS_POPULARITY_RECENT_AGE
+
+    def refresh(self, art_pks: Collection[Any] | None = None, changed_only: bool = False) -> int:
+        """
+        Пересчет рейтинга одним запросом `INSERT ... ON CONFLICT DO UPDATE`.
+
+        :param art_pks: Арты, рейтинг которых нужно пересчитать. По умолчанию - все.
+        :param changed_only: Пересчитать только арты без рейтинга, свежие арты
+            (моложе `RECENT_AGE`) и арты, у которых изменились лайки или просмотры.
+            Рейтинг остальных затухает медленно и обновляется полным пересчетом.
+        :return: Количество пересчитанных артов.
+        """
+
+        art_table = Art._meta.db_table
+        popularity_table = ArtPopularity._meta.db_table
+        now = timezone.now()
+
+        params: list[Any] = [self.LIKE_WEIGHT, self.VIEW_WEIGHT, now, self.GRAVITY, now]
+        conditions: list[str] = []
+        if art_pks is not None:
+            conditions.append('art.id = ANY(%s)')
+            params.append(list(art_pks))
+        if changed_only:
+            conditions.append(
+                '(popularity.art_id IS NULL'
+                ' OR art.created_at >= %s'
+                ' OR popularity.likes_count <> art.likes_count'
+                ' OR popularity.views <> art.views)'
+            )
+            params.append(now - timedelta(seconds=self.RECENT_AGE))
+        where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+
+        sql = f'''
+            INSERT INTO {popularity_table} (art_id, score, likes_count, views, refreshed_at)
+            SELECT
+                art.id,
+                (art.likes_count * %s + art.views * %s + 1)
+                / POWER(GREATEST(EXTRACT(EPOCH FROM (%s - art.created_at)), 0) / 3600.0 + 2, %s),
+                art.likes_count,
+                art.views,
+                %s
+            FROM {art_table} AS art
+            LEFT JOIN {popularity_table} AS popularity ON popularity.art_id = art.id
+            {where}
+            ON CONFLICT (art_id) DO UPDATE
+            SET
+                score = EXCLUDED.score,
+                likes_count = EXCLUDED.likes_count,
+                views = EXCLUDED.views,
+                refreshed_at = EXCLUDED.refreshed_at
+        '''
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            refreshed_count = cursor.rowcount
+
+        art_feed_cache.invalidate_popular_arts()
+        return refreshed_count
@@ -0,0 +1,225 @@
+from typing import (
+    Any,
+    Iterator,
+    Collection,
+)
+
+from django.conf import settings
+from django.db import (
+    connection,
+    transaction,
+)
+from django.db.models import QuerySet
+
+from apps.arts.models import (
+    Art,
+    ArtRelation,
+    ArtTagStats,
+)
+
+
+class ArtRelatedService:
+    """
+    Сервис похожих артов.
+
+    Сходство артов - взвешенный коэффициент Жаккара их тэгов:
+
+        score = sum(weight(t) for t in A & B) / sum(weight(t) for t in A | B)
+        weight(t) = ln(1 + arts_count / tag_arts_count(t))
+
+    т.е. общий редкий тэг значит больше общего популярного. Частоты тэгов берутся
+    из статистики тэгов (см. ArtTagsService).
+
+    Для каждого арта хранятся `RELATED_COUNT` самых похожих (ArtRelation).
+    Списки считаются в БД разреженно: кандидаты в похожие - только арты
+    с общими тэгами (по GIN-индексу тэгов), а тэги, которые есть
+    у больше чем `MAX_TAG_ARTS` артов, кандидатов не дают.
+
+    Новый арт сразу получает свой список и попадает в списки похожих на него
+    артов (`add_art`). Списки удаленных артов укорачиваются, а веса тэгов
+    со временем меняются, поэтому списки периодически перестраиваются
+    командой `refresh_related_arts`.
+    """
+
+    RELATED_COUNT: int = settings.ARTS_RELATED_COUNT
+    MAX_TAG_ARTS: int = settings.ARTS_RELATED_MAX_TAG_ARTS
+
+    def get_related_arts(self, art_pk: Any, queryset: QuerySet[Art]) -> QuerySet[Art]:
+        """Похожие арты от самых похожих одним запросом по индексу списков"""
+
+        return (
+            queryset
+            .filter(reverse_relation__art_id=art_pk)
+            .order_by('-reverse_relation__score', '-reverse_relation__related_art_id')
+        )
+
+    def refresh(self, art_pks: Collection[Any] | None = None, batch_size: int = 500) -> int:
+        """
+        Пересчет списков похожих артов пачками по `batch_size` артов.
+
+        :param art_pks: Арты, списки которых нужно пересчитать. По умолчанию - все.
+        :return: Количество пересчитанных артов.
+        """
+
+        arts_count = Art.objects.count()
+        refreshed_count = 0
+        for batch_pks in self._iter_batches(art_pks, batch_size):
+            with transaction.atomic():
+                ArtRelation.objects.filter(art_id__in=batch_pks).delete()
+                self._execute(
+                    f'''
+                        INSERT INTO {ArtRelation._meta.db_table} (art_id, related_art_id, score)
+                        SELECT art_id, related_art_id, score
+                        FROM (
+                            SELECT
+                                *,
+                                ROW_NUMBER() OVER (
+                                    PARTITION BY art_id
+                                    ORDER BY score DESC, related_art_id DESC
+                                ) AS rank
+                            FROM ({self._get_scores_sql()}) AS scores
+                        ) AS ranked
+                        WHERE rank <= %(related_count)s
+                    ''',
+                    self._get_scores_params(batch_pks, arts_count),
+                )
+            refreshed_count += len(batch_pks)
+
+        return refreshed_count
+
+    def add_art(self, art: Art) -> None:
+        """
+        Добавление нового арта: его список похожих и он сам в списках похожих на него.
+
+        Арт попадает в список другого арта, только если похож на него больше,
+        чем последний арт в этом списке (или список еще не заполнен).
+        """
+
+        if not art.tags:
+            return
+
+        related_table = ArtRelation._meta.db_table
+        with transaction.atomic():
+            updated_art_pks = self._execute(
+                f'''
+                    WITH scores AS MATERIALIZED ({self._get_scores_sql()}),
+                    forward AS (
+                        INSERT INTO {related_table} (art_id, related_art_id, score)
+                        SELECT art_id, related_art_id, score
+                        FROM scores
+                        ORDER BY score DESC, related_art_id DESC
+                        LIMIT %(related_count)s
+                        ON CONFLICT (art_id, related_art_id) DO UPDATE SET score = EXCLUDED.score
+                    ),
+                    backward AS (
+                        INSERT INTO {related_table} (art_id, related_art_id, score)
+                        SELECT scores.related_art_id, scores.art_id, scores.score
+                        FROM scores
+                        WHERE (
+                            SELECT COUNT(*) < %(related_count)s OR MIN(top.score) < scores.score
+                            FROM (
+                                SELECT relation.score
+                                FROM {related_table} AS relation
+                                WHERE relation.art_id = scores.related_art_id
+                                ORDER BY relation.score DESC, relation.related_art_id DESC
+                                LIMIT %(related_count)s
+                            ) AS top
+                        )
+                        ON CONFLICT (art_id, related_art_id) DO UPDATE SET score = EXCLUDED.score
+                        RETURNING art_id
+                    )
+                    SELECT art_id FROM backward
+                ''',
+                self._get_scores_params([art.pk], Art.objects.count()),
+            )
+            if not updated_art_pks:
+                return
+
+            # Вытесняем из дополненных списков арты, не вошедшие в первые `RELATED_COUNT`.
+            self._execute(
+                f'''
+                    DELETE FROM {related_table}
+                    WHERE id IN (
+                        SELECT id
+                        FROM (
+                            SELECT
+                                id,
+                                ROW_NUMBER() OVER (
+                                    PARTITION BY art_id
+                                    ORDER BY score DESC, related_art_id DESC
+                                ) AS rank
+                            FROM {related_table}
+                            WHERE art_id = ANY(%(art_pks)s)
+                        ) AS ranked
+                        WHERE rank > %(related_count)s
+                    )
+                ''',
+                {'art_pks': [art_pk for art_pk, in updated_art_pks], 'related_count': self.RELATED_COUNT},
+            )
+
+    def _get_scores_sql(self) -> str:
+        """Сходство артов `%(art_pks)s` со всеми артами, у которых есть общие тэги"""
+
+        art_table = Art._meta.db_table
+        stats_table = ArtTagStats._meta.db_table
+        return f'''
+            SELECT
+                candidate.art_id,
+                candidate.related_art_id,
+                similarity.overlap_weight / similarity.union_weight AS score
+            FROM (
+                SELECT DISTINCT source.id AS art_id, related.id AS related_art_id
+                FROM {art_table} AS source
+                CROSS JOIN LATERAL unnest(source.tags) AS source_tag(tag)
+                INNER JOIN {stats_table} AS stats
+                    ON stats.tag = source_tag.tag
+                    AND stats.arts_count <= %(max_tag_arts)s
+                INNER JOIN {art_table} AS related
+                    ON related.tags @> ARRAY[source_tag.tag]
+                    AND related.id <> source.id
+                WHERE source.id = ANY(%(art_pks)s)
+            ) AS candidate
+            INNER JOIN {art_table} AS source ON source.id = candidate.art_id
+            INNER JOIN {art_table} AS related ON related.id = candidate.related_art_id
+            CROSS JOIN LATERAL (
+                SELECT
+                    SUM(weight.value) FILTER (
+                        WHERE tag.name = ANY(source.tags) AND tag.name = ANY(related.tags)
+                    ) AS overlap_weight,
+                    SUM(weight.value) AS union_weight
+                FROM (SELECT unnest(source.tags) UNION SELECT unnest(related.tags)) AS tag(name)
+                INNER JOIN {stats_table} AS stats ON stats.tag = tag.name
+                CROSS JOIN LATERAL (
+                    SELECT LN(1 + %(arts_count)s::float / GREATEST(stats.arts_count, 1))
+                ) AS weight(value)
+            ) AS similarity
+            WHERE similarity.overlap_weight > 0
+        '''
+
+    def _get_scores_params(self, art_pks: Collection[Any], arts_count: int) -> dict[str, Any]:
+        return {
+            'art_pks': list(art_pks),
+            'arts_count': arts_count,
+            'max_tag_arts': self.MAX_TAG_ARTS,
+            'related_count': self.RELATED_COUNT,
+        }
+
+    @staticmethod
+    def _iter_batches(art_pks: Collection[Any] | None, batch_size: int) -> Iterator[list[Any]]:
+        if art_pks is not None:
+            art_pks = list(art_pks)
+            for start in range(0, len(art_pks), batch_size):
+                yield art_pks[start:start + batch_size]
+            return
+
+        # Все id не загружаются в память: пачки выбираются по ключу `pk > последний`.
+        queryset = Art.objects.order_by('pk').values_list('pk', flat=True)
+        batch_pks = list(queryset[:batch_size])
+        while batch_pks:
+            yield batch_pks
+            batch_pks = list(queryset.filter(pk__gt=batch_pks[-1])[:batch_size])
+
+    def _execute(self, sql: str, params: dict[str, Any]) -> list[tuple[Any, ...]]:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.fetchall() if cursor.description is not None else []
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.db.models import (
+    F,
+    Func,
+    Value,
+    QuerySet,
+    FloatField,
+    TextField,
+)
+from django.db.models.functions import Cast
+from django.contrib.postgres.search import (
+    SearchRank,
+    SearchQuery,
+    SearchVector,
+)
+
+from apps.arts.models import Art
+
+
+class ArtSearchService:
+    """
+    Сервис полнотекстового поиска артов по описанию и тэгам.
+
+    Поиск идет по сохраненному `Art.search_vector` с GIN-индексом.
+
+    Найденные арты получают аннотацию `search_rank` - релевантность запросу.
+    """
+
+    SEARCH_CONFIG: str = settings.ARTS_SEARCH_CONFIG
+
+    def update_art(self, art: Art) -> None:
+        """Обновление поискового индекса арта после его записи"""
+
+        Art.objects.filter(pk=art.pk).update(search_vector=self.get_search_vector())
+
+    def search(self, queryset: QuerySet[Art], query: str) -> QuerySet[Art]:
+        search_query = SearchQuery(query, config=self.SEARCH_CONFIG, search_type='websearch')
+        return (
+            queryset
+            .filter(search_vector=search_query)
+            # ts_rank возвращает real. Приводим к double precision, чтобы значение,
+            # вернувшееся в курсоре пагинации, точно совпадало со значением в БД.
+            .annotate(search_rank=Cast(SearchRank(F('search_vector'), search_query), FloatField()))
+        )
+
+    @classmethod
+    def get_search_vector(cls) -> SearchVector:
+        # Тэги - это идентификаторы, поэтому они не стеммятся и весят больше описания.
+        tags = Func(F('tags'), Value(' '), function='array_to_string', output_field=TextField())
+        return (
+            SearchVector(tags, config='simple', weight='A')
+            + SearchVector('description', config=cls.SEARCH_CONFIG, weight='B')
+        )
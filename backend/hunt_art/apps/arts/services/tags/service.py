@@ -0,0 +1,88 @@
+from typing import Any
+
+from django.db import (
+    connection,
+    transaction,
+)
+from django.db.models import (
+    F,
+    QuerySet,
+)
+
+from apps.arts.models import (
+    Art,
+    ArtTagStats,
+)
+
+
+class ArtTagsService:
+    """
+    Сервис статистики тэгов артов.
+
+    Статистика обновляется одним запросом на арт при его создании и удалении.
+    Арты, удаленные каскадно (например, вместе с автором), в статистике
+    не учитываются до перестроения командой `recount_art_counters`.
+    """
+
+    def add_art(self, art: Art) -> None:
+        tags = self._get_unique_tags(art)
+        if not tags:
+            return
+
+        self._execute(
+            f'''
+                INSERT INTO {ArtTagStats._meta.db_table} (tag, arts_count, last_used_at)
+                SELECT tag, 1, %s
+                FROM unnest(%s::varchar[]) AS tag
+                ON CONFLICT (tag) DO UPDATE
+                SET arts_count = {ArtTagStats._meta.db_table}.arts_count + 1,
+                    last_used_at = GREATEST({ArtTagStats._meta.db_table}.last_used_at, EXCLUDED.last_used_at)
+            ''',
+            (art.created_at, tags),
+        )
+
+    def remove_art(self, art: Art) -> None:
+        tags = self._get_unique_tags(art)
+        if not tags:
+            return
+
+        with transaction.atomic():
+            stats = ArtTagStats.objects.filter(tag__in=tags)
+            # Тэг последнего арта удаляется, чтобы не предлагать его в автодополнении.
+            stats.filter(arts_count__lte=1).delete()
+            stats.update(arts_count=F('arts_count') - 1)
+
+    def rebuild(self) -> int:
+        """Перестроение статистики по всем артам. Возвращает количество тэгов."""
+
+        with transaction.atomic():
+            ArtTagStats.objects.all().delete()
+            return self._execute(
+                f'''
+                    INSERT INTO {ArtTagStats._meta.db_table} (tag, arts_count, last_used_at)
+                    SELECT art_tag.tag, COUNT(*), MAX(art.created_at)
+                    FROM {Art._meta.db_table} AS art
+                    CROSS JOIN LATERAL (SELECT DISTINCT unnest(art.tags) AS tag) AS art_tag
+                    GROUP BY art_tag.tag
+                ''',
+                (),
+            )
+
+    def get_popular_tags(self, limit: int) -> QuerySet[ArtTagStats]:
+        return ArtTagStats.objects.order_by('-arts_count', 'tag')[:limit]
+
+    def autocomplete(self, prefix: str, limit: int) -> QuerySet[ArtTagStats]:
+        return (
+            ArtTagStats.objects
+            .filter(tag__startswith=prefix)
+            .order_by('-arts_count', 'tag')[:limit]
+        )
+
+    @staticmethod
+    def _get_unique_tags(art: Art) -> list[str]:
+        return sorted(set(art.tags))
+
+    def _execute(self, sql: str, params: tuple[Any, ...]) -> int:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount
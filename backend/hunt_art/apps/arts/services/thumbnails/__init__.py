@@ -0,0 +1,9 @@
+from django.conf import settings
+
+from .service import ArtThumbnailsGenerator
+
+
+art_thumbnails_generator = ArtThumbnailsGenerator(
+    widths=settings.ARTS_THUMBNAILS_WIDTHS,
+    max_workers=settings.ARTS_THUMBNAILS_WORKERS,
+)
@@ -0,0 +1,155 @@
+import io
+import atexit
+import logging
+from typing import (
+    Any,
+    Iterable,
+    Sequence,
+    Collection,
+)
+from concurrent.futures import (
+    Future,
+    ThreadPoolExecutor,
+)
+
+from PIL import (
+    Image,
+    ImageOps,
+)
+
+from django.db import (
+    transaction,
+    close_old_connections,
+)
+from django.db.models import Q
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from apps.arts.models import Art
+from apps.arts.services.feed_cache import art_feed_cache
+from apps.media.services.deletion_queue import media_deletion_queue
+
+
+logger = logging.getLogger(__name__)
+
+
+class ArtThumbnailsGenerator:
+    """
+    Генератор уменьшенных копий изображений артов.
+
+    Для каждой ширины из `widths`, меньшей ширины оригинала, создаются копии
+    в WebP и JPEG (для клиентов без поддержки WebP). Генерация идет в пуле
+    потоков вне потока запроса: Pillow отпускает GIL при декодировании,
+    масштабировании и кодировании, поэтому потоки работают параллельно.
+
+    Результат записывается в `Art.thumbnails`:
+    `[{"width": 320, "format": "webp", "name": "arts/thumbnails/ab/cd/abcd...ef.webp"}, ...]`.
+    """
+
+    FORMATS = {
+        'webp': {'format': 'WEBP', 'quality': 80, 'method': 4},
+        'jpeg': {'format': 'JPEG', 'quality': 82, 'optimize': True, 'progressive': True},
+    }
+    UPLOAD_TO = 'arts/thumbnails'
+    EXIF_ORIENTATION_TAG = 0x0112
+
+    def __init__(self, widths: Sequence[int], max_workers: int) -> None:
+        self.widths = sorted(set(widths))
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix='art-thumbnails',
+        )
+        atexit.register(self._executor.shutdown, wait=True)
+
+    def schedule(self, art_pk: Any) -> None:
+        """Генерация после коммита транзакции, в которой создан арт"""
+
+        transaction.on_commit(lambda: self.submit(art_pk))
+
+    def submit(self, art_pk: Any) -> Future:
+        return self._executor.submit(self._generate_safely, art_pk)
+
+    def submit_many(self, art_pks: Iterable[Any]) -> list[Future]:
+        return [self.submit(art_pk) for art_pk in art_pks]
+
+    def generate(self, art_pk: Any) -> list[dict[str, Any]]:
+        art = Art.objects.only('pk', 'image').get(pk=art_pk)
+        with art.image.open('rb') as image_file:
+            image = Image.open(image_file)
+            widths = [width for width in self.widths if width < image.width]
+            if widths and image.getexif().get(self.EXIF_ORIENTATION_TAG, 1) == 1:
+                # JPEG декодируем сразу в уменьшенном масштабе, это в разы быстрее.
+                # Для повернутых через EXIF изображений не делаем этого, т.к. после
+                # поворота ширина и высота поменяются местами.
+                image.draft('RGB', (widths[-1], image.height * widths[-1] // image.width))
+            image = ImageOps.exif_transpose(image)
+
+            thumbnails = []
+            for width in widths:
+                if width >= image.width:
+                    break
+                height = max(1, round(image.height * width / image.width))
+                resized = image.resize((width, height), Image.Resampling.LANCZOS)
+                for format_name, save_options in self.FORMATS.items():
+                    name = default_storage.save(
+                        f'{self.UPLOAD_TO}/{width}.{format_name}',
+                        ContentFile(self._encode(resized, format_name, save_options)),
+                    )
+                    thumbnails.append({'width': width, 'format': format_name, 'name': name})
+
+        if not Art.objects.filter(pk=art.pk).update(thumbnails=thumbnails):
+            # Арт удалили во время генерации.
+            media_deletion_queue.enqueue(self.get_names_from(thumbnails))
+        art_feed_cache.invalidate_art_changed(art.pk)
+        return thumbnails
+
+    def get_names(self, art: Art) -> list[str]:
+        return self.get_names_from(art.thumbnails)
+
+    def filter_referenced_names(self, names: Collection[str]) -> set[str]:
+        """Имена копий из переданных, на которые ссылаются арты"""
+
+        names = {name for name in names if name.startswith(f'{self.UPLOAD_TO}/')}
+        if not names:
+            return set()
+
+        condition = Q()
+        for name in names:
+            condition |= Q(thumbnails__contains=[{'name': name}])
+
+        referenced_names: set[str] = set()
+        for thumbnails in Art.objects.filter(condition).values_list('thumbnails', flat=True):
+            referenced_names.update(self.get_names_from(thumbnails))
+
+        return referenced_names & names
+
+    @staticmethod
+    def get_names_from(thumbnails: list[dict[str, Any]]) -> list[str]:
+        return [thumbnail['name'] for thumbnail in thumbnails]
+
+    def _generate_safely(self, art_pk: Any) -> list[dict[str, Any]] | None:
+        close_old_connections()
+        try:
+            return self.generate(art_pk)
+        except Art.DoesNotExist:
+            return None
+        except Exception:
+            logger.exception('Failed to generate thumbnails for Art#%s', art_pk)
+            return None
+        finally:
+            close_old_connections()
+
+    @staticmethod
+    def _encode(image: Image.Image, format_name: str, save_options: dict[str, Any]) -> bytes:
+        if format_name == 'jpeg' and image.mode != 'RGB':
+            # JPEG не поддерживает прозрачность: накладываем на белый фон.
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            rgba_image = image.convert('RGBA')
+            background.paste(rgba_image, mask=rgba_image.getchannel('A'))
+            image = background
+        elif image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+
+        buffer = io.BytesIO()
+        image.save(buffer, **save_options)
+        return buffer.getvalue()
@@ -0,0 +1,239 @@
+from typing import Any
+
+from django.conf import settings
+from django.db import (
+    connection,
+    transaction,
+)
+from django.db.models import (
+    F,
+    Q,
+    QuerySet,
+    Subquery,
+)
+
+from apps.users.models import User
+from apps.arts.models import (
+    Art,
+    ArtTimelineEntry,
+    ArtTimelineBuild,
+)
+
+
+class ArtTimelineService:
+    """
+    Сервис ленты подписок.
+
+    Лента гибридная:
+    1. Арты обычных авторов при публикации раскладываются по лентам подписчиков
+       (fan-out on write) и читаются из `ArtTimelineEntry` по индексу.
+    2. Арты авторов, у которых подписчиков не меньше `CELEBRITY_FOLLOWERS_COUNT`,
+       не раскладываются (это были бы миллионы вставок на один арт)
+       и читаются напрямую из их артов (fan-out on read).
+
+    Когда после отписки автор перестает быть "знаменитостью", его последние арты
+    раскладываются по лентам всех подписчиков (см. `remove_follower`).
+    Команда `rebuild_art_timelines` нужна только после изменения настроек лент,
+    параметры последнего перестроения хранятся в `ArtTimelineBuild`.
+    """
+
+    CELEBRITY_FOLLOWERS_COUNT: int = settings.ARTS_TIMELINE_CELEBRITY_FOLLOWERS_COUNT
+    BACKFILL_ARTS_COUNT: int = settings.ARTS_TIMELINE_BACKFILL_ARTS_COUNT
+
+    def is_celebrity(self, author: User) -> bool:
+        return author.followers_count >= self.CELEBRITY_FOLLOWERS_COUNT
+
+    def fan_out_art(self, art: Art) -> None:
+        """Раскладка нового арта по лентам подписчиков автора одним запросом"""
+
+        if self.is_celebrity(art.author):
+            return
+
+        subscriptions_table, subscriber_column, subscription_column = self._get_subscriptions_schema()
+        self._execute(
+            f'''
+                INSERT INTO {ArtTimelineEntry._meta.db_table} (owner_id, art_id, created_at)
+                SELECT subscription.{subscriber_column}, %s, %s
+                FROM {subscriptions_table} AS subscription
+                WHERE subscription.{subscription_column} = %s
+                ON CONFLICT DO NOTHING
+            ''',
+            (art.pk, art.created_at, art.author_id),
+        )
+
+    def add_author(self, owner_pk: Any, author: User) -> None:
+        """Добавление в ленту последних артов автора после подписки на него"""
+
+        if self.is_celebrity(author):
+            return
+
+        self._execute(
+            f'''
+                INSERT INTO {ArtTimelineEntry._meta.db_table} (owner_id, art_id, created_at)
+                SELECT %s, art.id, art.created_at
+                FROM {Art._meta.db_table} AS art
+                WHERE art.author_id = %s
+                ORDER BY art.created_at DESC, art.id DESC
+                LIMIT %s
+                ON CONFLICT DO NOTHING
+            ''',
+            (owner_pk, author.pk, self.BACKFILL_ARTS_COUNT),
+        )
+
+    def remove_author(self, owner_pk: Any, author_pk: Any) -> None:
+        """Удаление артов автора из ленты после отписки от него"""
+
+        ArtTimelineEntry.objects.filter(owner_id=owner_pk, art__author_id=author_pk).delete()
+
+    def remove_follower(self, author: User, followers_count: int) -> None:
+        """
+        Обновление лент после отписки от автора.
+
+        Пока автор был "знаменитостью", его арты не раскладывались и не добавлялись
+        в ленты при подписке. Поэтому, когда он перестает ей быть, его последние арты
+        раскладываются по лентам всех подписчиков. Количество подписчиков меняется
+        по одному под блокировкой строки автора, так что порог пересекается ровно
+        при одном значении. Если автор, наоборот, стал "знаменитостью", разложенные
+        арты остаются в лентах: при чтении повторы из двух источников отбрасываются.
+
+        :param followers_count: Количество подписчиков автора после отписки.
+        """
+
+        author.followers_count = followers_count
+        if followers_count == self.CELEBRITY_FOLLOWERS_COUNT - 1:
+            self.fan_out_author(author.pk)
+
+    def fan_out_author(self, author_pk: Any) -> None:
+        """Раскладка последних артов автора по лентам всех его подписчиков одним запросом"""
+
+        subscriptions_table, subscriber_column, subscription_column = self._get_subscriptions_schema()
+        self._execute(
+            f'''
+                INSERT INTO {ArtTimelineEntry._meta.db_table} (owner_id, art_id, created_at)
+                SELECT subscription.{subscriber_column}, art.id, art.created_at
+                FROM {subscriptions_table} AS subscription
+                CROSS JOIN (
+                    SELECT id, created_at
+                    FROM {Art._meta.db_table}
+                    WHERE author_id = %s
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT %s
+                ) AS art
+                WHERE subscription.{subscription_column} = %s
+                ON CONFLICT DO NOTHING
+            ''',
+            (author_pk, self.BACKFILL_ARTS_COUNT, author_pk),
+        )
+
+    def is_rebuild_needed(self) -> bool:
+        """Изменились ли настройки лент с последнего перестроения"""
+
+        build = ArtTimelineBuild.objects.first()
+        return (
+            build is None
+            or build.celebrity_followers_count != self.CELEBRITY_FOLLOWERS_COUNT
+            or build.backfill_arts_count != self.BACKFILL_ARTS_COUNT
+        )
+
+    def rebuild(self, batch_size: int = 1000) -> None:
+        """
+        Полное перестроение лент всех пользователей.
+
+        Ленты перестраиваются пачками владельцев, каждая пачка в своей транзакции,
+        поэтому блокировки короткие, а ленты остальных пользователей остаются на месте.
+        """
+
+        subscriptions_table, subscriber_column, subscription_column = self._get_subscriptions_schema()
+        owners = User.objects.order_by('pk').values_list('pk', flat=True)
+        last_owner_pk = None
+        while True:
+            if last_owner_pk is not None:
+                owners = owners.filter(pk__gt=last_owner_pk)
+            owner_pks = list(owners[:batch_size])
+            if not owner_pks:
+                break
+
+            with transaction.atomic():
+                ArtTimelineEntry.objects.filter(owner_id__in=owner_pks).delete()
+                self._execute(
+                    f'''
+                        INSERT INTO {ArtTimelineEntry._meta.db_table} (owner_id, art_id, created_at)
+                        SELECT subscription.{subscriber_column}, art.id, art.created_at
+                        FROM {subscriptions_table} AS subscription
+                        INNER JOIN {User._meta.db_table} AS author
+                            ON author.id = subscription.{subscription_column}
+                            AND author.followers_count < %s
+                        CROSS JOIN LATERAL (
+                            SELECT id, created_at
+                            FROM {Art._meta.db_table}
+                            WHERE author_id = author.id
+                            ORDER BY created_at DESC, id DESC
+                            LIMIT %s
+                        ) AS art
+                        WHERE subscription.{subscriber_column} = ANY(%s)
+                        ON CONFLICT DO NOTHING
+                    ''',
+                    (self.CELEBRITY_FOLLOWERS_COUNT, self.BACKFILL_ARTS_COUNT, owner_pks),
+                )
+            last_owner_pk = owner_pks[-1]
+
+        ArtTimelineBuild.objects.update_or_create(
+            pk=1,
+            defaults={
+                'celebrity_followers_count': self.CELEBRITY_FOLLOWERS_COUNT,
+                'backfill_arts_count': self.BACKFILL_ARTS_COUNT,
+            },
+        )
+
+    def filter_feed(self, owner_pk: Any, queryset: QuerySet[Art]) -> QuerySet[Art]:
+        """Ограничение выборки артами ленты одним запросом (для постраничной пагинации)"""
+
+        return queryset.filter(
+            Q(pk__in=Subquery(
+                ArtTimelineEntry.objects
+                .filter(owner_id=owner_pk)
+                .values('art_id'),
+            ))
+            | Q(author_id__in=self._get_celebrity_subscriptions(owner_pk))
+        )
+
+    def split_feed(self, owner_pk: Any, queryset: QuerySet[Art]) -> list[QuerySet[Art]]:
+        """
+        Разделение ленты на источники для пагинации по ключу.
+
+        Каждый источник читается по своему индексу, а результаты объединяются
+        пагинатором. У обоих источников есть аннотация `published_at`,
+        по которой идет сортировка.
+        """
+
+        return [
+            queryset
+            .filter(timeline_entry__owner_id=owner_pk)
+            .annotate(published_at=F('timeline_entry__created_at')),
+            queryset
+            .filter(author_id__in=self._get_celebrity_subscriptions(owner_pk))
+            .annotate(published_at=F('created_at')),
+        ]
+
+    def _get_celebrity_subscriptions(self, owner_pk: Any) -> Subquery:
+        user_model_name = User._meta.model_name
+        return Subquery(
+            User.subscriptions.through.objects
+            .filter(**{
+                f'from_{user_model_name}_id': owner_pk,
+                f'to_{user_model_name}__followers_count__gte': self.CELEBRITY_FOLLOWERS_COUNT,
+            })
+            .values(f'to_{user_model_name}_id'),
+        )
+
+    def _get_subscriptions_schema(self) -> tuple[str, str, str]:
+        user_model_name = User._meta.model_name
+        return (
+            User.subscriptions.through._meta.db_table,
+            f'from_{user_model_name}_id',
+            f'to_{user_model_name}_id',
+        )
+
+    def _execute(self, sql: str, params: tuple[Any, ...]) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
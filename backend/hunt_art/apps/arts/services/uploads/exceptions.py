@@ -0,0 +1,34 @@
+from apps.arts.models import ArtUploadSession
+
+
+class UploadIsTooLarge(Exception):
+    def __init__(self, size: int, max_size: int) -> None:
+        self.message = f'Размер файла {size} байт превышает максимальный {max_size} байт'
+        super().__init__(self.message)
+
+
+class UploadOffsetMismatch(Exception):
+    def __init__(self, session: ArtUploadSession, offset: int) -> None:
+        self.message = (
+            f'Часть загрузки id={session.pk} должна начинаться с байта {session.offset}, '
+            f'а не с {offset}'
+        )
+        super().__init__(self.message)
+
+
+class UploadChunkOutOfRange(Exception):
+    def __init__(self, session: ArtUploadSession, offset: int, length: int) -> None:
+        self.message = (
+            f'Часть [{offset}, {offset + length}) выходит за размер файла '
+            f'{session.size} байт в загрузке id={session.pk}'
+        )
+        super().__init__(self.message)
+
+
+class UploadIsNotComplete(Exception):
+    def __init__(self, session: ArtUploadSession) -> None:
+        self.message = (
+            f'Загрузка id={session.pk} не завершена: '
+            f'получено {session.offset} из {session.size} байт'
+        )
+        super().__init__(self.message)
@@ -0,0 +1,145 @@
+import os
+import datetime as dt
+from typing import (
+    IO,
+    Any,
+)
+
+from django.conf import settings
+from django.utils import timezone
+from django.db.models import QuerySet
+from django.core.files.uploadedfile import UploadedFile
+
+from apps.users.models import User
+from apps.arts.models import ArtUploadSession
+
+from . import exceptions
+
+
+class ArtUploadsService:
+    """
+    Сервис возобновляемой загрузки изображений артов по частям.
+
+    Части потоково пишутся в файл сессии кусками по `CHUNK_READ_SIZE`,
+    поэтому память не зависит ни от размера части, ни от размера файла.
+    Принимаются только части, начинающиеся с текущего `offset` сессии.
+    Если соединение оборвалось посреди части, принятые байты сохраняются,
+    и клиент продолжает загрузку с нового `offset`.
+    """
+
+    CHUNK_READ_SIZE = 64 * 1024
+    UPLOADS_DIR: str = settings.ARTS_UPLOADS_DIR
+    MAX_SIZE: int = settings.ARTS_UPLOADS_MAX_SIZE
+    EXPIRATION = dt.timedelta(seconds=settings.ARTS_UPLOADS_EXPIRATION)
+
+    def __init__(self, current_user: User) -> None:
+        self.__current_user = current_user
+
+    def create_session(self, filename: str, size: int) -> ArtUploadSession:
+        if size > self.MAX_SIZE:
+            raise exceptions.UploadIsTooLarge(size, self.MAX_SIZE)
+
+        session = ArtUploadSession.objects.create(
+            user_id=self.__current_user.pk,
+            filename=os.path.basename(filename),
+            size=size,
+        )
+        os.makedirs(self.UPLOADS_DIR, exist_ok=True)
+        with open(self.get_path(session), 'wb') as file:
+            file.truncate(size)
+
+        return session
+
+    def get_sessions(self) -> QuerySet[ArtUploadSession]:
+        return ArtUploadSession.objects.filter(
+            user_id=self.__current_user.pk,
+            created_at__gte=timezone.now() - self.EXPIRATION,
+        )
+
+    def write_chunk(self, session: ArtUploadSession, offset: int, length: int, stream: IO[bytes]) -> ArtUploadSession:
+        """Запись части длиной `length` байт из потока запроса"""
+
+        if offset != session.offset:
+            raise exceptions.UploadOffsetMismatch(session, offset)
+        if offset + length > session.size:
+            raise exceptions.UploadChunkOutOfRange(session, offset, length)
+
+        written = 0
+        try:
+            with open(self.get_path(session), 'r+b') as file:
+                file.seek(offset)
+                while written < length:
+                    data = stream.read(min(self.CHUNK_READ_SIZE, length - written))
+                    if not data:
+                        break
+                    file.write(data)
+                    written += len(data)
+        finally:
+            # Смещение сдвигается условно: если параллельный запрос уже записал
+            # эту часть, второй получит ошибку, а не удвоит смещение.
+            updated = (
+                ArtUploadSession.objects
+                .filter(pk=session.pk, offset=offset)
+                .update(offset=offset + written)
+            )
+
+        if not updated:
+            session.refresh_from_db(fields=('offset', ))
+            raise exceptions.UploadOffsetMismatch(session, offset)
+
+        session.offset = offset + written
+        return session
+
+    def open_file(self, session: ArtUploadSession) -> UploadedFile:
+        """Открытие полностью загруженного файла для передачи в CreateArtSerializer"""
+
+        if session.offset != session.size:
+            raise exceptions.UploadIsNotComplete(session)
+
+        return _SessionUploadedFile(self.get_path(session), session.filename, session.size)
+
+    def delete_session(self, session: ArtUploadSession) -> None:
+        self._remove_file(session)
+        session.delete()
+
+    @classmethod
+    def clear_expired_sessions(cls) -> int:
+        expired_sessions = ArtUploadSession.objects.filter(created_at__lt=timezone.now() - cls.EXPIRATION)
+        for session in expired_sessions.iterator():
+            cls._remove_file(session)
+        deleted_count, _ = expired_sessions.delete()
+        return deleted_count
+
+    @classmethod
+    def get_path(cls, session: ArtUploadSession) -> str:
+        return os.path.join(cls.UPLOADS_DIR, f'{session.pk}.part')
+
+    @classmethod
+    def _remove_file(cls, session: ArtUploadSession) -> None:
+        try:
+            os.remove(cls.get_path(session))
+        except FileNotFoundError:
+            pass
+
+
+class _SessionUploadedFile(UploadedFile):
+    """
+    Загруженный по частям файл.
+
+    Как и TemporaryUploadedFile, отдает путь к файлу на диске, поэтому
+    валидация изображения и сохранение в хранилище не читают файл в память.
+    """
+
+    def __init__(self, path: str, name: str, size: int) -> None:
+        super().__init__(open(path, 'rb'), name=name, size=size)
+        self._path = path
+
+    def temporary_file_path(self) -> str:
+        return self._path
+
+    def close(self) -> Any:
+        try:
+            return self.file.close()
+        except FileNotFoundError:
+            # Хранилище могло переместить файл вместо копирования.
+            pass
@@ -0,0 +1,6 @@
+from django.conf import settings
+
+from .service import ArtViewsCounter
+
+
+art_views_counter = ArtViewsCounter(flush_interval=settings.ARTS_VIEWS_FLUSH_INTERVAL)
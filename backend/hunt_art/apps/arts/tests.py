@@ -0,0 +1,829 @@
+import io
+import json
+from base64 import urlsafe_b64encode
+from typing import Any
+from datetime import timedelta
+from unittest import mock
+
+from PIL import (
+    Image,
+    ImageOps,
+)
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.utils import timezone
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from rest_framework.request import Request
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import (
+    APITestCase,
+    APIRequestFactory,
+)
+
+from apps.users.models import User
+from apps.arts.models import (
+    Art,
+    ArtLike,
+    ArtComment,
+    ArtPopularity,
+    ArtRelation,
+    ArtTagStats,
+    ArtTimelineEntry,
+)
+from apps.arts.services.tags import ArtTagsService
+from apps.arts.services.likes import ArtLikesService
+from apps.arts.services.comments import ArtCommentsService
+from apps.arts.services.popularity import ArtPopularityService
+from apps.arts.services.related import ArtRelatedService
+from apps.arts.services.timeline import ArtTimelineService
+from apps.arts.services.duplicates import ArtDuplicatesService
+from apps.arts.services.thumbnails import art_thumbnails_generator
+from apps.media.models import MediaFileDeletion
+from apps.media.services.deletion_queue import media_deletion_queue
+from api.v1.arts.serializers import (
+    CreateArtSerializer,
+    ShortRetrieveArtSerializer,
+    FastShortRetrieveArtSerializer,
+    ShortRetrieveArtForAuthorizedUserSerializer,
+    FastShortRetrieveArtForAuthorizedUserSerializer,
+)
+
+
+def create_art(author: User, **fields) -> Art:
+    fields.setdefault('image', 'arts/images/test.png')
+    return Art.objects.create(author=author, **fields)
+
+
+class ArtsAPITestCase(APITestCase):
+    def setUp(self) -> None:
+        # Страницы лент для анонимных пользователей кэшируются.
+        cache.clear()
+
+    def walk_pages(self, url: str, link: str = 'next') -> list[dict[str, Any]]:
+        """Обход ленты по ссылкам `link` до конца. Возвращает страницы."""
+
+        pages = []
+        while url is not None:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            pages.append(response.data)
+            url = response.data[link]
+
+        return pages
+
+    @staticmethod
+    def get_ids(pages: list[dict[str, Any]]) -> list[int]:
+        return [art['id'] for page in pages for art in page['results']]
+
+
+class ArtKeysetPaginationTests(ArtsAPITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.author = User.objects.create_user('author')
+        self.arts = [create_art(self.author) for _ in range(7)]
+        # Одинаковые даты создания: порядок между ними задает id.
+        Art.objects.filter(pk__in=[art.pk for art in self.arts[2:5]]).update(
+            created_at=self.arts[2].created_at,
+        )
+        self.expected_ids = list(
+            Art.objects.order_by('-created_at', '-id').values_list('pk', flat=True)
+        )
+
+    def test_next_links_cover_feed_without_duplicates(self) -> None:
+        pages = self.walk_pages('/api/v1/arts/new/?cursor=&page_size=3')
+
+        self.assertEqual([len(page['results']) for page in pages], [3, 3, 1])
+        self.assertEqual(self.get_ids(pages), self.expected_ids)
+        self.assertIsNone(pages[0]['previous'])
+
+    def test_previous_links_return_same_pages(self) -> None:
+        pages = self.walk_pages('/api/v1/arts/new/?cursor=&page_size=3')
+        previous_pages = self.walk_pages(pages[-1]['previous'], link='previous')
+
+        self.assertEqual(
+            [page['results'] for page in previous_pages],
+            [page['results'] for page in reversed(pages[:-1])],
+        )
+
+    def test_new_arts_between_pages_do_not_shift_feed(self) -> None:
+        first_page = self.client.get('/api/v1/arts/new/?cursor=&page_size=3').data
+        create_art(self.author)
+        pages = [first_page, *self.walk_pages(first_page['next'])]
+
+        self.assertEqual(self.get_ids(pages), self.expected_ids)
+
+    def test_invalid_cursor(self) -> None:
+        response = self.client.get('/api/v1/arts/new/?cursor=invalid')
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_tampered_cursor(self) -> None:
+        positions = (
+            ['notadate', 1],
+            [None, None],
+            [{'a': 1}, 1],
+            ['2024-01-01T00:00:00+00:00', 'x'],
+            ['2024-01-01T00:00:00+00:00', [1]],
+        )
+        for position in positions:
+            cursor = urlsafe_b64encode(json.dumps({'p': position}).encode()).decode()
+            with self.subTest(position=position):
+                response = self.client.get(f'/api/v1/arts/new/?cursor={cursor}')
+                self.assertEqual(response.status_code, 404)
+
+        # Строковый id из курсора приводится к числу.
+        cursor = urlsafe_b64encode(json.dumps({'p': [self.arts[-1].created_at.isoformat(), '1000000']}).encode())
+        response = self.client.get(f'/api/v1/arts/new/?cursor={cursor.decode()}')
+        self.assertEqual(response.status_code, 200)
+
+    def test_page_number_pagination_without_cursor(self) -> None:
+        response = self.client.get('/api/v1/arts/new/?page=2&page_size=3')
+
+        self.assertEqual(response.data['count'], len(self.expected_ids))
+        self.assertEqual([art['id'] for art in response.data['results']], self.expected_ids[3:6])
+
+
+class ArtSubscriptionsFeedTests(ArtsAPITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.subscriber = User.objects.create_user('subscriber')
+        self.author = User.objects.create_user('author')
+        self.celebrity = User.objects.create_user('celebrity')
+        stranger = User.objects.create_user('stranger')
+        for user in (self.author, self.celebrity):
+            User.objects.add_subscription(self.subscriber.pk, user.pk)
+        User.objects.filter(pk=self.celebrity.pk).update(
+            followers_count=ArtTimelineService.CELEBRITY_FOLLOWERS_COUNT,
+        )
+
+        for author in (self.author, self.celebrity, stranger, self.author, self.celebrity, self.author):
+            create_art(author)
+        ArtTimelineService().rebuild(batch_size=1)
+        self.expected_ids = list(
+            Art.objects
+            .filter(author__in=(self.author, self.celebrity))
+            .order_by('-created_at', '-id')
+            .values_list('pk', flat=True)
+        )
+        self.client.force_authenticate(self.subscriber)
+
+    def test_celebrity_arts_are_not_fanned_out(self) -> None:
+        self.assertEqual(
+            set(ArtTimelineEntry.objects.values_list('owner_id', 'art__author_id')),
+            {(self.subscriber.pk, self.author.pk)},
+        )
+
+    def test_keyset_pages_merge_timeline_and_celebrity_arts(self) -> None:
+        pages = self.walk_pages('/api/v1/arts/subscriptions/?cursor=&page_size=2')
+
+        self.assertEqual(self.get_ids(pages), self.expected_ids)
+
+    def test_page_number_pagination(self) -> None:
+        response = self.client.get('/api/v1/arts/subscriptions/?page_size=40')
+
+        self.assertEqual([art['id'] for art in response.data['results']], self.expected_ids)
+
+    def test_new_art_is_fanned_out(self) -> None:
+        art = create_art(self.author)
+        ArtTimelineService().fan_out_art(art)
+
+        pages = self.walk_pages('/api/v1/arts/subscriptions/?cursor=&page_size=2')
+        self.assertEqual(self.get_ids(pages), [art.pk, *self.expected_ids])
+
+    def test_rebuild_is_needed_after_threshold_change(self) -> None:
+        service = ArtTimelineService()
+        self.assertFalse(service.is_rebuild_needed())
+
+        with mock.patch.object(ArtTimelineService, 'CELEBRITY_FOLLOWERS_COUNT', 2):
+            self.assertTrue(service.is_rebuild_needed())
+
+
+class ArtCelebrityDemotionTests(ArtsAPITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        patcher = mock.patch.object(ArtTimelineService, 'CELEBRITY_FOLLOWERS_COUNT', 3)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.author = User.objects.create_user('author')
+        self.followers = [User.objects.create_user(f'follower{i}') for i in range(3)]
+        self.arts = [create_art(self.author) for _ in range(2)]
+
+        # Первые двое подписываются на обычного автора, третий - уже на "знаменитость".
+        for follower in self.followers:
+            self.subscribe(follower)
+        self.author.refresh_from_db()
+        self.new_art = create_art(self.author)
+        ArtTimelineService().fan_out_art(self.new_art)
+
+    def subscribe(self, follower: User) -> None:
+        self.client.force_authenticate(follower)
+        response = self.client.post(f'/api/v1/users/{self.author.pk}/subscribe/')
+        self.assertEqual(response.status_code, 200)
+
+    def get_timeline(self, owner: User) -> set[int]:
+        return set(ArtTimelineEntry.objects.filter(owner=owner).values_list('art_id', flat=True))
+
+    def test_unsubscribe_backfills_followers(self) -> None:
+        old_art_pks = {art.pk for art in self.arts}
+        self.assertEqual(self.get_timeline(self.followers[0]), old_art_pks)
+        self.assertEqual(self.get_timeline(self.followers[2]), set())
+
+        self.client.force_authenticate(self.followers[0])
+        response = self.client.delete(f'/api/v1/users/{self.author.pk}/unsubscribe/')
+        self.assertEqual(response.status_code, 204)
+
+        all_art_pks = {*old_art_pks, self.new_art.pk}
+        self.assertEqual(self.get_timeline(self.followers[0]), set())
+        for follower in self.followers[1:]:
+            self.assertEqual(self.get_timeline(follower), all_art_pks)
+
+            self.client.force_authenticate(follower)
+            pages = self.walk_pages('/api/v1/arts/subscriptions/?cursor=&page_size=2')
+            self.assertEqual(set(self.get_ids(pages)), all_art_pks)
+
+    def test_remove_from_subscribers_backfills_followers(self) -> None:
+        self.client.force_authenticate(self.author)
+        response = self.client.delete(f'/api/v1/users/{self.followers[2].pk}/remove-from-subscribers/')
+        self.assertEqual(response.status_code, 204)
+
+        all_art_pks = {*(art.pk for art in self.arts), self.new_art.pk}
+        for follower in self.followers[:2]:
+            self.assertEqual(self.get_timeline(follower), all_art_pks)
+        self.assertEqual(self.get_timeline(self.followers[2]), set())
+
+
+class ArtLikesCountTests(ArtsAPITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.art = create_art(User.objects.create_user('author'))
+        self.users = [User.objects.create_user(f'user{i}') for i in range(3)]
+
+    def like(self, user: User, liked: bool = True) -> int:
+        self.client.force_authenticate(user)
+        url = f'/api/v1/arts/{self.art.pk}/like/'
+        response = self.client.post(url) if liked else self.client.delete(url)
+        return response.status_code
+
+    def assertLikesCount(self, likes_count: int) -> None:
+        self.art.refresh_from_db()
+        self.assertEqual(self.art.likes_count, likes_count)
+        self.assertEqual(ArtLike.objects.filter(art=self.art).count(), likes_count)
+
+    def test_like_and_dislike_change_counter(self) -> None:
+        for user in self.users:
+            self.assertEqual(self.like(user), 200)
+        self.assertLikesCount(3)
+
+        self.assertEqual(self.like(self.users[0], liked=False), 204)
+        self.assertLikesCount(2)
+
+    def test_repeated_like_and_dislike_are_idempotent(self) -> None:
+        self.like(self.users[0])
+        self.like(self.users[0])
+        self.assertLikesCount(1)
+
+        self.like(self.users[0], liked=False)
+        self.like(self.users[0], liked=False)
+        self.like(self.users[1], liked=False)
+        self.assertLikesCount(0)
+
+    def test_like_does_not_change_updated_at(self) -> None:
+        updated_at = self.art.updated_at
+        self.like(self.users[0])
+
+        self.art.refresh_from_db()
+        self.assertEqual(self.art.updated_at, updated_at)
+
+    def test_like_of_missing_art(self) -> None:
+        self.client.force_authenticate(self.users[0])
+
+        self.assertEqual(self.client.post(f'/api/v1/arts/{self.art.pk + 1}/like/').status_code, 404)
+        self.assertEqual(self.client.delete(f'/api/v1/arts/{self.art.pk + 1}/like/').status_code, 404)
+
+    def test_like_requires_authentication(self) -> None:
+        self.assertEqual(self.client.post(f'/api/v1/arts/{self.art.pk}/like/').status_code, 401)
+        self.assertLikesCount(0)
+
+
+class ArtLikesBatchTests(ArtsAPITestCase):
+    url = '/api/v1/arts/likes/batch/'
+
+    def setUp(self) -> None:
+        super().setUp()
+        author = User.objects.create_user('author')
+        self.arts = [create_art(author) for _ in range(3)]
+        self.user = User.objects.create_user('user')
+        self.client.force_authenticate(self.user)
+
+    def apply(self, *operations: tuple[Art | int, bool]) -> list[dict[str, Any]]:
+        response = self.client.post(
+            self.url,
+            {
+                'operations': [
+                    {'art_id': art.pk if isinstance(art, Art) else art, 'liked': liked}
+                    for art, liked in operations
+                ],
+            },
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data
+
+    def test_last_operation_for_art_wins(self) -> None:
+        states = self.apply(
+            (self.arts[0], True),
+            (self.arts[1], True),
+            (self.arts[0], False),
+            (self.arts[2], True),
+        )
+
+        self.assertEqual(
+            [(state['art_id'], state['liked'], state['likes_count'], state['changed']) for state in states],
+            [
+                (self.arts[0].pk, False, 0, False),
+                (self.arts[1].pk, True, 1, True),
+                (self.arts[2].pk, True, 1, True),
+            ],
+        )
+        self.assertEqual(
+            set(ArtLike.objects.values_list('art_id', flat=True)),
+            {self.arts[1].pk, self.arts[2].pk},
+        )
+
+    def test_repeated_batch_changes_nothing(self) -> None:
+        operations = ((self.arts[0], True), (self.arts[1], True))
+        self.apply(*operations)
+        states = self.apply(*operations)
+
+        self.assertEqual([state['changed'] for state in states], [False, False])
+        self.assertEqual([state['likes_count'] for state in states], [1, 1])
+
+    def test_missing_arts_are_skipped(self) -> None:
+        missing_pk = max(art.pk for art in self.arts) + 1
+        states = self.apply((missing_pk, True), (self.arts[0], True))
+
+        self.assertEqual([state['art_id'] for state in states], [self.arts[0].pk])
+        self.assertFalse(ArtLike.objects.filter(art_id=missing_pk).exists())
+
+    def test_counters_match_likes(self) -> None:
+        other_user = User.objects.create_user('other')
+        self.apply((self.arts[0], True), (self.arts[1], True))
+        self.client.force_authenticate(other_user)
+        self.apply((self.arts[0], True), (self.arts[1], False))
+
+        for art in Art.objects.all():
+            self.assertEqual(art.likes_count, ArtLike.objects.filter(art=art).count())
+
+
+class ArtCommentsCountTests(ArtsAPITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.art = create_art(User.objects.create_user('author'))
+        self.user = User.objects.create_user('user')
+        self.client.force_authenticate(self.user)
+        self.url = f'/api/v1/arts/{self.art.pk}/comments/'
+
+    def comment(self, text: str = 'text') -> int:
+        response = self.client.post(self.url, {'text': text}, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.data['id']
+
+    def assertCommentsCount(self, comments_count: int) -> None:
+        self.art.refresh_from_db()
+        self.assertEqual(self.art.comments_count, comments_count)
+        self.assertEqual(ArtComment.objects.filter(art=self.art).count(), comments_count)
+
+    def test_create_and_delete_change_counter(self) -> None:
+        comment_pks = [self.comment() for _ in range(3)]
+        self.assertCommentsCount(3)
+
+        response = self.client.delete(f'{self.url}{comment_pks[0]}/')
+        self.assertEqual(response.status_code, 204)
+        self.assertCommentsCount(2)
+
+    def test_delete_of_deleted_comment(self) -> None:
+        self.comment()
+        comment = ArtComment.objects.get(pk=self.comment())
+        ArtCommentsService(self.user).delete_comment(comment)
+
+        # Повторное удаление (например, параллельным запросом) счетчик не уменьшает.
+        ArtCommentsService(self.user).delete_comment(comment)
+        self.assertCommentsCount(1)
+
+    def test_comment_does_not_change_updated_at(self) -> None:
+        updated_at = self.art.updated_at
+        self.comment()
+
+        self.art.refresh_from_db()
+        self.assertEqual(self.art.updated_at, updated_at)
+
+    def test_feed_shows_counter(self) -> None:
+        self.comment()
+        self.comment()
+
+        response = self.client.get('/api/v1/arts/new/')
+        self.assertEqual(response.data['results'][0]['count_comments'], 2)
+
+    def test_comment_on_missing_art(self) -> None:
+        response = self.client.post(f'/api/v1/arts/{self.art.pk + 1}/comments/', {'text': 'text'})
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(ArtComment.objects.exists())
+
+
+@mock.patch('api.v1.arts.views.art_views_counter')
+class ArtConditionalRetrieveTests(ArtsAPITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.art = create_art(User.objects.create_user('author'))
+        self.url = f'/api/v1/arts/{self.art.pk}/'
+
+    def test_if_none_match(self, views_counter: mock.Mock) -> None:
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        # Повторный просмотр без тела ответа тоже считается.
+        self.assertEqual(views_counter.add_view.call_count, 2)
+
+    def test_if_modified_since(self, views_counter: mock.Mock) -> None:
+        response = self.client.get(self.url)
+
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+    def test_like_and_comment_change_etag(self, views_counter: mock.Mock) -> None:
+        etags = [self.client.get(self.url)['ETag']]
+
+        user = User.objects.create_user('user')
+        ArtLikesService(user).like_art(self.art.pk)
+        etags.append(self.client.get(self.url)['ETag'])
+
+        ArtCommentsService(user).create_comment(self.art.pk, 'text')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etags[-1])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count_comments'], 1)
+        etags.append(response['ETag'])
+
+        self.assertEqual(len(set(etags)), 3)
+
+    def test_etag_depends_on_user(self, views_counter: mock.Mock) -> None:
+        anonymous_etag = self.client.get(self.url)['ETag']
+        user = User.objects.create_user('user')
+        self.client.force_authenticate(user)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=anonymous_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Authorization', response['Vary'])
+
+        ArtLikesService(user).like_art(self.art.pk)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['liked_authorized_user'])
+
+    def test_missing_art(self, views_counter: mock.Mock) -> None:
+        response = self.client.get(f'/api/v1/arts/{self.art.pk + 1}/', HTTP_IF_NONE_MATCH='*')
+
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response)
+
+
+class ArtThumbnailsReferencesTests(APITestCase):
+    def setUp(self) -> None:
+        self.author = User.objects.create_user('author')
+        self.art = create_art(self.author, thumbnails=self.make_thumbnails('aa', 'bb'))
+        create_art(self.author, thumbnails=self.make_thumbnails('bb', 'cc'))
+
+    @staticmethod
+    def make_thumbnails(*keys: str) -> list[dict[str, Any]]:
+        return [
+            {'width': 320, 'format': 'webp', 'name': f'arts/thumbnails/{key}.webp'}
+            for key in keys
+        ]
+
+    def test_filter_referenced_names(self) -> None:
+        names = {
+            'arts/thumbnails/aa.webp',
+            'arts/thumbnails/cc.webp',
+            'arts/thumbnails/dd.webp',
+            # Имена вне папки копий не проверяются, даже если совпадают.
+            'arts/images/aa.webp',
+        }
+
+        self.assertEqual(
+            art_thumbnails_generator.filter_referenced_names(names),
+            {'arts/thumbnails/aa.webp', 'arts/thumbnails/cc.webp'},
+        )
+        self.assertEqual(art_thumbnails_generator.filter_referenced_names(()), set())
+
+    def test_art_deletion_enqueues_image_and_thumbnails(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            self.art.delete()
+
+        names = set(MediaFileDeletion.objects.values_list('name', flat=True))
+        self.assertEqual(names, {'arts/images/test.png', 'arts/thumbnails/aa.webp', 'arts/thumbnails/bb.webp'})
+        # Копия и изображение, общие с другим артом, не будут удалены из хранилища.
+        self.assertEqual(
+            media_deletion_queue.get_referenced_names(names),
+            {'arts/images/test.png', 'arts/thumbnails/bb.webp'},
+        )
+
+
+class ArtDuplicatesTests(APITestCase):
+    def setUp(self) -> None:
+        self.service = ArtDuplicatesService()
+        self.author = User.objects.create_user('author')
+        self.image = Image.effect_mandelbrot((256, 192), (-2, -1.2, 1, 1.2), 64).convert('RGB')
+
+    def create_art_with_hash(self, image_hash: int) -> Art:
+        return create_art(
+            self.author,
+            image_hash=image_hash - (1 << 64) if image_hash >= 1 << 63 else image_hash,
+            image_hash_chunks=self.service.get_hash_chunks(image_hash),
+        )
+
+    @staticmethod
+    def to_png(image: Image.Image) -> SimpleUploadedFile:
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG')
+        return SimpleUploadedFile('art.png', buffer.getvalue(), content_type='image/png')
+
+    def test_hash_of_gradients(self) -> None:
+        # Яркость растет слева направо: ни один пиксель не ярче соседа справа.
+        gradient = Image.linear_gradient('L').rotate(90)
+
+        self.assertEqual(self.service.compute_hash(gradient), 0)
+        self.assertEqual(self.service.compute_hash(ImageOps.mirror(gradient)), (1 << 64) - 1)
+
+    def test_distance_of_resized_and_changed_images(self) -> None:
+        image_hash = self.service.compute_hash(self.image)
+        resized_hash = self.service.compute_hash(self.image.resize((128, 96)))
+        mirrored_hash = self.service.compute_hash(ImageOps.mirror(self.image))
+
+        self.assertLessEqual((image_hash ^ resized_hash).bit_count(), self.service.MAX_DISTANCE)
+        self.assertGreater((image_hash ^ mirrored_hash).bit_count(), self.service.MAX_DISTANCE)
+
+    def test_find_duplicates_by_distance(self) -> None:
+        # Старший бит установлен: в БД хэш хранится отрицательным числом.
+        image_hash = (1 << 63) | 0x0123_4567_89ab_cdef
+        max_distance = self.service.MAX_DISTANCE
+        # Отличающиеся биты в разных частях хэша.
+        flips = [sum(1 << (bit * 16 + 3) for bit in range(distance)) for distance in range(max_distance + 2)]
+        arts = [self.create_art_with_hash(image_hash ^ flip) for flip in flips]
+        # Совпадает с хэшем в трех частях из четырех, но расстояние больше допустимого.
+        self.create_art_with_hash(image_hash ^ ((1 << (max_distance + 1)) - 1))
+        self.create_art_with_hash(~image_hash & ((1 << 64) - 1))
+
+        duplicates = self.service.find_duplicates(image_hash)
+        self.assertEqual([art.pk for art in duplicates], [art.pk for art in arts[:max_distance + 1]])
+        self.assertEqual([art.hamming_distance for art in duplicates], list(range(max_distance + 1)))
+
+        duplicates = self.service.find_duplicates(image_hash, exclude_pk=arts[0].pk, limit=1)
+        self.assertEqual([art.pk for art in duplicates], [arts[1].pk])
+
+    def test_duplicates_endpoint(self) -> None:
+        art = create_art(self.author, **self.service.get_hash_fields(self.image))
+        duplicate = create_art(self.author, **self.service.get_hash_fields(self.image.resize((128, 96))))
+        create_art(self.author, **self.service.get_hash_fields(ImageOps.mirror(self.image)))
+
+        response = self.client.get(f'/api/v1/arts/{art.pk}/duplicates/')
+        self.assertEqual([item['id'] for item in response.data], [duplicate.pk])
+
+    @override_settings(ARTS_DUPLICATES_REJECT_ON_UPLOAD=True)
+    def test_upload_of_duplicate_is_rejected(self) -> None:
+        create_art(self.author, **self.service.get_hash_fields(self.image))
+
+        serializer = CreateArtSerializer(data={'image': self.to_png(self.image.resize((128, 96)))})
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('image', serializer.errors)
+
+        serializer = CreateArtSerializer(data={'image': self.to_png(ImageOps.mirror(self.image))})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_upload_of_duplicate_is_allowed_by_default(self) -> None:
+        create_art(self.author, **self.service.get_hash_fields(self.image))
+
+        serializer = CreateArtSerializer(data={'image': self.to_png(self.image)})
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+
+
+class ArtTagStatsTests(ArtsAPITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.service = ArtTagsService()
+        self.author = User.objects.create_user('author')
+        self.arts = [
+            self.create_art_with_tags(['cat', 'cats', 'dog']),
+            # Повтор тэга в одном арте считается один раз.
+            self.create_art_with_tags(['cat', 'cat']),
+            self.create_art_with_tags(['cat', 'bird']),
+            self.create_art_with_tags([]),
+        ]
+
+    def create_art_with_tags(self, tags: list[str]) -> Art:
+        art = create_art(self.author, tags=tags)
+        self.service.add_art(art)
+        return art
+
+    def get_counts(self) -> dict[str, int]:
+        return dict(ArtTagStats.objects.values_list('tag', 'arts_count'))
+
+    def test_add_art(self) -> None:
+        self.assertEqual(self.get_counts(), {'cat': 3, 'cats': 1, 'dog': 1, 'bird': 1})
+        self.assertEqual(ArtTagStats.objects.get(tag='cat').last_used_at, self.arts[2].created_at)
+
+    def test_remove_art_via_api(self) -> None:
+        self.client.force_authenticate(self.author)
+        for art in self.arts[:2]:
+            response = self.client.delete(f'/api/v1/arts/{art.pk}/')
+            self.assertEqual(response.status_code, 204)
+
+        # Тэги без артов удаляются.
+        self.assertEqual(self.get_counts(), {'cat': 1, 'bird': 1})
+
+    def test_rebuild_matches_incremental_counts(self) -> None:
+        counts = self.get_counts()
+        ArtTagStats.objects.update(arts_count=100)
+
+        self.assertEqual(self.service.rebuild(), len(counts))
+        self.assertEqual(self.get_counts(), counts)
+
+    def test_popular_tags(self) -> None:
+        response = self.client.get('/api/v1/arts/tags/?limit=3')
+
+        self.assertEqual(
+            [(tag['tag'], tag['arts_count']) for tag in response.data],
+            [('cat', 3), ('bird', 1), ('cats', 1)],
+        )
+
+    def test_autocomplete(self) -> None:
+        response = self.client.get('/api/v1/arts/tags/autocomplete/?prefix=ca')
+        self.assertEqual([tag['tag'] for tag in response.data], ['cat', 'cats'])
+
+        # Символы шаблона LIKE в префиксе экранируются.
+        response = self.client.get('/api/v1/arts/tags/autocomplete/?prefix=c_t')
+        self.assertEqual(response.data, [])
+
+
+class ArtPopularityRefreshTests(APITestCase):
+    def setUp(self) -> None:
+        self.service = ArtPopularityService()
+        author = User.objects.create_user('author')
+        self.old_art, self.changed_art, self.recent_art = [create_art(author) for _ in range(3)]
+        Art.objects.filter(pk__in=(self.old_art.pk, self.changed_art.pk)).update(
+            created_at=timezone.now() - timedelta(days=30),
+        )
+        self.assertEqual(self.service.refresh(), 3)
+
+    def get_refreshed_at(self) -> dict[int, Any]:
+        return dict(ArtPopularity.objects.values_list('art_id', 'refreshed_at'))
+
+    def test_changed_only(self) -> None:
+        refreshed_at = self.get_refreshed_at()
+        Art.objects.filter(pk=self.changed_art.pk).update(likes_count=5)
+
+        # Старый арт без изменений не пересчитывается, свежий - всегда.
+        self.assertEqual(self.service.refresh(changed_only=True), 2)
+
+        new_refreshed_at = self.get_refreshed_at()
+        self.assertEqual(new_refreshed_at[self.old_art.pk], refreshed_at[self.old_art.pk])
+        self.assertNotEqual(new_refreshed_at[self.changed_art.pk], refreshed_at[self.changed_art.pk])
+        self.assertEqual(ArtPopularity.objects.get(art=self.changed_art).likes_count, 5)
+
+    def test_changed_only_adds_missing_arts(self) -> None:
+        ArtPopularity.objects.filter(art=self.old_art).delete()
+
+        self.assertEqual(self.service.refresh(art_pks=[self.old_art.pk], changed_only=True), 1)
+        self.assertTrue(ArtPopularity.objects.filter(art=self.old_art).exists())
+
+
+class ArtRelatedTests(ArtsAPITestCase):
+    TAGS = (
+        ['cat', 'dog'],
+        ['cat', 'dog', 'bird'],
+        ['cat', 'fish'],
+        ['cat', 'dog'],
+        ['bird', 'fish'],
+        ['cat'],
+        [],
+    )
+
+    def setUp(self) -> None:
+        super().setUp()
+        patcher = mock.patch.object(ArtRelatedService, 'RELATED_COUNT', 2)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Арты добавляются по одному, как при публикации.
+        self.service = ArtRelatedService()
+        author = User.objects.create_user('author')
+        self.arts = []
+        for tags in self.TAGS:
+            art = create_art(author, tags=tags)
+            ArtTagsService().add_art(art)
+            self.service.add_art(art)
+            self.arts.append(art)
+
+    def get_lists(self) -> dict[int, list[int]]:
+        lists: dict[int, list[int]] = {}
+        for art_pk, related_art_pk in (
+            ArtRelation.objects
+            .order_by('art_id', '-score', '-related_art_id')
+            .values_list('art_id', 'related_art_id')
+        ):
+            lists.setdefault(art_pk, []).append(related_art_pk)
+        return lists
+
+    def test_add_art_matches_refresh(self) -> None:
+        lists = self.get_lists()
+
+        self.assertEqual(self.service.refresh(batch_size=2), len(self.arts))
+        # Веса тэгов меняются с каждым новым артом, поэтому порядок артов с близким
+        # сходством может отличаться, но состав списков должен совпадать.
+        self.assertEqual(
+            {art_pk: set(related_art_pks) for art_pk, related_art_pks in lists.items()},
+            {art_pk: set(related_art_pks) for art_pk, related_art_pks in self.get_lists().items()},
+        )
+
+    def test_lists_are_trimmed(self) -> None:
+        lists = self.get_lists()
+
+        self.assertEqual(max(map(len, lists.values())), ArtRelatedService.RELATED_COUNT)
+        self.assertNotIn(self.arts[-1].pk, lists)
+
+    def test_endpoint_order(self) -> None:
+        self.service.refresh()
+        art = self.arts[0]
+
+        response = self.client.get(f'/api/v1/arts/{art.pk}/related/')
+
+        # Тот же набор тэгов похож больше, чем надмножество.
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([art['id'] for art in response.data], [self.arts[3].pk, self.arts[1].pk])
+
+
+class FastArtSerializersTests(ArtsAPITestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.user = User.objects.create_user('user')
+        author = User.objects.create_user('author')
+        thumbnails = [
+            {'width': width, 'format': format_name, 'name': f'arts/thumbnails/{width}.{format_name}'}
+            for width in (320, 640)
+            for format_name in ('webp', 'jpeg')
+        ]
+        arts = [
+            create_art(author, thumbnails=thumbnails, description='Описание', tags=['тэг', 'tag'], for_sale=True),
+            create_art(author, image='arts/images/with space.png'),
+            create_art(self.user, image_width=640, image_height=480, dominant_color='#aabbcc'),
+        ]
+        ArtLikesService(self.user).like_art(arts[0].pk)
+        ArtCommentsService(self.user).create_comment(arts[0].pk, 'text')
+        self.queryset = Art.objects.select_related('author').order_by('-created_at', '-id')
+        self.request = Request(APIRequestFactory().get('/'))
+
+    def render(self, data: Any) -> bytes:
+        return JSONRenderer().render(data)
+
+    def test_anonymous_json_is_equal(self) -> None:
+        context = {'request': self.request}
+        data = ShortRetrieveArtSerializer(list(self.queryset), many=True, context=context).data
+
+        serializer = FastShortRetrieveArtSerializer(context=context)
+        fast_data = serializer.to_representation_many(serializer.get_rows(self.queryset))
+
+        self.assertEqual(self.render(fast_data), self.render(data))
+
+    def test_authorized_json_is_equal(self) -> None:
+        context = {'request': self.request}
+        likes_service = ArtLikesService(self.user)
+        arts = list(self.queryset)
+        likes_service.mark_liked_arts(arts)
+        data = ShortRetrieveArtForAuthorizedUserSerializer(arts, many=True, context=context).data
+
+        serializer = FastShortRetrieveArtForAuthorizedUserSerializer(context=context)
+        rows = list(serializer.get_rows(self.queryset))
+        likes_service.mark_liked_art_rows(rows)
+        fast_data = serializer.to_representation_many(rows)
+
+        self.assertEqual(self.render(fast_data), self.render(data))
+        self.assertEqual([art['liked_authorized_user'] for art in fast_data], [False, False, True])
+
+    def test_feed_matches_serializer(self) -> None:
+        for user in (None, self.user):
+            self.client.force_authenticate(user)
+            serializer_class = ShortRetrieveArtSerializer
+            arts = list(self.queryset)
+            if user is not None:
+                serializer_class = ShortRetrieveArtForAuthorizedUserSerializer
+                ArtLikesService(user).mark_liked_arts(arts)
+
+            response = self.client.get('/api/v1/arts/new/?cursor=')
+            data = serializer_class(arts, many=True, context={'request': response.wsgi_request}).data
+            self.assertEqual(self.render(response.data['results']), self.render(data))
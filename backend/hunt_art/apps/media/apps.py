@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+from django.utils.translation import gettext_lazy as _
+
+
+class MediaConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.media'
+    verbose_name = _('Медиафайлы')
+
+    def ready(self) -> None:
+        from apps.media.services.deletion_queue import media_deletion_queue
+
+        # Файлы из файловых полей всех моделей удаляются вместе с записями.
+        media_deletion_queue.register_file_fields()
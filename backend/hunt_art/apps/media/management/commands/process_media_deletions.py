@@ -0,0 +1,43 @@
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.core.management.base import (
+    BaseCommand,
+    CommandParser,
+)
+
+from apps.media.services.deletion_queue import media_deletion_queue
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет медиафайлы из очереди отложенного удаления пачками. '
+        'С флагом --loop работает как фоновый процесс и проверяет очередь периодически.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Обрабатывать очередь бесконечно с интервалом --interval.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.MEDIA_DELETION_INTERVAL,
+            help='Интервал проверки пустой очереди в секундах.',
+        )
+
+    def handle(self, *args, loop: bool, interval: float, **options) -> None:
+        while True:
+            close_old_connections()
+            processed_count = 0
+            while batch_count := media_deletion_queue.drain():
+                processed_count += batch_count
+            if processed_count > 0 or not loop:
+                self.stdout.write(f'Обработано записей очереди удаления: {processed_count}')
+
+            if not loop:
+                break
+            time.sleep(interval)
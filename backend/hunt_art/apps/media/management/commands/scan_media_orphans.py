@@ -0,0 +1,81 @@
+import os
+import time
+from typing import Iterator
+
+from django.conf import settings
+from django.core.management.base import (
+    BaseCommand,
+    CommandParser,
+)
+
+from apps.media.services.deletion_queue import media_deletion_queue
+
+
+class Command(BaseCommand):
+    help = (
+        'Ищет в MEDIA_ROOT файлы, на которые не ссылается ни одна запись в БД. '
+        'Каталог обходится потоково и сверяется с БД пачками, поэтому память не зависит '
+        'от количества файлов. С флагом --delete сироты добавляются в очередь удаления.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--delete',
+            action='store_true',
+            help='Добавить найденные файлы в очередь отложенного удаления.',
+        )
+        parser.add_argument(
+            '--min-age',
+            type=int,
+            default=24 * 60 * 60,
+            help=(
+                'Минимальный возраст файла в секундах. Более новые файлы пропускаются: '
+                'запись со ссылкой на них может быть еще не закоммичена.'
+            ),
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество файлов, сверяемых с БД за раз.',
+        )
+
+    def handle(self, *args, delete: bool, min_age: int, batch_size: int, **options) -> None:
+        if not os.path.isdir(settings.MEDIA_ROOT):
+            self.stdout.write(self.style.WARNING(f'Каталог {settings.MEDIA_ROOT} не найден.'))
+            return
+
+        max_modified_time = time.time() - min_age
+        orphans_count = 0
+        batch: list[str] = []
+        for name in self._iter_names(str(settings.MEDIA_ROOT), max_modified_time):
+            batch.append(name)
+            if len(batch) >= batch_size:
+                orphans_count += self._process_batch(batch, delete)
+                batch = []
+        if batch:
+            orphans_count += self._process_batch(batch, delete)
+
+        action = 'Добавлено в очередь удаления' if delete else 'Найдено файлов-сирот'
+        self.stdout.write(self.style.SUCCESS(f'{action}: {orphans_count}'))
+
+    def _process_batch(self, names: list[str], delete: bool) -> int:
+        referenced_names = media_deletion_queue.get_referenced_names(names)
+        orphans = [name for name in names if name not in referenced_names]
+        for name in orphans:
+            self.stdout.write(name)
+        if delete:
+            media_deletion_queue.enqueue(orphans)
+
+        return len(orphans)
+
+    def _iter_names(self, directory: str, max_modified_time: float, prefix: str = '') -> Iterator[str]:
+        """Имена файлов относительно MEDIA_ROOT в формате хранилища"""
+
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                name = f'{prefix}{entry.name}'
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._iter_names(entry.path, max_modified_time, f'{name}/')
+                elif entry.is_file(follow_symlinks=False) and entry.stat().st_mtime <= max_modified_time:
+                    yield name
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.3 on 2026-10-18 08:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="MediaFileDeletion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        max_length=255,
+                        unique=True,
+                        verbose_name="Имя файла в хранилище",
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(
+                        auto_now_add=True,
+                        db_index=True,
+                        verbose_name="Дата добавления в очередь",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Удаление медиафайла",
+                "verbose_name_plural": "Удаление медиафайлов",
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class MediaFileDeletion(models.Model):
+    """
+    Медиафайл в очереди на удаление.
+
+    Записи добавляются после коммита транзакции, в которой удалены ссылавшиеся
+    на файл записи, а удаляет файлы фоновый процесс (см. MediaDeletionQueue).
+    Так запрос на удаление не ждет файловую систему.
+    """
+
+    name = models.CharField(
+        max_length=255,
+        unique=True,
+        verbose_name=_('Имя файла в хранилище'),
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        db_index=True,
+        verbose_name=_('Дата добавления в очередь'),
+    )
+
+    class Meta:
+        verbose_name = _('Удаление медиафайла')
+        verbose_name_plural = _('Удаление медиафайлов')
+
+    def __str__(self) -> str:
+        return f'Deletion {self.name}'
@@ -0,0 +1,6 @@
+from django.conf import settings
+
+from .service import MediaDeletionQueue
+
+
+media_deletion_queue = MediaDeletionQueue(batch_size=settings.MEDIA_DELETION_BATCH_SIZE)
@@ -0,0 +1,167 @@
+import logging
+from typing import (
+    Any,
+    Type,
+    Callable,
+    Iterable,
+    Collection,
+)
+
+from django.apps import apps
+from django.db import (
+    models,
+    transaction,
+)
+from django.db.models.signals import post_delete
+from django.core.files.storage import (
+    Storage,
+    default_storage,
+)
+
+from apps.media.models import MediaFileDeletion
+
+
+logger = logging.getLogger(__name__)
+
+
+class MediaDeletionQueue:
+    """
+    Очередь отложенного удаления медиафайлов.
+
+    При удалении записи (в том числе каскадном) имена ее файлов после коммита
+    транзакции попадают в очередь в БД, а сами файлы удаляет фоновый процесс
+    пачками (см. команду `process_media_deletions`).
+
+    Хранилище адресуется по содержимому, поэтому один файл может использоваться
+    несколькими записями. Перед удалением проверяется, что ссылок на файл не осталось
+    и что файл не был сохранен заново после попадания в очередь.
+
+    Места, где хранятся имена файлов, регистрируются через `register`: файловые
+    поля моделей регистрируются автоматически, остальные (например, имена
+    в JSON-полях) - приложениями, которым они принадлежат.
+    """
+
+    def __init__(self, batch_size: int, storage: Storage = default_storage) -> None:
+        self.batch_size = batch_size
+        self.storage = storage
+        self.__sources: list[tuple[
+            Type[models.Model],
+            Callable[[models.Model], Iterable[str]],
+            Callable[[Collection[str]], Iterable[str]],
+        ]] = []
+
+    def register(
+        self,
+        model: Type[models.Model],
+        get_names: Callable[[models.Model], Iterable[str]],
+        filter_referenced_names: Callable[[Collection[str]], Iterable[str]],
+    ) -> None:
+        """
+        Регистрация места хранения имен файлов.
+
+        :param get_names: Имена файлов записи модели.
+        :param filter_referenced_names: Имена из переданных, на которые есть ссылки в БД.
+        """
+
+        self.__sources.append((model, get_names, filter_referenced_names))
+        post_delete.connect(
+            self._on_delete,
+            sender=model,
+            dispatch_uid=f'media_deletion_queue_{model._meta.label_lower}',
+        )
+
+    def register_file_fields(self) -> None:
+        for model in apps.get_models():
+            for field in model._meta.get_fields():
+                if isinstance(field, models.FileField) and field.model is model:
+                    self.register(
+                        model,
+                        get_names=self._make_file_field_names_getter(field.attname),
+                        filter_referenced_names=self._make_file_field_filter(model, field.attname),
+                    )
+
+    def enqueue(self, names: Iterable[str]) -> None:
+        """Добавление файлов в очередь после коммита текущей транзакции"""
+
+        names = {name for name in names if name}
+        if not names:
+            return
+
+        transaction.on_commit(lambda: MediaFileDeletion.objects.bulk_create(
+            [MediaFileDeletion(name=name) for name in names],
+            ignore_conflicts=True,
+        ))
+
+    def get_referenced_names(self, names: Collection[str]) -> set[str]:
+        referenced_names: set[str] = set()
+        for _, _, filter_referenced_names in self.__sources:
+            referenced_names.update(filter_referenced_names(names))
+
+        return referenced_names
+
+    def drain(self) -> int:
+        """
+        Удаление одной пачки файлов из очереди.
+
+        Пачка блокируется с `SKIP LOCKED`, поэтому обработчиков может быть несколько.
+
+        :return: Количество обработанных записей очереди.
+        """
+
+        with transaction.atomic():
+            entries = list(
+                MediaFileDeletion.objects
+                .select_for_update(skip_locked=True)
+                .order_by('created_at')[:self.batch_size]
+            )
+            if not entries:
+                return 0
+
+            referenced_names = self.get_referenced_names([entry.name for entry in entries])
+            for entry in entries:
+                if entry.name in referenced_names or self._is_saved_again(entry):
+                    continue
+                try:
+                    self.storage.delete(entry.name)
+                except OSError:
+                    # Файл останется сиротой, его найдет команда `scan_media_orphans`.
+                    logger.exception('Не удалось удалить медиафайл %s.', entry.name)
+
+            MediaFileDeletion.objects.filter(pk__in=[entry.pk for entry in entries]).delete()
+
+        return len(entries)
+
+    def _is_saved_again(self, entry: MediaFileDeletion) -> bool:
+        # Хранилище обновляет дату изменения файла, когда такое же содержимое
+        # сохраняется повторно (см. ContentAddressedStorage), а запись
+        # со ссылкой на него еще может быть не закоммичена.
+        try:
+            return self.storage.get_modified_time(entry.name) > entry.created_at
+        except (OSError, NotImplementedError):
+            return False
+
+    def _on_delete(self, sender: Type[models.Model], instance: models.Model, **kwargs: Any) -> None:
+        names: list[str] = []
+        for model, get_names, _ in self.__sources:
+            if model is sender:
+                names.extend(get_names(instance))
+
+        self.enqueue(names)
+
+    @staticmethod
+    def _make_file_field_names_getter(attname: str) -> Callable[[models.Model], list[str]]:
+        def get_names(instance: models.Model) -> list[str]:
+            return [getattr(instance, attname).name]
+
+        return get_names
+
+    @staticmethod
+    def _make_file_field_filter(model: Type[models.Model], attname: str) -> Callable[[Collection[str]], Iterable[str]]:
+        def filter_referenced_names(names: Collection[str]) -> Iterable[str]:
+            return (
+                model._default_manager
+                .filter(**{f'{attname}__in': names})
+                .values_list(attname, flat=True)
+            )
+
+        return filter_referenced_names
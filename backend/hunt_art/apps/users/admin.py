@@ -4,6 +4,7 @@ from . import models
 
 
 admin.site.register(models.User)
+admin.site.register(models.UserRecommendation)
 
 
 class PriceListImageInline(admin.TabularInline):
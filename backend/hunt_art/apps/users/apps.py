@@ -7,3 +7,9 @@ class UsersConfig(AppConfig):
     name = 'apps.users'
     label = 'users'
     verbose_name = _('Пользователи')
+
+    def ready(self) -> None:
+        from apps.users.services.cards import user_cards_cache
+
+        # Карточки пользователей сбрасываются при любом изменении пользователя и профиля.
+        user_cards_cache.connect_signals()
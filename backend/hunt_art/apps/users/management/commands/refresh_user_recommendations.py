@@ -0,0 +1,51 @@
+import time
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.core.management.base import (
+    BaseCommand,
+    CommandParser,
+)
+
+from apps.users.services.recommendations import UserRecommendationsService
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает рекомендации "на кого подписаться" по графу подписок и лайков. '
+        'С флагом --loop работает как фоновый процесс и пересчитывает рекомендации периодически.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help='Пересчитывать рекомендации бесконечно с интервалом --interval.',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=settings.USERS_RECOMMENDATIONS_REFRESH_INTERVAL,
+            help='Интервал между пересчетами в секундах.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Количество пользователей, рекомендации которых пересчитываются в одной транзакции.',
+        )
+
+    def handle(self, *args, loop: bool, interval: float, batch_size: int, **options) -> None:
+        service = UserRecommendationsService()
+        while True:
+            close_old_connections()
+            started_at = time.monotonic()
+            refreshed_count = service.refresh(batch_size=batch_size)
+            self.stdout.write(
+                f'Пересчитаны рекомендации пользователей: {refreshed_count} '
+                f'за {time.monotonic() - started_at:.1f} с'
+            )
+
+            if not loop:
+                break
+            time.sleep(interval)
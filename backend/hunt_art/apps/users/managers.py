@@ -4,6 +4,9 @@ from typing import (
 )
 
 from django.apps import apps
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import UserManager as DefaultUserManager
 
@@ -87,21 +90,49 @@ class UserManager(DefaultUserManager):
     def exists(self, pk: Any) -> bool:
         return models.User.objects.filter(pk=pk).exists()
     
-    def add_subscription(self, subscriber_pk: Any, other_user_pk: Any) -> None:
+    def add_subscription(self, subscriber_pk: Any, other_user_pk: Any) -> int:
+        """Подписка на пользователя. Возвращает новое количество его подписчиков"""
+
         model_name = models.User._meta.model_name
         new_subscription_data = {
             f'from_{model_name}_id': subscriber_pk,
             f'to_{model_name}_id': other_user_pk,
         }
-        models.User.subscriptions.through.objects.create(**new_subscription_data)
+        with transaction.atomic():
+            models.User.subscriptions.through.objects.create(**new_subscription_data)
+            models.User.objects.filter(pk=other_user_pk).update(
+                followers_count=F('followers_count') + 1,
+                updated_at=timezone.now(),
+            )
+            models.User.objects.filter(pk=subscriber_pk).update(updated_at=timezone.now())
+            return self._get_followers_count(other_user_pk)
+
+    def remove_subscription(self, subscriber_pk: Any, other_user_pk: Any) -> int:
+        """Отписка от пользователя. Возвращает новое количество его подписчиков"""
 
-    def remove_subscription(self, subscriber_pk: Any, other_user_pk: Any) -> None:        
         model_name = models.User._meta.model_name
         subscription_info = {
             f'from_{model_name}_id': subscriber_pk,
             f'to_{model_name}_id': other_user_pk,
         }
-        models.User.subscriptions.through.objects.filter(**subscription_info).delete()
+        with transaction.atomic():
+            deleted_count, _ = (
+                models.User.subscriptions.through.objects
+                .filter(**subscription_info)
+                .delete()
+            )
+            if deleted_count > 0:
+                models.User.objects.filter(pk=other_user_pk).update(
+                    followers_count=F('followers_count') - deleted_count,
+                    updated_at=timezone.now(),
+                )
+                models.User.objects.filter(pk=subscriber_pk).update(updated_at=timezone.now())
+            return self._get_followers_count(other_user_pk)
+
+    def _get_followers_count(self, user_pk: Any) -> int:
+        # Читается в той же транзакции после UPDATE, строка уже заблокирована,
+        # поэтому значение согласовано с только что сделанным изменением.
+        return models.User.objects.filter(pk=user_pk).values_list('followers_count', flat=True).get()
 
     def user_is_follower_other_user(self, user_pk: Any, other_user_pk: Any) -> bool:
         model_name = models.User._meta.model_name
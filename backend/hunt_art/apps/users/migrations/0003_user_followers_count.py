@@ -0,0 +1,40 @@
+# Generated by Django 5.0.3 on 2026-10-18 08:31
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_followers_count(apps, schema_editor):
+    User = apps.get_model("users", "User")
+    Subscription = User.subscriptions.through
+    User.objects.update(
+        followers_count=Coalesce(
+            Subquery(
+                Subscription.objects.filter(to_user_id=OuterRef("pk"))
+                .order_by()
+                .values("to_user_id")
+                .annotate(count=Count("pk"))
+                .values("count")
+            ),
+            0,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_alter_userprofile_options"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="followers_count",
+            field=models.PositiveIntegerField(
+                default=0, verbose_name="Количество подписчиков"
+            ),
+        ),
+        migrations.RunPython(fill_followers_count, migrations.RunPython.noop),
+    ]
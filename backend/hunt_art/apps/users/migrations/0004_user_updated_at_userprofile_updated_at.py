@@ -0,0 +1,34 @@
+# Generated by Django 5.0.3 on 2026-10-18 12:10
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_user_followers_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                default=django.utils.timezone.now,
+                verbose_name="Дата обновления",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                default=django.utils.timezone.now,
+                verbose_name="Дата обновления",
+            ),
+            preserve_default=False,
+        ),
+    ]
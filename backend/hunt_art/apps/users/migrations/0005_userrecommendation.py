@@ -0,0 +1,66 @@
+# Generated by Django 5.0.3 on 2026-10-18 09:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_user_updated_at_userprofile_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserRecommendation",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField(verbose_name="Оценка рекомендации")),
+                (
+                    "recommended_user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recommended_to",
+                        related_query_name="recommended_to",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Рекомендуемый пользователь",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recommendations",
+                        related_query_name="recommendation",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Пользователь",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Рекомендация пользователя",
+                "verbose_name_plural": "Рекомендации пользователей",
+                "indexes": [
+                    models.Index(
+                        fields=["user", "-score", "-recommended_user"],
+                        name="users_userr_user_id_85688b_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="userrecommendation",
+            constraint=models.UniqueConstraint(
+                fields=("user", "recommended_user"), name="unique_user_recommended_user"
+            ),
+        ),
+    ]
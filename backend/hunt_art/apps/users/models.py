@@ -47,6 +47,16 @@ class User(AbstractBaseUser, PermissionsMixin):
         related_query_name='subscription',
         verbose_name=_('Подписки'),
     )
+    followers_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name=_('Количество подписчиков'),
+    )
+    # Версия данных пользователя для условных запросов. Кроме сохранения
+    # модели обновляется при изменении подписок (см. UserManager).
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('Дата обновления'),
+    )
 
     objects: managers.UserManager = managers.UserManager()
 
@@ -87,6 +97,10 @@ class UserProfile(models.Model):
         null=True,
         verbose_name=_('Обои'),
     )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        verbose_name=_('Дата обновления'),
+    )
 
     class Meta:
         verbose_name = _('Профиль пользователя')
@@ -116,3 +130,46 @@ class PriceListImage(models.Model):
 
     def __str__(self) -> str:
         return f'Price list Profile #{self.profile.pk}'
+
+
+class UserRecommendation(models.Model):
+    """
+    Рекомендация подписаться на пользователя.
+
+    Списки рекомендаций рассчитываются периодически по графу подписок и лайков
+    (см. UserRecommendationsService), поэтому читаются по индексу.
+    """
+
+    user = models.ForeignKey(
+        to=User,
+        on_delete=models.CASCADE,
+        related_name='recommendations',
+        related_query_name='recommendation',
+        verbose_name=_('Пользователь'),
+    )
+    recommended_user = models.ForeignKey(
+        to=User,
+        on_delete=models.CASCADE,
+        related_name='recommended_to',
+        related_query_name='recommended_to',
+        verbose_name=_('Рекомендуемый пользователь'),
+    )
+    score = models.FloatField(
+        verbose_name=_('Оценка рекомендации'),
+    )
+
+    class Meta:
+        verbose_name = _('Рекомендация пользователя')
+        verbose_name_plural = _('Рекомендации пользователей')
+        constraints = (
+            models.UniqueConstraint(
+                fields=('user', 'recommended_user'),
+                name='unique_user_recommended_user',
+            ),
+        )
+        indexes = (
+            models.Index(fields=('user', '-score', '-recommended_user')),
+        )
+
+    def __str__(self) -> str:
+        return f'Recommendation User#{self.user_id} -> User#{self.recommended_user_id}'
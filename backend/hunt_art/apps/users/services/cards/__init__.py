@@ -0,0 +1,9 @@
+from django.conf import settings
+
+from .service import (
+    UserCard,
+    UserCardsCache,
+)
+
+
+user_cards_cache = UserCardsCache(timeout=settings.USERS_CARDS_CACHE_TIMEOUT)
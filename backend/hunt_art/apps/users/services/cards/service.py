@@ -0,0 +1,109 @@
+from typing import (
+    Any,
+    TypedDict,
+    Iterable,
+)
+
+from django.db import (
+    models,
+    transaction,
+)
+from django.db.models.signals import (
+    post_save,
+    post_delete,
+)
+from django.core.cache import (
+    caches,
+    BaseCache,
+)
+from django.core.files.storage import default_storage
+
+from apps.users.models import (
+    User,
+    UserProfile,
+)
+
+
+class UserCard(TypedDict):
+    id: int
+    username: str
+    # Ссылка хранилища (без хоста), абсолютной ее делает сериализатор.
+    avatar: str | None
+
+
+class UserCardsCache:
+    """
+    Кэш карточек пользователей: id, имя и ссылка на аватар.
+
+    Карточки авторов, комментаторов и собеседников нужны в ответах постоянно
+    и для одних и тех же активных пользователей, поэтому ссылка на аватар
+    вычисляется хранилищем один раз и хранится в кэше. Карточки списка
+    читаются одним `get_many`, отсутствующие - одним запросом к БД.
+
+    Карточка сбрасывается при любом сохранении или удалении пользователя
+    и его профиля (см. `connect_signals`). Изменения через `QuerySet.update()`
+    сигналов не отправляют, после них нужно вызывать `invalidate` вручную.
+    """
+
+    def __init__(self, timeout: float | None, cache_alias: str = 'default') -> None:
+        self.timeout = timeout
+        self.cache_alias = cache_alias
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[self.cache_alias]
+
+    def get_many(self, user_pks: Iterable[Any]) -> dict[Any, UserCard]:
+        """Карточки пользователей по id. Несуществующих пользователей в результате нет."""
+
+        keys = {self._make_key(user_pk): user_pk for user_pk in user_pks}
+        if not keys:
+            return {}
+
+        cards: dict[Any, UserCard] = {
+            keys[key]: card
+            for key, card in self.cache.get_many(keys.keys()).items()
+        }
+        missing_pks = [user_pk for user_pk in keys.values() if user_pk not in cards]
+        if missing_pks:
+            loaded_cards = self._load(missing_pks)
+            self.cache.set_many(
+                {self._make_key(user_pk): card for user_pk, card in loaded_cards.items()},
+                timeout=self.timeout,
+            )
+            cards.update(loaded_cards)
+
+        return cards
+
+    def invalidate(self, user_pk: Any) -> None:
+        # Удаляем после коммита, иначе до коммита карточку успеют
+        # закэшировать заново со старыми данными.
+        transaction.on_commit(lambda: self.cache.delete(self._make_key(user_pk)))
+
+    def connect_signals(self) -> None:
+        for model in (User, UserProfile):
+            for signal_name, signal in (('post_save', post_save), ('post_delete', post_delete)):
+                signal.connect(
+                    self._on_change,
+                    sender=model,
+                    dispatch_uid=f'user_cards_cache_{signal_name}_{model._meta.label_lower}',
+                )
+
+    def _on_change(self, sender: type[models.Model], instance: models.Model, **kwargs) -> None:
+        self.invalidate(instance.user_id if isinstance(instance, UserProfile) else instance.pk)
+
+    @staticmethod
+    def _load(user_pks: Iterable[Any]) -> dict[Any, UserCard]:
+        rows = User.objects.filter(pk__in=user_pks).values_list('pk', 'username', 'profile__avatar')
+        return {
+            user_pk: UserCard(
+                id=user_pk,
+                username=username,
+                avatar=default_storage.url(avatar) if avatar else None,
+            )
+            for user_pk, username, avatar in rows
+        }
+
+    @staticmethod
+    def _make_key(user_pk: Any) -> str:
+        return f'user-card:{user_pk}'
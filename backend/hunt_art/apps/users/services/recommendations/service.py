@@ -0,0 +1,189 @@
+from typing import (
+    Any,
+    Iterator,
+    Collection,
+)
+
+from django.conf import settings
+from django.db import (
+    connection,
+    transaction,
+)
+
+from apps.users.models import (
+    User,
+    UserRecommendation,
+)
+from apps.arts.models import (
+    Art,
+    ArtLike,
+)
+
+
+class UserRecommendationsService:
+    """
+    Сервис рекомендаций "на кого подписаться".
+
+    Кандидаты и их оценки - разреженные произведения матриц графа подписок F
+    (кто на кого подписан) и лайков L (сколько лайков пользователь поставил
+    артам автора), посчитанные в БД соединениями с группировкой:
+
+        score(u, c) = FRIENDS_OF_FRIENDS_WEIGHT * (F · F)[u, c]
+                    + LIKED_AUTHORS_WEIGHT * ln(1 + L[u, c])
+                    + FOLLOWEES_LIKED_AUTHORS_WEIGHT * (F · ln(1 + L))[u, c]
+
+    т.е. подписки подписок, авторы, которых пользователь лайкает, и авторы,
+    которых лайкают его подписки. Пользователи с подписками больше
+    `MAX_SUBSCRIPTIONS` промежуточными не считаются, иначе число путей
+    через них растет квадратично.
+
+    Для каждого пользователя хранятся `RECOMMENDATIONS_COUNT` лучших кандидатов
+    (UserRecommendation), списки пересчитываются пачками пользователей
+    командой `refresh_user_recommendations`. Подписки, сделанные после пересчета,
+    исключаются при чтении.
+    """
+
+    FRIENDS_OF_FRIENDS_WEIGHT = 1.0
+    LIKED_AUTHORS_WEIGHT = 1.0
+    FOLLOWEES_LIKED_AUTHORS_WEIGHT = 0.5
+
+    RECOMMENDATIONS_COUNT: int = settings.USERS_RECOMMENDATIONS_COUNT
+    MAX_SUBSCRIPTIONS: int = settings.USERS_RECOMMENDATIONS_MAX_SUBSCRIPTIONS
+
+    def get_recommended_user_pks(self, user_pk: Any) -> list[Any]:
+        """Рекомендации пользователя от лучших одним запросом по индексу"""
+
+        subscriptions_model = User.subscriptions.through
+        user_model_name = User._meta.model_name
+        return list(
+            UserRecommendation.objects
+            .filter(user_id=user_pk)
+            .exclude(recommended_user_id__in=(
+                subscriptions_model.objects
+                .filter(**{f'from_{user_model_name}_id': user_pk})
+                .values(f'to_{user_model_name}_id')
+            ))
+            .order_by('-score', '-recommended_user_id')
+            .values_list('recommended_user_id', flat=True)[:self.RECOMMENDATIONS_COUNT]
+        )
+
+    def refresh(self, user_pks: Collection[Any] | None = None, batch_size: int = 1000) -> int:
+        """
+        Пересчет рекомендаций пачками по `batch_size` пользователей.
+
+        :param user_pks: Пользователи, рекомендации которых нужно пересчитать. По умолчанию - все.
+        :return: Количество пересчитанных пользователей.
+        """
+
+        refreshed_count = 0
+        for batch_pks in self._iter_batches(user_pks, batch_size):
+            with transaction.atomic():
+                UserRecommendation.objects.filter(user_id__in=batch_pks).delete()
+                self._execute(self._get_refresh_sql(), {
+                    'user_pks': batch_pks,
+                    'max_subscriptions': self.MAX_SUBSCRIPTIONS,
+                    'friends_of_friends_weight': self.FRIENDS_OF_FRIENDS_WEIGHT,
+                    'liked_authors_weight': self.LIKED_AUTHORS_WEIGHT,
+                    'followees_liked_authors_weight': self.FOLLOWEES_LIKED_AUTHORS_WEIGHT,
+                    'recommendations_count': self.RECOMMENDATIONS_COUNT,
+                })
+            refreshed_count += len(batch_pks)
+
+        return refreshed_count
+
+    def _get_refresh_sql(self) -> str:
+        user_model_name = User._meta.model_name
+        subscriptions_table = User.subscriptions.through._meta.db_table
+        subscriber_column = f'from_{user_model_name}_id'
+        subscription_column = f'to_{user_model_name}_id'
+        return f'''
+            WITH followed AS (
+                SELECT {subscriber_column} AS user_id, {subscription_column} AS followed_id
+                FROM {subscriptions_table}
+                WHERE {subscriber_column} = ANY(%(user_pks)s)
+            ),
+            intermediate AS (
+                -- Все подписки, в т.ч. без своих подписок (их лайки тоже учитываются),
+                -- кроме подписанных на слишком многих.
+                SELECT DISTINCT followed_id AS user_id
+                FROM followed
+                WHERE followed_id NOT IN (
+                    SELECT {subscriber_column}
+                    FROM {subscriptions_table}
+                    WHERE {subscriber_column} IN (SELECT followed_id FROM followed)
+                    GROUP BY {subscriber_column}
+                    HAVING COUNT(*) > %(max_subscriptions)s
+                )
+            ),
+            liked_authors AS (
+                SELECT art_like.user_id, art.author_id, LN(1 + COUNT(*)) AS weight
+                FROM {ArtLike._meta.db_table} AS art_like
+                INNER JOIN {Art._meta.db_table} AS art ON art.id = art_like.art_id
+                WHERE art_like.user_id = ANY(%(user_pks)s)
+                    OR art_like.user_id IN (SELECT user_id FROM intermediate)
+                GROUP BY art_like.user_id, art.author_id
+            ),
+            candidates AS (
+                SELECT followed.user_id, subscription.{subscription_column} AS candidate_id,
+                    COUNT(*) * %(friends_of_friends_weight)s AS score
+                FROM followed
+                INNER JOIN intermediate ON intermediate.user_id = followed.followed_id
+                INNER JOIN {subscriptions_table} AS subscription
+                    ON subscription.{subscriber_column} = followed.followed_id
+                GROUP BY followed.user_id, subscription.{subscription_column}
+                UNION ALL
+                SELECT user_id, author_id, weight * %(liked_authors_weight)s
+                FROM liked_authors
+                WHERE user_id = ANY(%(user_pks)s)
+                UNION ALL
+                SELECT followed.user_id, liked_authors.author_id,
+                    SUM(liked_authors.weight) * %(followees_liked_authors_weight)s
+                FROM followed
+                INNER JOIN intermediate ON intermediate.user_id = followed.followed_id
+                INNER JOIN liked_authors ON liked_authors.user_id = followed.followed_id
+                GROUP BY followed.user_id, liked_authors.author_id
+            ),
+            scores AS (
+                SELECT user_id, candidate_id, SUM(score) AS score
+                FROM candidates
+                WHERE candidate_id <> user_id
+                    AND NOT EXISTS (
+                        SELECT 1
+                        FROM followed
+                        WHERE followed.user_id = candidates.user_id
+                            AND followed.followed_id = candidates.candidate_id
+                    )
+                GROUP BY user_id, candidate_id
+            )
+            INSERT INTO {UserRecommendation._meta.db_table} (user_id, recommended_user_id, score)
+            SELECT user_id, candidate_id, score
+            FROM (
+                SELECT
+                    *,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY user_id
+                        ORDER BY score DESC, candidate_id DESC
+                    ) AS rank
+                FROM scores
+            ) AS ranked
+            WHERE rank <= %(recommendations_count)s
+        '''
+
+    @staticmethod
+    def _iter_batches(user_pks: Collection[Any] | None, batch_size: int) -> Iterator[list[Any]]:
+        if user_pks is not None:
+            user_pks = list(user_pks)
+            for start in range(0, len(user_pks), batch_size):
+                yield user_pks[start:start + batch_size]
+            return
+
+        # Все id не загружаются в память: пачки выбираются по ключу `pk > последний`.
+        queryset = User.objects.order_by('pk').values_list('pk', flat=True)
+        batch_pks = list(queryset[:batch_size])
+        while batch_pks:
+            yield batch_pks
+            batch_pks = list(queryset.filter(pk__gt=batch_pks[-1])[:batch_size])
+
+    def _execute(self, sql: str, params: dict[str, Any]) -> None:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
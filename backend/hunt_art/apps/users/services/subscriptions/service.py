@@ -1,4 +1,7 @@
+from django.db import transaction
+
 from apps.users.models import User
+from apps.arts.services.timeline import ArtTimelineService
 
 from . import exceptions
 
@@ -14,10 +17,17 @@ class UserSubscriptionsService:
         ):
             raise exceptions.UserIsAlreadyFollower(self.__current_user, other_user)
         
-        User.objects.add_subscription(
-            subscriber_pk=self.__current_user.pk,
-            other_user_pk=other_user.pk,
-        )
+        timeline_service = ArtTimelineService()
+        with transaction.atomic():
+            followers_count = User.objects.add_subscription(
+                subscriber_pk=self.__current_user.pk,
+                other_user_pk=other_user.pk,
+            )
+            other_user.followers_count = followers_count
+            timeline_service.add_author(
+                owner_pk=self.__current_user.pk,
+                author=other_user,
+            )
 
     def unsubscribe_from_user(self, other_user: User) -> None:
         if not User.objects.user_is_follower_other_user(
@@ -26,10 +36,17 @@ class UserSubscriptionsService:
         ):
             raise exceptions.UserIsNotFollower(self.__current_user, other_user)
 
-        User.objects.remove_subscription(
-            subscriber_pk=self.__current_user.pk,
-            other_user_pk=other_user.pk,
-        )
+        timeline_service = ArtTimelineService()
+        with transaction.atomic():
+            followers_count = User.objects.remove_subscription(
+                subscriber_pk=self.__current_user.pk,
+                other_user_pk=other_user.pk,
+            )
+            timeline_service.remove_author(
+                owner_pk=self.__current_user.pk,
+                author_pk=other_user.pk,
+            )
+            timeline_service.remove_follower(other_user, followers_count)
 
     def remove_from_subscribers(self, other_user: User) -> None:
         if not User.objects.user_is_follower_other_user(
@@ -38,7 +55,14 @@ class UserSubscriptionsService:
         ):
             raise exceptions.UserIsNotFollower(other_user, self.__current_user)
 
-        User.objects.remove_subscription(
-            subscriber_pk=other_user.pk,
-            other_user_pk=self.__current_user.pk,
-        )
+        timeline_service = ArtTimelineService()
+        with transaction.atomic():
+            followers_count = User.objects.remove_subscription(
+                subscriber_pk=other_user.pk,
+                other_user_pk=self.__current_user.pk,
+            )
+            timeline_service.remove_author(
+                owner_pk=other_user.pk,
+                author_pk=self.__current_user.pk,
+            )
+            timeline_service.remove_follower(self.__current_user, followers_count)
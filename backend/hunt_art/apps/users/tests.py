@@ -0,0 +1,195 @@
+from math import log
+from unittest import mock
+
+from django.core.cache import cache
+
+from rest_framework.request import Request
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import (
+    APITestCase,
+    APIRequestFactory,
+)
+
+from apps.users.models import (
+    User,
+    UserRecommendation,
+)
+from apps.users.services.cards import user_cards_cache
+from apps.users.services.recommendations import UserRecommendationsService
+from apps.arts.models import (
+    Art,
+    ArtLike,
+)
+from api.v1.users.serializers import (
+    ShortRetrieveUserSerializer,
+    FastShortRetrieveUserSerializer,
+)
+
+
+class UserConditionalRetrieveTests(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user('user')
+        self.url = f'/api/v1/users/{self.user.pk}/'
+
+    def test_if_none_match(self) -> None:
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_profile_change_changes_etag(self) -> None:
+        etag = self.client.get(self.url)['ETag']
+
+        self.user.profile.description = 'description'
+        self.user.profile.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['profile']['description'], 'description')
+
+    def test_subscription_changes_etag(self) -> None:
+        subscriber = User.objects.create_user('subscriber')
+        self.client.force_authenticate(subscriber)
+        etag = self.client.get(self.url)['ETag']
+
+        User.objects.add_subscription(subscriber.pk, self.user.pk)
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.data['is_your_subscription'])
+
+    def test_etag_depends_on_user(self) -> None:
+        anonymous_etag = self.client.get(self.url)['ETag']
+        self.client.force_authenticate(User.objects.create_user('other'))
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=anonymous_etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class FastUserSerializersTests(APITestCase):
+    def test_json_is_equal(self) -> None:
+        User.objects.create_user('user')
+        user = User.objects.create_user('пользователь')
+        user.profile.avatar = 'profiles/avatars/avatar.png'
+        user.profile.save()
+
+        queryset = User.objects.select_related('profile').order_by('id')
+        context = {'request': Request(APIRequestFactory().get('/'))}
+        data = ShortRetrieveUserSerializer(list(queryset), many=True, context=context).data
+
+        serializer = FastShortRetrieveUserSerializer(context=context)
+        fast_data = serializer.to_representation_many(serializer.get_rows(queryset))
+
+        renderer = JSONRenderer()
+        self.assertEqual(renderer.render(fast_data), renderer.render(data))
+        self.assertIsNone(fast_data[0]['avatar'])
+
+
+class UserCardsCacheTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.user = User.objects.create_user('user')
+
+    def get_card(self) -> dict:
+        return user_cards_cache.get_many([self.user.pk])[self.user.pk]
+
+    def test_user_change_invalidates_card(self) -> None:
+        self.assertEqual(self.get_card()['username'], 'user')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.username = 'renamed'
+            self.user.save()
+
+        self.assertEqual(self.get_card()['username'], 'renamed')
+
+    def test_profile_change_invalidates_card(self) -> None:
+        self.assertIsNone(self.get_card()['avatar'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.profile.avatar = 'profiles/avatars/avatar.png'
+            self.user.profile.save()
+
+        self.assertTrue(self.get_card()['avatar'].endswith('profiles/avatars/avatar.png'))
+
+    def test_user_deletion_invalidates_card(self) -> None:
+        user_pk = self.get_card()['id']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.delete()
+
+        self.assertEqual(user_cards_cache.get_many([user_pk]), {})
+
+
+class UserRecommendationsTests(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.users = {
+            username: User.objects.create_user(username)
+            for username in ('user', 'a', 'b', 'c', 'd', 'e', 'x', 'y')
+        }
+        self.user = self.users['user']
+        subscriptions = (
+            ('user', 'a'), ('user', 'b'), ('user', 'e'),
+            ('a', 'b'), ('a', 'c'), ('a', 'd'), ('a', 'user'),
+            ('b', 'c'),
+        )
+        for subscriber, other_user in subscriptions:
+            User.objects.add_subscription(self.users[subscriber].pk, self.users[other_user].pk)
+
+        # `e` ни на кого не подписан, но его лайки тоже учитываются.
+        self.like('e', 'x', arts_count=2)
+        self.like('user', 'y')
+
+    def like(self, username: str, author_username: str, arts_count: int = 1) -> None:
+        for _ in range(arts_count):
+            art = Art.objects.create(author=self.users[author_username], image='arts/images/test.png')
+            ArtLike.objects.create(user=self.users[username], art=art)
+
+    def get_scores(self) -> dict[str, float]:
+        usernames = {user.pk: username for username, user in self.users.items()}
+        return {
+            usernames[recommended_user_pk]: score
+            for recommended_user_pk, score in (
+                UserRecommendation.objects
+                .filter(user=self.user)
+                .values_list('recommended_user_id', 'score')
+            )
+        }
+
+    def test_scores(self) -> None:
+        UserRecommendationsService().refresh(user_pks=[self.user.pk])
+
+        # Сам пользователь и его подписки (`b`) не рекомендуются.
+        expected_scores = {
+            'c': 2 * UserRecommendationsService.FRIENDS_OF_FRIENDS_WEIGHT,
+            'd': UserRecommendationsService.FRIENDS_OF_FRIENDS_WEIGHT,
+            'y': log(2) * UserRecommendationsService.LIKED_AUTHORS_WEIGHT,
+            'x': log(3) * UserRecommendationsService.FOLLOWEES_LIKED_AUTHORS_WEIGHT,
+        }
+        scores = self.get_scores()
+        self.assertEqual(scores.keys(), expected_scores.keys())
+        for username, score in expected_scores.items():
+            self.assertAlmostEqual(scores[username], score)
+
+    @mock.patch.object(UserRecommendationsService, 'MAX_SUBSCRIPTIONS', 1)
+    def test_users_with_many_subscriptions_are_not_intermediate(self) -> None:
+        UserRecommendationsService().refresh()
+
+        self.assertEqual(self.get_scores().keys(), {'c', 'y', 'x'})
+
+    def test_endpoint(self) -> None:
+        UserRecommendationsService().refresh()
+        self.client.force_authenticate(self.user)
+        User.objects.add_subscription(self.user.pk, self.users['d'].pk)
+
+        response = self.client.get('/api/v1/users/recommendations/')
+
+        # Подписки, сделанные после пересчета, исключаются при чтении.
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [user['id'] for user in response.data],
+            [self.users[username].pk for username in ('c', 'y', 'x')],
+        )
@@ -91,6 +91,16 @@ MEDIA_URL = '/media/'
 
 MEDIA_ROOT = BASE_DIR / 'media'
 
+STORAGES = {
+    # Файлы именуются по хэшу содержимого и раскладываются по вложенным каталогам.
+    'default': {
+        'BACKEND': 'utils.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
 
 # Debug panel.
 
@@ -98,8 +108,18 @@ INTERNAL_IPS = [
     'localhost',
 ]
 
+def _show_toolbar(request: Any) -> bool:
+    from django.conf import settings
+
+    # Текущее значение, а не DEBUG этого модуля: тесты выключают DEBUG,
+    # и URL тулбара не подключаются.
+    return settings.DEBUG
+
+
 DEBUG_TOOLBAR_CONFIG = {
-    'SHOW_TOOLBAR_CALLBACK': lambda _: DEBUG,
+    'SHOW_TOOLBAR_CALLBACK': _show_toolbar,
+    # В тестах тулбар не показывается (см. _show_toolbar), проверка не нужна.
+    'IS_RUNNING_TESTS': False,
 }
 
 
@@ -127,6 +147,7 @@ INSTALLED_APPS = [
     'apps.arts',
     'apps.websockets',
     'apps.chats',
+    'apps.media',
 ]
 
 if DEBUG:
@@ -241,6 +262,10 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'utils.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
 # Django Channels Layers settings.
@@ -270,3 +295,217 @@ def _get_default_channel_layers_config() -> dict[str, Any]:
 CHANNEL_LAYERS = {
     "default": _get_default_channel_layers_config(),
 }
+
+# Cache settings.
+
+def _get_default_cache_config() -> dict[str, Any]:
+    redis_dsn: str | None = config('REDIS_DSN', default=None)
+
+    if redis_dsn is None:
+        return {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+
+    cache_dsn = redis_dsn.format(
+        host=config('REDIS_HOST'),
+        username=config('REDIS_USER'),
+        password=config('REDIS_PASSWORD'),
+        db=config('REDIS_CACHE_DB', default=1),
+    )
+
+    return {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': cache_dsn,
+    }
+
+CACHES = {
+    'default': _get_default_cache_config(),
+}
+
+
+# Arts settings.
+
+# Интервал пересчета рейтинга популярных артов в секундах.
+ARTS_POPULARITY_REFRESH_INTERVAL = config(
+    'ARTS_POPULARITY_REFRESH_INTERVAL',
+    cast=float,
+    default=300,
+)
+
+# Интервал полного пересчета рейтинга всех артов в секундах.
+# Между полными пересчетами обновляется рейтинг только свежих артов
+# и артов, у которых изменились лайки или просмотры.
+ARTS_POPULARITY_FULL_REFRESH_INTERVAL = config(
+    'ARTS_POPULARITY_FULL_REFRESH_INTERVAL',
+    cast=float,
+    default=6 * 60 * 60,
+)
+
+# Возраст арта в секундах, до которого его рейтинг пересчитывается каждый раз
+# (рейтинг свежих артов затухает быстрее всего).
+ARTS_POPULARITY_RECENT_AGE = config(
+    'ARTS_POPULARITY_RECENT_AGE',
+    cast=float,
+    default=2 * 24 * 60 * 60,
+)
+
+# Интервал записи накопленных просмотров артов в БД в секундах.
+ARTS_VIEWS_FLUSH_INTERVAL = config(
+    'ARTS_VIEWS_FLUSH_INTERVAL',
+    cast=float,
+    default=5,
+)
+
+# Количество подписчиков, начиная с которого арты автора не раскладываются
+# по лентам подписчиков, а читаются напрямую.
+ARTS_TIMELINE_CELEBRITY_FOLLOWERS_COUNT = config(
+    'ARTS_TIMELINE_CELEBRITY_FOLLOWERS_COUNT',
+    cast=int,
+    default=10_000,
+)
+
+# Сколько последних артов автора попадает в ленту при подписке на него.
+ARTS_TIMELINE_BACKFILL_ARTS_COUNT = config(
+    'ARTS_TIMELINE_BACKFILL_ARTS_COUNT',
+    cast=int,
+    default=100,
+)
+
+# Время жизни закэшированных страниц лент артов для анонимных пользователей в секундах.
+# Ограничивает устаревание данных, изменения которых не инвалидируют кэш явно.
+ARTS_FEED_CACHE_TIMEOUT = config(
+    'ARTS_FEED_CACHE_TIMEOUT',
+    cast=float,
+    default=60,
+)
+
+# Конфигурация полнотекстового поиска PostgreSQL для описаний артов.
+ARTS_SEARCH_CONFIG = config(
+    'ARTS_SEARCH_CONFIG',
+    default='russian',
+)
+
+# Ширины уменьшенных копий изображений артов в пикселях.
+ARTS_THUMBNAILS_WIDTHS = config(
+    'ARTS_THUMBNAILS_WIDTHS',
+    cast=Csv(cast=int, post_process=tuple),
+    default='320,640,1280',
+)
+
+# Количество потоков для генерации уменьшенных копий изображений артов.
+ARTS_THUMBNAILS_WORKERS = config(
+    'ARTS_THUMBNAILS_WORKERS',
+    cast=int,
+    default=2,
+)
+
+# Каталог для частично загруженных изображений артов (не должен раздаваться как медиа).
+ARTS_UPLOADS_DIR = config(
+    'ARTS_UPLOADS_DIR',
+    default=str(BASE_DIR / 'uploads'),
+)
+
+# Максимальный размер изображения арта при загрузке по частям в байтах.
+ARTS_UPLOADS_MAX_SIZE = config(
+    'ARTS_UPLOADS_MAX_SIZE',
+    cast=int,
+    default=200 * 1024 * 1024,
+)
+
+# Время жизни незавершенной сессии загрузки в секундах.
+ARTS_UPLOADS_EXPIRATION = config(
+    'ARTS_UPLOADS_EXPIRATION',
+    cast=int,
+    default=24 * 60 * 60,
+)
+
+# Интервал удаления просроченных сессий загрузки в секундах.
+ARTS_UPLOADS_CLEAR_INTERVAL = config(
+    'ARTS_UPLOADS_CLEAR_INTERVAL',
+    cast=float,
+    default=60 * 60,
+)
+
+# Максимальное расстояние Хэмминга между перцептивными хэшами изображений,
+# при котором арты считаются дубликатами (от 0 до 3).
+ARTS_DUPLICATES_MAX_DISTANCE = config(
+    'ARTS_DUPLICATES_MAX_DISTANCE',
+    cast=int,
+    default=3,
+)
+
+# Отклонять загрузку арта, если уже есть арт с похожим изображением.
+ARTS_DUPLICATES_REJECT_ON_UPLOAD = config(
+    'ARTS_DUPLICATES_REJECT_ON_UPLOAD',
+    cast=bool,
+    default=False,
+)
+
+# Количество похожих артов, хранимых для каждого арта.
+ARTS_RELATED_COUNT = config(
+    'ARTS_RELATED_COUNT',
+    cast=int,
+    default=20,
+)
+
+# Тэги, которые есть у большего числа артов, не используются для поиска кандидатов
+# в похожие (но учитываются в сходстве): их вес мал, а кандидатов слишком много.
+ARTS_RELATED_MAX_TAG_ARTS = config(
+    'ARTS_RELATED_MAX_TAG_ARTS',
+    cast=int,
+    default=10_000,
+)
+
+# Интервал перестроения списков похожих артов в секундах.
+ARTS_RELATED_REFRESH_INTERVAL = config(
+    'ARTS_RELATED_REFRESH_INTERVAL',
+    cast=float,
+    default=12 * 60 * 60,
+)
+
+# Количество медиафайлов, удаляемых фоновым процессом за одну транзакцию.
+MEDIA_DELETION_BATCH_SIZE = config(
+    'MEDIA_DELETION_BATCH_SIZE',
+    cast=int,
+    default=100,
+)
+
+# Интервал проверки очереди удаления медиафайлов в секундах.
+MEDIA_DELETION_INTERVAL = config(
+    'MEDIA_DELETION_INTERVAL',
+    cast=float,
+    default=10,
+)
+
+
+# Users settings.
+
+# Время жизни закэшированных карточек пользователей (id, имя, аватар) в секундах.
+# Карточка инвалидируется при изменении пользователя через API.
+USERS_CARDS_CACHE_TIMEOUT = config(
+    'USERS_CARDS_CACHE_TIMEOUT',
+    cast=float,
+    default=60 * 60,
+)
+
+# Количество рекомендаций "на кого подписаться", хранимых для каждого пользователя.
+USERS_RECOMMENDATIONS_COUNT = config(
+    'USERS_RECOMMENDATIONS_COUNT',
+    cast=int,
+    default=20,
+)
+
+# Пользователи, подписанные больше чем на столько пользователей, не используются
+# как промежуточные при поиске рекомендаций: их подписки мало что говорят о вкусах.
+USERS_RECOMMENDATIONS_MAX_SUBSCRIPTIONS = config(
+    'USERS_RECOMMENDATIONS_MAX_SUBSCRIPTIONS',
+    cast=int,
+    default=1000,
+)
+
+# Интервал пересчета рекомендаций "на кого подписаться" в секундах.
+USERS_RECOMMENDATIONS_REFRESH_INTERVAL = config(
+    'USERS_RECOMMENDATIONS_REFRESH_INTERVAL',
+    cast=float,
+    default=60 * 60,
+)
@@ -0,0 +1 @@
+from .tagged import TaggedCache
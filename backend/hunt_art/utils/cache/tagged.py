@@ -0,0 +1,102 @@
+import hashlib
+import secrets
+from typing import (
+    Any,
+    Iterable,
+)
+
+from django.core.cache import (
+    caches,
+    BaseCache,
+)
+
+
+class TaggedCache:
+    """
+    Кэш с инвалидацией по тэгам.
+
+    Каждое значение хранится вместе с версиями своих тэгов на момент записи.
+    Инвалидация тэга - это запись новой версии тэга, поэтому она стоит
+    одну операцию в кэше независимо от количества помеченных значений.
+    При чтении версии тэгов сверяются одним `get_many`, и значение
+    с устаревшей версией хотя бы одного тэга считается отсутствующим.
+
+    Версии тэгов читаются после вычисления значения, поэтому изменение,
+    попавшее между вычислением и записью, может продержаться в кэше
+    до истечения `timeout`.
+
+    Версии тэгов хранятся `tag_timeout` (по умолчанию вдвое дольше значений),
+    чтобы тэги удаленных артов и пользователей не копились в кэше вечно.
+    Истекшая версия тэга не совпадает ни с одной записанной, поэтому
+    ее потеря стоит только промаха по кэшу.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        timeout: float | None,
+        cache_alias: str = 'default',
+        tag_timeout: float | None = None,
+    ) -> None:
+        self.prefix = prefix
+        self.timeout = timeout
+        self.cache_alias = cache_alias
+        if tag_timeout is None and timeout is not None:
+            tag_timeout = timeout * 2
+        self.tag_timeout = tag_timeout
+
+    @property
+    def cache(self) -> BaseCache:
+        return caches[self.cache_alias]
+
+    def make_key(self, *parts: Any) -> str:
+        digest = hashlib.sha1('|'.join(map(str, parts)).encode()).hexdigest()
+        return f'{self.prefix}:value:{digest}'
+
+    def get(self, key: str) -> Any | None:
+        entry: dict[str, Any] | None = self.cache.get(key)
+        if entry is None:
+            return None
+
+        tag_versions: dict[str, str] = entry['tags']
+        current_versions = self.cache.get_many(tag_versions.keys())
+        if current_versions != tag_versions:
+            return None
+
+        return entry['value']
+
+    def set(self, key: str, value: Any, tags: Iterable[str]) -> None:
+        tag_versions = self._get_tag_versions(tags)
+        self.cache.set(
+            key,
+            {'value': value, 'tags': tag_versions},
+            timeout=self.timeout,
+        )
+
+    def invalidate(self, *tags: str) -> None:
+        self.cache.set_many(
+            {self._get_tag_key(tag): self._new_version() for tag in tags},
+            timeout=self.tag_timeout,
+        )
+
+    def _get_tag_versions(self, tags: Iterable[str]) -> dict[str, str]:
+        tag_keys = {self._get_tag_key(tag) for tag in tags}
+        tag_versions: dict[str, str] = self.cache.get_many(tag_keys)
+
+        missing_versions = {
+            tag_key: self._new_version()
+            for tag_key in tag_keys
+            if tag_key not in tag_versions
+        }
+        if missing_versions:
+            self.cache.set_many(missing_versions, timeout=self.tag_timeout)
+            tag_versions.update(missing_versions)
+
+        return tag_versions
+
+    def _get_tag_key(self, tag: str) -> str:
+        return f'{self.prefix}:tag:{tag}'
+
+    @staticmethod
+    def _new_version() -> str:
+        return secrets.token_hex(8)
@@ -0,0 +1,4 @@
+from .keyset import (
+    KeysetPagination,
+    KeysetPaginationMixin,
+)
@@ -0,0 +1,343 @@
+import json
+import binascii
+import datetime as dt
+from base64 import (
+    urlsafe_b64decode,
+    urlsafe_b64encode,
+)
+from typing import (
+    Any,
+    Type,
+    Sequence,
+)
+
+from django.core.exceptions import (
+    ValidationError,
+    FieldDoesNotExist,
+)
+from django.db.models import (
+    Q,
+    Model,
+    QuerySet,
+)
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import exceptions
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework.pagination import BasePagination
+from rest_framework.utils.urls import (
+    remove_query_param,
+    replace_query_param,
+)
+
+
+# Строка выборки: объект модели или словарь из `values()`.
+Row = Model | dict[str, Any]
+
+
+class KeysetPagination(BasePagination):
+    """
+    Пагинация по ключу (keyset/seek-пагинация).
+
+    В отличие от `PageNumberPagination` не делает `COUNT(*)` и не использует `OFFSET`.
+    Следующая страница выбирается условием "строго после последней строки текущей
+    страницы" по полям `ordering`, поэтому при наличии подходящего индекса время
+    получения страницы не зависит от ее "глубины".
+
+    Курсор непрозрачен для клиента: это закодированные значения полей `ordering`
+    крайней строки страницы и направление обхода.
+
+    Последнее поле `ordering` должно быть уникальным (обычно `id`), а все поля
+    должны быть доступны как атрибуты объектов выборки (поля модели или аннотации).
+    Выборка может быть и результатом `values()`: недостающие поля модели из `ordering`
+    добавятся в нее сами, а аннотации должны быть выбраны.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering: Sequence[str] = ('-created_at', '-id')
+    invalid_cursor_message = _('Некорректный курсор.')
+
+    def get_querysets(self, queryset: QuerySet, request: Request, view: APIView | None) -> list[QuerySet]:
+        """
+        Получение источников данных для страницы.
+
+        По умолчанию источник один. Если источников несколько, из каждого выбирается
+        не больше одной страницы, после чего результаты объединяются в памяти.
+        """
+
+        return [queryset]
+
+    def paginate_queryset(
+        self,
+        queryset: QuerySet,
+        request: Request,
+        view: APIView | None = None,
+    ) -> list[Row]:
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        ordering = self._get_ordering(reverse)
+        rows: list[Row] = []
+        querysets = self.get_querysets(queryset, request, view)
+        if position is not None:
+            position = self._parse_position(querysets[0], position)
+        for source in querysets:
+            source = self._select_ordering_fields(source)
+            if position is not None:
+                source = source.filter(self._get_position_filter(position, reverse))
+            rows.extend(source.order_by(*ordering)[:self.page_size + 1])
+
+        if len(querysets) > 1:
+            rows = self._merge_rows(rows, reverse)
+
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.page = rows
+        return self.page
+
+    def get_page_size(self, request: Request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self) -> str | None:
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self._get_position(self.page[-1]), reverse=False)
+
+    def get_previous_link(self) -> str | None:
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self._get_position(self.page[0]), reverse=True)
+
+    def get_paginated_response(self, data: list[Any]) -> Response:
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema: dict[str, Any]) -> dict[str, Any]:
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                },
+                'previous': {
+                    'type': 'string',
+                    'nullable': True,
+                },
+                'results': schema,
+            },
+        }
+
+    def decode_cursor(self, request: Request) -> tuple[list[Any] | None, bool]:
+        """
+        Декодирование курсора из запроса.
+
+        Пустой курсор означает первую страницу.
+        """
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+
+        try:
+            padding = '=' * (-len(encoded) % 4)
+            payload = json.loads(urlsafe_b64decode(encoded + padding))
+            position = payload['p']
+            reverse = bool(payload.get('r', False))
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise exceptions.NotFound(self.invalid_cursor_message)
+
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise exceptions.NotFound(self.invalid_cursor_message)
+
+        return position, reverse
+
+    def encode_cursor(self, position: list[Any], reverse: bool) -> str:
+        payload: dict[str, Any] = {'p': position}
+        if reverse:
+            payload['r'] = 1
+
+        encoded = (
+            urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode())
+            .decode('ascii')
+            .rstrip('=')
+        )
+        url = remove_query_param(self.base_url, 'page')
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def _get_ordering(self, reverse: bool) -> list[str]:
+        if not reverse:
+            return list(self.ordering)
+        return [
+            field_name[1:] if field_name.startswith('-') else f'-{field_name}'
+            for field_name in self.ordering
+        ]
+
+    def _select_ordering_fields(self, queryset: QuerySet) -> QuerySet:
+        # У выборки values() поле `_fields` - выбранные колонки, у обычной - None.
+        if not queryset._fields:
+            return queryset
+
+        # Аннотации, добавленные после values(), выбираются автоматически.
+        missing_field_names = [
+            field_name.lstrip('-')
+            for field_name in self.ordering
+            if field_name.lstrip('-') not in queryset._fields
+            and field_name.lstrip('-') not in queryset.query.annotations
+        ]
+        if not missing_field_names:
+            return queryset
+        return queryset.values(*queryset._fields, *missing_field_names)
+
+    @staticmethod
+    def _get_value(row: Row, field_name: str) -> Any:
+        if isinstance(row, dict):
+            return row[field_name]
+        return getattr(row, field_name)
+
+    def _get_position(self, instance: Row) -> list[Any]:
+        position = []
+        for field_name in self.ordering:
+            value = self._get_value(instance, field_name.lstrip('-'))
+            # Дата сериализуется вручную, т.к. DjangoJSONEncoder обрезает микросекунды,
+            # а для курсора нужна точная позиция.
+            if isinstance(value, (dt.datetime, dt.date)):
+                value = value.isoformat()
+            position.append(value)
+
+        return position
+
+    def _parse_position(self, queryset: QuerySet, position: list[Any]) -> list[Any]:
+        """
+        Приведение значений курсора к типам полей `ordering`.
+
+        Курсор приходит от клиента, поэтому значения проверяются полем модели
+        (или `output_field` аннотации), а не передаются в запрос как есть.
+        """
+
+        parsed_position = []
+        for field_name, value in zip(self.ordering, position):
+            name = field_name.lstrip('-')
+            if name in queryset.query.annotations:
+                field = queryset.query.annotations[name].output_field
+            else:
+                try:
+                    field = queryset.model._meta.get_field(name)
+                except FieldDoesNotExist:
+                    field = None
+
+            try:
+                if field is not None:
+                    value = field.to_python(value)
+            except (ValidationError, TypeError, ValueError):
+                raise exceptions.NotFound(self.invalid_cursor_message)
+            # Поля `ordering` не бывают пустыми, а `None` нельзя сравнивать в запросе.
+            if value is None or isinstance(value, (dict, list)):
+                raise exceptions.NotFound(self.invalid_cursor_message)
+            parsed_position.append(value)
+
+        return parsed_position
+
+    def _get_position_filter(self, position: list[Any], reverse: bool) -> Q:
+        """
+        Условие "строго после позиции" в порядке `ordering`.
+
+        Для `(-created_at, -id)` это `created_at <= x AND (created_at < x OR (created_at = x AND id < y))`.
+        Избыточное первое условие нужно, чтобы планировщик начал сканирование индекса сразу
+        с позиции курсора, а не отфильтровывал все предыдущие строки.
+        """
+
+        condition = Q()
+        previous_fields: dict[str, Any] = {}
+        for field_name, value in zip(self.ordering, position):
+            name = field_name.lstrip('-')
+            descending = field_name.startswith('-')
+            lookup = 'lt' if descending != reverse else 'gt'
+            condition |= Q(**previous_fields, **{f'{name}__{lookup}': value})
+            previous_fields[name] = value
+
+        first_field_name = self.ordering[0]
+        bound_lookup = 'lte' if first_field_name.startswith('-') != reverse else 'gte'
+        return Q(**{f'{first_field_name.lstrip("-")}__{bound_lookup}': position[0]}) & condition
+
+    def _merge_rows(self, rows: list[Row], reverse: bool) -> list[Row]:
+        """
+        Объединение строк из нескольких источников в порядке `ordering`.
+
+        Поддерживается только однонаправленная сортировка по всем полям.
+        """
+
+        descending = self.ordering[0].startswith('-')
+        rows = sorted(
+            rows,
+            key=lambda row: tuple(self._get_value(row, field_name.lstrip('-')) for field_name in self.ordering),
+            reverse=descending != reverse,
+        )
+
+        # Последнее поле `ordering` уникально, поэтому повторы определяются по нему.
+        unique_field_name = self.ordering[-1].lstrip('-')
+        unique_rows: list[Row] = []
+        seen_keys: set[Any] = set()
+        for row in rows:
+            key = self._get_value(row, unique_field_name)
+            if key in seen_keys:
+                continue
+            seen_keys.add(key)
+            unique_rows.append(row)
+
+        return unique_rows
+
+
+class KeysetPaginationMixin:
+    """
+    Миксин представления, включающий пагинацию по ключу для отдельных действий.
+
+    Пагинация по ключу используется, если в запросе передан параметр курсора
+    (для первой страницы - пустой, например `?cursor=`). Иначе используется
+    обычный `pagination_class`, чтобы не ломать клиентов с номерами страниц.
+    """
+
+    keyset_pagination_classes: dict[str, Type[KeysetPagination]] = {}
+
+    @property
+    def paginator(self) -> BasePagination | None:
+        if not hasattr(self, '_paginator'):
+            pagination_class = self.get_pagination_class()
+            self._paginator = pagination_class() if pagination_class is not None else None
+
+        return self._paginator
+
+    def get_pagination_class(self) -> Type[BasePagination] | None:
+        keyset_pagination_class = self.keyset_pagination_classes.get(self.action)
+        if (
+            keyset_pagination_class is not None
+            and keyset_pagination_class.cursor_query_param in self.request.query_params
+        ):
+            return keyset_pagination_class
+
+        return self.pagination_class
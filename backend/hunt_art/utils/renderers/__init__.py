@@ -0,0 +1,4 @@
+from .json import (
+    FastJSONRenderer,
+    StreamingJSONRenderer,
+)
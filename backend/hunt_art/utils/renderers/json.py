@@ -0,0 +1,119 @@
+import json
+from functools import cached_property
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    Mapping,
+)
+
+from rest_framework.compat import SHORT_SEPARATORS
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Рендерер JSON на orjson.
+
+    Если orjson не установлен (например, для платформы нет готового пакета),
+    кодирует стандартным `json` так же, как `JSONRenderer`.
+    Типы, которые orjson не знает (и даты, чтобы сохранить формат DRF),
+    передаются в кодировщик DRF. Отступы (`indent`) и экранирование не-ASCII
+    символов обрабатывает обычный `JSONRenderer`.
+    """
+
+    ORJSON_OPTIONS: int = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: str | None = None,
+        renderer_context: Mapping[str, Any] | None = None,
+    ) -> bytes:
+        if data is None:
+            return b''
+
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return self.encode(data)
+
+    def encode(self, data: Any) -> bytes:
+        if orjson is None or self.ensure_ascii:
+            return self._encode_stdlib(data)
+
+        try:
+            ret = orjson.dumps(data, default=self._default, option=self.ORJSON_OPTIONS)
+        except TypeError:
+            # Например, целые числа больше 64 бит.
+            return self._encode_stdlib(data)
+
+        # Как и JSONRenderer, экранируем разделители строк, недопустимые в JavaScript.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+    def _encode_stdlib(self, data: Any) -> bytes:
+        ret = json.dumps(
+            data,
+            cls=self.encoder_class,
+            ensure_ascii=self.ensure_ascii,
+            allow_nan=not self.strict,
+            separators=SHORT_SEPARATORS,
+        )
+        return ret.replace('\u2028', '\\u2028').replace('\u2029', '\\u2029').encode()
+
+    @cached_property
+    def _default(self) -> Callable[[Any], Any]:
+        return self.encoder_class().default
+
+
+class StreamingJSONRenderer(FastJSONRenderer):
+    """
+    Рендерер JSON по частям для больших списков.
+
+    `iter_render` кодирует элементы списков верхнего уровня (в том числе
+    `results` страницы пагинации) по одному и отдает байты частями
+    по `chunk_size`, поэтому ответ не собирается в памяти целиком,
+    а первая часть уходит клиенту сразу. Элементы могут быть ленивыми
+    (например, `map` по объектам страницы), тогда и их представления
+    не хранятся все одновременно (см. StreamingListMixin).
+
+    Обычный `render` работает как у FastJSONRenderer.
+    """
+
+    chunk_size: int = 64 * 1024
+
+    def iter_render(self, data: Any) -> Iterator[bytes]:
+        buffer = bytearray()
+        for part in self._iter_parts(data, is_top_level=True):
+            buffer += part
+            if len(buffer) >= self.chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+
+        if buffer:
+            yield bytes(buffer)
+
+    def _iter_parts(self, data: Any, is_top_level: bool = False) -> Iterator[bytes]:
+        if is_top_level and isinstance(data, Mapping):
+            yield b'{'
+            for i, (key, value) in enumerate(data.items()):
+                if i:
+                    yield b','
+                yield self.encode(str(key))
+                yield b':'
+                yield from self._iter_parts(value)
+            yield b'}'
+        elif isinstance(data, (list, tuple, Iterator)):
+            yield b'['
+            for i, item in enumerate(data):
+                if i:
+                    yield b','
+                yield self.encode(item)
+            yield b']'
+        else:
+            yield self.encode(data)
@@ -0,0 +1 @@
+from .values import ValuesSerializer
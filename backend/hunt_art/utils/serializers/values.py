@@ -0,0 +1,87 @@
+import re
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Sequence,
+)
+
+from django.db.models import QuerySet
+from django.core.files.storage import (
+    FileSystemStorage,
+    default_storage,
+)
+
+from rest_framework import serializers
+
+
+class ValuesSerializer:
+    """
+    Быстрый сериализатор только для чтения поверх `QuerySet.values()`.
+
+    Вместо экземпляров моделей и полей DRF на каждую строку выбираются только
+    нужные колонки, а каждая строка превращается в словарь заранее собранными
+    преобразователями. Результат должен совпадать с ответом обычного сериализатора
+    байт в байт, поэтому преобразователи повторяют `to_representation` полей DRF.
+
+    Поля описываются кортежами `(имя в ответе, выражение для values(), преобразователь)`,
+    где преобразователь - имя метода сериализатора или `None`, если значение
+    отдается как есть. Ключи из `computed_lookups` не выбираются из БД,
+    их проставляет в строки представление.
+    """
+
+    fields: Sequence[tuple[str, str, str | None]] = ()
+    computed_lookups: Sequence[str] = ()
+    # Имена файлов, для которых `storage.url` и `build_absolute_uri` ничего
+    # не экранируют и не нормализуют (нет спецсимволов и сегментов `.` и `..`).
+    simple_file_name_regex = re.compile(r'^[\w-]+(\.[\w-]+)*(/[\w-]+(\.[\w-]+)*)*$', re.ASCII)
+
+    def __init__(self, context: dict[str, Any]) -> None:
+        self.context = context
+        self._datetime_field = serializers.DateTimeField()
+        self._media_url_prefix: str | None = None
+        self._accessors: list[tuple[str, str, Callable[[Any], Any] | None]] = [
+            (name, lookup, getattr(self, converter_name) if converter_name is not None else None)
+            for name, lookup, converter_name in self.fields
+        ]
+
+    @property
+    def lookups(self) -> list[str]:
+        return list(dict.fromkeys(
+            lookup
+            for _, lookup, _ in self.fields
+            if lookup not in self.computed_lookups
+        ))
+
+    def get_rows(self, queryset: QuerySet) -> QuerySet:
+        # Аннотации (например, поля сортировки для пагинации по ключу) тоже выбираются,
+        # иначе после values() их уже не получится выбрать.
+        return queryset.values(*self.lookups, *queryset.query.annotations)
+
+    def to_representation(self, row: dict[str, Any]) -> dict[str, Any]:
+        return {
+            name: row[lookup] if convert is None or row[lookup] is None else convert(row[lookup])
+            for name, lookup, convert in self._accessors
+        }
+
+    def to_representation_many(self, rows: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        to_representation = self.to_representation
+        return [to_representation(row) for row in rows]
+
+    def to_datetime(self, value: Any) -> str:
+        return self._datetime_field.to_representation(value)
+
+    def to_file_url(self, name: str) -> str | None:
+        """То же, что `FileField.to_representation` с абсолютной ссылкой"""
+
+        if not name:
+            return None
+
+        # Для простых имен файлового хранилища ссылка - это абсолютный адрес
+        # каталога медиа плюс имя, его достаточно получить один раз.
+        if isinstance(default_storage, FileSystemStorage) and self.simple_file_name_regex.match(name):
+            if self._media_url_prefix is None:
+                self._media_url_prefix = self.context['request'].build_absolute_uri(default_storage.base_url)
+            return f'{self._media_url_prefix}{name}'
+
+        return self.context['request'].build_absolute_uri(default_storage.url(name))
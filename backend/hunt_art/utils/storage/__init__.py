@@ -0,0 +1 @@
+from .content_addressed import ContentAddressedStorage
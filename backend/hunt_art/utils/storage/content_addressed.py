@@ -0,0 +1,57 @@
+import os
+import contextlib
+import re
+import hashlib
+
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible(path='utils.storage.ContentAddressedStorage')
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Файловое хранилище с адресацией по содержимому.
+
+    Имя файла - SHA-256 его содержимого, а файл кладется во вложенные
+    каталоги по первым символам хэша: `arts/images/ab/cd/abcd...ef.png`.
+    Каталог из `upload_to` и расширение исходного имени сохраняются.
+    Так в одном каталоге не бывает больше нескольких тысяч файлов,
+    а одинаковые файлы хранятся один раз.
+
+    Один файл может использоваться несколькими записями, поэтому удалять
+    файл можно только когда на него не осталось ссылок.
+    Повторное сохранение существующего файла обновляет дату его изменения.
+    """
+
+    hash_algorithm = 'sha256'
+    shard_depth = 2
+    shard_width = 2
+    content_addressed_name_regex = re.compile(r'(^|/)([0-9a-f]{2}/){2}[0-9a-f]{64}(\.[^/]*)?$')
+
+    def _save(self, name: str, content: File) -> str:
+        content_name = self.get_content_name(name, content)
+        if self.exists(content_name):
+            # Обновляем дату изменения, чтобы отложенное удаление не удалило
+            # файл, который снова стал нужен (см. MediaDeletionQueue).
+            with contextlib.suppress(OSError):
+                os.utime(self.path(content_name))
+            return content_name
+        return super()._save(content_name, content)
+
+    def get_content_name(self, name: str, content: File) -> str:
+        hasher = hashlib.new(self.hash_algorithm)
+        for chunk in content.chunks():
+            hasher.update(chunk)
+        content_hash = hasher.hexdigest()
+
+        dirname, basename = os.path.split(name)
+        _, extension = os.path.splitext(basename)
+        shards = [
+            content_hash[index * self.shard_width:(index + 1) * self.shard_width]
+            for index in range(self.shard_depth)
+        ]
+        return os.path.join(dirname, *shards, f'{content_hash}{extension.lower()}').replace('\\', '/')
+
+    def is_content_addressed(self, name: str) -> bool:
+        return self.content_addressed_name_regex.search(name) is not None
@@ -0,0 +1,5 @@
+from .conditional import (
+    ConditionalRetrieveMixin,
+    make_etag,
+)
+from .streaming import StreamingListMixin
@@ -0,0 +1,71 @@
+import hashlib
+import datetime as dt
+from typing import Any
+
+from django.http import HttpResponseBase
+from django.utils.cache import (
+    patch_vary_headers,
+    get_conditional_response,
+)
+from django.utils.http import http_date
+
+from rest_framework.request import Request
+
+
+def make_etag(*parts: Any) -> str:
+    """Слабый ETag из значений полей версии объекта"""
+
+    version = ':'.join(str(part) for part in parts)
+    return f'W/"{hashlib.md5(version.encode(), usedforsecurity=False).hexdigest()}"'
+
+
+class ConditionalRetrieveMixin:
+    """
+    Миксин представления, поддерживающий условные запросы для `retrieve`.
+
+    До получения и сериализации объекта представление дешево (одним запросом
+    по индексу) вычисляет его версию: ETag и дату последнего изменения.
+    Если клиент прислал совпадающие `If-None-Match` или `If-Modified-Since`,
+    сразу отдается `304 Not Modified` без тела. Иначе ответ формируется как обычно,
+    и к нему добавляются заголовки `ETag` и `Last-Modified`.
+    """
+
+    def get_retrieve_version(self) -> tuple[str, dt.datetime] | None:
+        """
+        Получение ETag и даты последнего изменения объекта.
+
+        Если объекта нет, нужно вернуть `None`: ошибку сформирует обычный `retrieve`.
+        """
+
+        raise NotImplementedError
+
+    def perform_not_modified(self) -> None:
+        """Действия при ответе `304 Not Modified` вместо полного ответа"""
+
+    def retrieve(self, request: Request, *args, **kwargs) -> HttpResponseBase:
+        version = self.get_retrieve_version()
+        if version is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag, last_modified = version
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=int(last_modified.timestamp()),
+        )
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        elif response.status_code == 304:
+            self.perform_not_modified()
+
+        self._set_version_headers(response, etag, last_modified)
+        return response
+
+    def _set_version_headers(self, response: HttpResponseBase, etag: str, last_modified: dt.datetime) -> None:
+        if response.status_code not in (200, 304):
+            return
+
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+        # Версия зависит от того, кто делает запрос.
+        patch_vary_headers(response, ('Authorization', ))
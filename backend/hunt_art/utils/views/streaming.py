@@ -0,0 +1,75 @@
+from typing import (
+    Any,
+    Iterator,
+    AsyncIterator,
+)
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import (
+    HttpResponseBase,
+    StreamingHttpResponse,
+)
+
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from utils.renderers import StreamingJSONRenderer
+
+
+class StreamingListMixin:
+    """
+    Миксин представления, отдающий `list` потоком.
+
+    Если клиент принимает JSON и выбран StreamingJSONRenderer, объекты страницы
+    сериализуются и кодируются по одному прямо во время отправки ответа:
+    первый байт уходит сразу, а ни список представлений, ни весь JSON
+    не хранятся в памяти. Для остальных рендереров (например, Browsable API)
+    ответ формируется как обычно.
+
+    Ошибки сериализации во время отправки уже не превратятся в ответ с ошибкой,
+    поэтому сериализатор не должен делать ничего, что может упасть,
+    кроме чтения уже полученных объектов.
+    """
+
+    def list(self, request: Request, *args, **kwargs) -> HttpResponseBase:
+        renderer = request.accepted_renderer
+        if (
+            not isinstance(renderer, StreamingJSONRenderer)
+            or renderer.get_indent(request.accepted_media_type, {}) is not None
+        ):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(queryset if page is None else page, many=True)
+        items = map(serializer.child.to_representation, serializer.instance)
+        response: Response = (
+            Response(items)
+            if page is None
+            else self.get_paginated_response(items)
+        )
+
+        return StreamingHttpResponse(
+            self._get_streaming_content(renderer.iter_render(response.data)),
+            status=response.status_code,
+            content_type=renderer.media_type,
+            headers={
+                name: value
+                for name, value in response.headers.items()
+                if name != 'Content-Type'
+            },
+        )
+
+    def _get_streaming_content(self, chunks: Iterator[bytes]) -> Iterator[bytes] | AsyncIterator[bytes]:
+        # Синхронный итератор ASGI-обработчик Django сначала прочитал бы целиком.
+        if isinstance(self.request._request, ASGIRequest):
+            return _iterate_in_thread(chunks)
+
+        return chunks
+
+
+async def _iterate_in_thread(iterator: Iterator[Any]) -> AsyncIterator[Any]:
+    get_next = sync_to_async(next, thread_sensitive=True)
+    while (item := await get_next(iterator, None)) is not None:
+        yield item
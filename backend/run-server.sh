@@ -16,6 +16,24 @@ done
 
 poetry run python manage.py createsuperuser --noinput
 
+# Перестраиваем ленты подписок в фоне, только если изменился порог "знаменитости".
+poetry run python manage.py rebuild_art_timelines --if-changed &
+
+# Запускаем фоновое удаление брошенных сессий загрузки артов по частям.
+poetry run python manage.py clear_expired_art_uploads --loop &
+
+# Запускаем фоновый пересчет рейтинга популярных артов.
+poetry run python manage.py refresh_art_popularity --loop &
+
+# Запускаем фоновое перестроение списков похожих артов (первое - через интервал после старта).
+poetry run python manage.py refresh_related_arts --loop &
+
+# Запускаем фоновый пересчет рекомендаций "на кого подписаться".
+poetry run python manage.py refresh_user_recommendations --loop &
+
+# Запускаем фоновое удаление медиафайлов удаленных записей.
+poetry run python manage.py process_media_deletions --loop &
+
 # Запускаем WSGI-сервер.
 if [ $DJANGO_DEBUG = "True" ]
 then 